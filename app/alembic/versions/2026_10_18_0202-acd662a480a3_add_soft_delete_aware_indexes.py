@@ -0,0 +1,71 @@
+"""add soft delete aware indexes
+
+Revision ID: acd662a480a3
+Revises: c9d48d3d5323
+Create Date: 2026-10-18 02:02:18.116315
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "acd662a480a3"
+down_revision: str | Sequence[str] | None = "c9d48d3d5323"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+LIVE = sa.text("NOT is_deleted")
+
+# (name, table, columns, partial)
+INDEXES = [
+    ("ix_comment_author_id", "comment", ["author_id"], False),
+    ("ix_comment_post_id", "comment", ["post_id"], False),
+    (
+        "ix_comment_post_id_created_at_id_live",
+        "comment",
+        ["post_id", "created_at", "id"],
+        True,
+    ),
+    ("ix_post_author_id", "post", ["author_id"], False),
+    (
+        "ix_post_author_id_created_at_id_live",
+        "post",
+        ["author_id", "created_at", "id"],
+        True,
+    ),
+    ("ix_post_created_at_id_live", "post", ["created_at", "id"], True),
+    ("ix_posttaglink_tag_id", "posttaglink", ["tag_id"], False),
+    ("ix_user_created_at_id_live", "user", ["created_at", "id"], True),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, but it does
+    # not block writes to the tables while the indexes are built.
+    with op.get_context().autocommit_block():
+        for name, table, columns, partial in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=LIVE if partial else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,104 @@
+from collections.abc import Awaitable, Callable
+from datetime import UTC
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response, status
+
+from app.api.responses import FastJSONResponse
+from app.core.cache import CachedResponse
+from app.schemas.common import PaginatedResponse, Version
+
+# Clients may store responses but must revalidate them before reuse.
+CACHE_CONTROL = "no-cache"
+
+
+def _validators(version: Version) -> dict[str, str]:
+    headers = {"ETag": version.etag, "Cache-Control": CACHE_CONTROL}
+    if version.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            version.last_modified.astimezone(UTC), usegmt=True
+        )
+    return headers
+
+
+def _weak(etag: str) -> str:
+    return etag.strip().removeprefix("W/")
+
+
+def is_fresh(request: Request, version: Version) -> bool:
+    """Whether the client's copy matches ``version``.
+
+    If-None-Match wins over If-Modified-Since when both are sent, and uses the
+    weak comparison, as required for GET.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        etag = _weak(version.etag)
+        return any(_weak(tag) == etag for tag in if_none_match.split(","))
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or version.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # HTTP dates have whole seconds.
+    return version.last_modified.replace(microsecond=0) <= since
+
+
+async def not_modified(
+    request: Request, probe: Callable[[], Awaitable[Version | None]]
+) -> Response | None:
+    """A 304 when the request is conditional and ``probe`` matches it.
+
+    The probe only runs for requests carrying If-None-Match or
+    If-Modified-Since; None from it means the resource is gone, and the
+    route goes on to answer as usual.
+    """
+    if (
+        "if-none-match" not in request.headers
+        and "if-modified-since" not in request.headers
+    ):
+        return None
+    version = await probe()
+    if version is None or not is_fresh(request, version):
+        return None
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=_validators(version)
+    )
+
+
+def set_validators(response: Response, version: Version | None) -> None:
+    if version is not None:
+        response.headers.update(_validators(version))
+
+
+def cached_response(request: Request, entry: CachedResponse) -> Response:
+    """Answer with a response cache entry, or a 304 when the client has it."""
+    version = Version.model_validate(entry.meta) if entry.meta else None
+    if version is None:
+        return FastJSONResponse(entry.body)
+    if is_fresh(request, version):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=_validators(version)
+        )
+    return FastJSONResponse(entry.body, headers=_validators(version))
+
+
+def page_response(page: PaginatedResponse[Any], validators: bool = True) -> Response:
+    """Answer with ``page``'s pre-serialized body and, unless turned off, its
+    validators.
+
+    A returned Response skips FastAPI's validation and serialization against
+    the route's response_model, which the service's schemas already went
+    through.
+    """
+    headers = None
+    if validators and page.version is not None:
+        headers = _validators(page.version)
+    return FastJSONResponse(page.to_json(), headers=headers)
@@ -1,23 +1,93 @@
-from collections.abc import AsyncGenerator
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Annotated
-from fastapi import Depends, HTTPException, status
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 import jwt
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.admission import Priority, admission_controller
 from app.core.config import settings
-from app.core.db import async_session_maker
+from app.core.db import async_session_maker, replica_session_makers, replica_set
+from app.core.replicas import READS, RecentWriters
+from app.core.singleflight import COALESCE_READS
 from app.models.user_model import User
+from app.schemas.auth import Principal
 from app.schemas.auth import TokenData
 from app.services.user_service import user_service
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login")
 
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_maker() as session:
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Cookie holding the epoch second until which the client's reads go to the
+# primary, so read-your-writes holds on whichever worker serves them.
+PRIMARY_UNTIL_COOKIE = "primary_until"
+
+recent_writers = RecentWriters(window=settings.READ_YOUR_WRITES_SECONDS)
+
+
+def _token_subject(request: Request) -> UUID | None:
+    """The user id in the bearer token, without checking the user exists."""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+        return TokenData(**payload).sub
+    except (InvalidTokenError, ValidationError):
+        return None
+
+
+def _reads_from_primary(request: Request) -> bool:
+    try:
+        until = float(request.cookies.get(PRIMARY_UNTIL_COOKIE, 0))
+    except ValueError:
+        until = 0
+    if until > time.time():
+        return True
+    user_id = _token_subject(request)
+    return user_id is not None and user_id in recent_writers
+
+
+def _route_priority(request: Request) -> Priority:
+    if request.method not in SAFE_METHODS:
+        return Priority.CRITICAL
+    endpoint = getattr(request.scope.get("route"), "endpoint", None)
+    return getattr(endpoint, "admission_priority", Priority.NORMAL)
+
+
+@asynccontextmanager
+async def _admitted(request: Request) -> AsyncIterator[None]:
+    """Hold a slot on the primary while the block runs.
+
+    Nested blocks of the same request share the outermost one's slot.
+    """
+    if getattr(request.state, "admitted", False):
+        yield
+        return
+    async with admission_controller.admit(_route_priority(request)):
+        request.state.admitted = True
+        try:
+            yield
+        finally:
+            request.state.admitted = False
+
+
+@asynccontextmanager
+async def _session(
+    maker: async_sessionmaker[AsyncSession],
+) -> AsyncIterator[AsyncSession]:
+    async with maker() as session:
         try:
             yield session
         except Exception:
@@ -27,14 +97,81 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@asynccontextmanager
+async def _primary_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """A session on the primary under the request's slot, kept on the request
+    so its principal lookup can share it."""
+    async with _admitted(request), _session(async_session_maker) as session:
+        request.state.primary_session = session
+        try:
+            yield session
+        finally:
+            request.state.primary_session = None
+
+
+async def get_async_session(
+    request: Request, response: Response
+) -> AsyncGenerator[AsyncSession, None]:
+    """A session on the primary, once admission control lets the request in.
+
+    Requests that may write mark their user, and the client, as reading from
+    the primary for the next READ_YOUR_WRITES_SECONDS.
+    """
+    if replica_set.engines and request.method not in SAFE_METHODS:
+        user_id = _token_subject(request)
+        if user_id is not None:
+            recent_writers.mark(user_id)
+        window = settings.READ_YOUR_WRITES_SECONDS
+        response.set_cookie(
+            PRIMARY_UNTIL_COOKIE,
+            str(int(time.time() + window) + 1),
+            max_age=int(window) + 1,
+            httponly=True,
+            samesite="lax",
+        )
+    async with _primary_session(request) as session:
+        yield session
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """A session on a healthy replica, for routes that only read.
+
+    Falls back to the primary when no replica is configured or healthy, and
+    for clients that wrote within the last READ_YOUR_WRITES_SECONDS. Other
+    clients' identical lookups are coalesced (see ``BaseService._read``).
+    """
+    read_your_writes = bool(replica_set.engines) and _reads_from_primary(request)
+    index = None
+    if replica_set.engines and not read_your_writes:
+        index = replica_set.pick()
+    if index is not None:
+        READS.inc(database=f"replica{index}")
+        async with _session(replica_session_makers[index]) as session:
+            session.info[COALESCE_READS] = True
+            yield session
+        return
+    READS.inc(database="primary")
+    async with _primary_session(request) as session:
+        session.info[COALESCE_READS] = not read_your_writes
+        yield session
+
+
 SessionDep = Annotated[AsyncSession, Depends(get_async_session)]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
 TokenDep = Annotated[str, Depends(oauth2_scheme)]
 
 
-async def get_current_user(
-    session: SessionDep,
+async def get_current_principal(
+    request: Request,
     token: TokenDep,
-) -> User:
+) -> Principal:
+    """The user behind the token, from this worker's principal cache.
+
+    Only a cache miss reads the primary: through the request's primary
+    session when it already has one, otherwise through a session of its own
+    holding a slot just for the lookup, so reads served by a replica do not
+    hold a primary slot for the rest of the request.
+    """
     try:
         payload = jwt.decode(
             token,
@@ -48,15 +185,31 @@ async def get_current_user(
             detail="Could not validate credentials",
         )
 
-    user = await user_service.get_user_by_id(session, user_id=token_data.sub)
+    principal = user_service.get_cached_principal(token_data.sub)
+    if principal is not None:
+        return principal
+    session = getattr(request.state, "primary_session", None)
+    if session is not None:
+        return await user_service.load_principal(session, user_id=token_data.sub)
+    async with _primary_session(request) as session:
+        return await user_service.load_principal(session, user_id=token_data.sub)
+
 
-    return user
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
+
+
+async def get_current_user(
+    session: SessionDep,
+    principal: CurrentPrincipal,
+) -> User:
+    """The full user row, for endpoints that read more than the principal."""
+    return await user_service.get_user_by_id(session, user_id=principal.id)
 
 
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
-def get_current_active_superuser(current_user: CurrentUser) -> User:
+def get_current_active_superuser(current_user: CurrentPrincipal) -> Principal:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,76 @@
+import csv
+import io
+from collections.abc import AsyncIterator
+from enum import Enum
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+async def _ndjson(items: AsyncIterator[BaseModel], batch_size: int):
+    lines: list[str] = []
+    async for item in items:
+        lines.append(item.model_dump_json())
+        if len(lines) >= batch_size:
+            yield "\n".join(lines) + "\n"
+            lines.clear()
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+async def _csv(
+    items: AsyncIterator[BaseModel], schema: type[BaseModel], batch_size: int
+):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(schema.model_fields))
+    writer.writeheader()
+    rows = 0
+    async for item in items:
+        writer.writerow(item.model_dump(mode="json"))
+        rows += 1
+        if rows >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    yield buffer.getvalue()
+
+
+def export_response(
+    items: AsyncIterator[BaseModel],
+    schema: type[BaseModel],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """Stream ``items`` as NDJSON or CSV, one chunk per batch of rows.
+
+    The body is produced while it is sent, so the database cursor only
+    advances as fast as the client reads.
+    """
+    batch_size = settings.EXPORT_BATCH_SIZE
+    if export_format is ExportFormat.csv:
+        body = _csv(items, schema, batch_size)
+    else:
+        body = _ndjson(items, batch_size)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{filename}.{export_format.value}"'
+            )
+        },
+    )
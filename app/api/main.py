@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes import login, users, tags, posts, comments
+from app.api.routes import login, users, tags, posts, comments, utils
 
 
 api_router = APIRouter()
@@ -9,3 +9,4 @@ api_router.include_router(users.router)
 api_router.include_router(tags.router)
 api_router.include_router(posts.router)
 api_router.include_router(comments.router)
+api_router.include_router(utils.router)
@@ -0,0 +1,18 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON rendered by pydantic-core, the application's default response.
+
+    Models, UUIDs and datetimes are encoded natively, in one pass, instead of
+    going through ``json.dumps``. Bytes are taken as an already serialized
+    body and sent as they are.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return to_json(content)
@@ -1,13 +1,31 @@
-from fastapi import APIRouter, status
+from typing import Annotated
+
+from fastapi import APIRouter, Body, Request, Response, status
 from uuid import UUID
 
 from fastapi.params import Depends
 
-from app.api.deps import CurrentUser, SessionDep, get_current_user
-from app.core.permissions import permission_checker
-from app.repositories.comment_repository import comment_repository
-from app.schemas.comment_schema import CommentCreate, CommentPublic, CommentUpdate
-from app.schemas.common import PaginatedResponse, PaginationParams, MessageResponse
+from app.api.deps import (
+    CurrentPrincipal,
+    ReadSessionDep,
+    SessionDep,
+    get_current_principal,
+)
+from app.api.conditional import not_modified, page_response, set_validators
+from app.core.admission import Priority, priority
+from app.core.config import settings
+from app.schemas.comment_schema import (
+    CommentBulkCreate,
+    CommentCreate,
+    CommentPublic,
+    CommentUpdate,
+)
+from app.schemas.common import (
+    BulkCreateResponse,
+    PaginatedResponse,
+    PaginationParams,
+    MessageResponse,
+)
 from app.services.comment_service import comment_service
 from app.services.post_service import post_service
 
@@ -18,15 +36,15 @@ router = APIRouter(prefix="/comments", tags=["comments"])
     "/post/{post_id}",
     response_model=CommentPublic,
     status_code=status.HTTP_201_CREATED,
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
 )
 async def create_comment(
     session: SessionDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
     post_id: UUID,
     comment_in: CommentCreate,
 ):
-    await post_service.get_by_id(session, entity_id=post_id)
+    await post_service.get_by_id(session, entity_id=post_id, profile="list")
     comment = await comment_service.create_comment(
         session, comment_in, post_id, current_user.id
     )
@@ -34,15 +52,52 @@ async def create_comment(
     return comment
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResponse[CommentPublic],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_comments_bulk(
+    session: SessionDep,
+    current_user: CurrentPrincipal,
+    comments_in: Annotated[
+        list[CommentBulkCreate],
+        Body(min_length=1, max_length=settings.BULK_MAX_ITEMS),
+    ],
+    response: Response,
+):
+    created = await comment_service.bulk_create_comments(
+        session, comments_in=comments_in, author_id=current_user.id
+    )
+    if not created.items and created.errors:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_CONTENT
+    return created
+
+
 @router.get("/post/{post_id}", response_model=PaginatedResponse[CommentPublic])
+@priority(Priority.LOW)
 async def read_comments_by_post(
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: ReadSessionDep,
+    current_user: CurrentPrincipal,
     post_id: UUID,
+    request: Request,
     params: PaginationParams = Depends(),  # type: ignore[assignment]
     include_deleted: bool = False,
     only_deleted: bool = False,
 ):
+    cached = await not_modified(
+        request,
+        lambda: comment_service.get_by_post_version(
+            session,
+            post_id=post_id,
+            params=params,
+            include_deleted=include_deleted,
+            only_deleted=only_deleted,
+            current_user=current_user,
+        ),
+    )
+    if cached is not None:
+        return cached
     comments = await comment_service.get_by_post(
         session,
         post_id=post_id,
@@ -51,32 +106,35 @@ async def read_comments_by_post(
         only_deleted=only_deleted,
         current_user=current_user,
     )
-
-    return comments
+    return page_response(comments)
 
 
 @router.get("/{comment_id}", response_model=CommentPublic)
 async def read_comment(
-    session: SessionDep,
+    session: ReadSessionDep,
     comment_id: UUID,
+    request: Request,
+    response: Response,
 ):
+    cached = await not_modified(
+        request, lambda: comment_service.get_version(session, comment_id)
+    )
+    if cached is not None:
+        return cached
     comment = await comment_service.get_by_id(session, comment_id)
-
+    set_validators(response, comment_service.version_of(comment))
     return comment
 
 
 @router.put("/{comment_id}", response_model=CommentPublic)
 async def update_comment(
     session: SessionDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
     comment_id: UUID,
     comment_in: CommentUpdate,
 ):
-    comment = await comment_service.get_by_id(session, comment_id)
-    permission_checker.require_owner_or_superuser(current_user, comment)
-
-    comment = await comment_repository.update(
-        session, db_obj=comment, obj_in=comment_in
+    comment = await comment_service.update_comment(
+        session, current_user, comment_id, comment_in
     )
     return comment
 
@@ -84,11 +142,8 @@ async def update_comment(
 @router.delete("/{comment_id}", response_model=MessageResponse)
 async def delete_comment(
     session: SessionDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
     comment_id: UUID,
 ):
-    comment = await comment_service.get_by_id(session, comment_id)
-    permission_checker.require_owner_or_superuser(current_user, comment)
-
-    await comment_service.delete(session, entity_id=comment_id)
+    await comment_service.delete_comment(session, comment_id, current_user)
     return MessageResponse(message="Comment deleted successfully")
@@ -0,0 +1,30 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException, status
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.core.errors import DATABASE_ERRORS
+from app.core.warmup import readiness
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/ready")
+async def ready() -> bool:
+    """Green once this worker has warmed up and while the primary answers."""
+    if not readiness.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Warming up",
+        )
+    try:
+        async with asyncio.timeout(2):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+    except DATABASE_ERRORS as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database unavailable",
+        ) from exc
+    return True
@@ -1,7 +1,26 @@
-from fastapi import APIRouter, status, Depends
+from typing import Annotated
+
+from fastapi import APIRouter, Body, Request, Response, status, Depends
+from fastapi.responses import StreamingResponse
 from uuid import UUID
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import (
+    CurrentPrincipal,
+    CurrentUser,
+    ReadSessionDep,
+    SessionDep,
+    get_current_active_superuser,
+)
+from app.api.conditional import (
+    cached_response,
+    not_modified,
+    page_response,
+    set_validators,
+)
+from app.api.export import ExportFormat, export_response
+from app.core.admission import Priority, priority
+from app.core.cache import response_cache
+from app.core.config import settings
 from app.services.post_service import post_service
 from app.schemas.post_schema import (
     PostCreate,
@@ -10,7 +29,12 @@ from app.schemas.post_schema import (
     PostPublicWithRelations,
     PostReadWithAuthor,
 )
-from app.schemas.common import PaginatedResponse, PaginationParams, MessageResponse
+from app.schemas.common import (
+    BulkCreateResponse,
+    PaginatedResponse,
+    PaginationParams,
+    MessageResponse,
+)
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
@@ -26,40 +50,100 @@ async def create_post(
     post = await post_service.create_post(
         session,
         post_in=post_in,
-        author_id=current_user.id,
+        author=current_user,
     )
     return post
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResponse[PostPublic],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_posts_bulk(
+    session: SessionDep,
+    current_user: CurrentPrincipal,
+    posts_in: Annotated[
+        list[PostCreate], Body(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ],
+    response: Response,
+):
+    created = await post_service.bulk_create_posts(
+        session, posts_in=posts_in, author_id=current_user.id
+    )
+    if not created.items and created.errors:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_CONTENT
+    return created
+
+
 @router.get("/", response_model=PaginatedResponse[PostPublic])
+@priority(Priority.LOW)
 async def read_posts(
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: ReadSessionDep,
+    current_user: CurrentPrincipal,
+    request: Request,
     params: PaginationParams = Depends(),
     include_deleted: bool = False,
     only_deleted: bool = False,
 ):
+    cached = await not_modified(
+        request,
+        lambda: post_service.get_list_version(
+            session, current_user, params, include_deleted, only_deleted
+        ),
+    )
+    if cached is not None:
+        return cached
     posts = await post_service.get_list_paginated(
         session, current_user, params, include_deleted, only_deleted
     )
+    return page_response(posts)
 
-    return posts
+
+@router.get(
+    "/export",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+@priority(Priority.LOW)
+async def export_posts(
+    session: ReadSessionDep,
+    current_user: CurrentPrincipal,
+    format: ExportFormat = ExportFormat.ndjson,
+    include_deleted: bool = False,
+    only_deleted: bool = False,
+):
+    posts = await post_service.export(
+        session, current_user, include_deleted, only_deleted
+    )
+    return export_response(posts, PostPublic, format, filename="posts")
 
 
 @router.get("/{post_id}", response_model=PostPublicWithRelations)
 async def read_post(
-    session: SessionDep,
+    session: ReadSessionDep,
     post_id: UUID,
+    request: Request,
+    response: Response,
 ):
+    if response_cache.enabled:
+        entry = await post_service.get_post_response(session, post_id)
+        return cached_response(request, entry)
+    cached = await not_modified(
+        request, lambda: post_service.get_version(session, post_id)
+    )
+    if cached is not None:
+        return cached
     post = await post_service.get_by_id(session, post_id)
-
+    set_validators(response, post_service.version_of(post))
     return post
 
 
 @router.put("/{post_id}", response_model=PostPublicWithRelations)
 async def update_post(
     session: SessionDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
     post_id: UUID,
     post_in: PostUpdate,
 ):
@@ -72,17 +156,31 @@ async def update_post(
 @router.delete("/{post_id}", response_model=MessageResponse)
 async def delete_post(
     session: SessionDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
     post_id: UUID,
 ):
     await post_service.delete_post(session, post_id, current_user)
     return MessageResponse(message="Post deleted successfully")
 
 
+@router.post(
+    "/{post_id}/restore",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=PostPublic,
+)
+async def restore_post(
+    session: SessionDep,
+    post_id: UUID,
+):
+    post = await post_service.restore_post(session, post_id)
+    return post
+
+
 @router.get("/author/{author_id}", response_model=PaginatedResponse[PostReadWithAuthor])
+@priority(Priority.LOW)
 async def read_posts_by_author(
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: ReadSessionDep,
+    current_user: CurrentPrincipal,
     author_id: UUID,
     params: PaginationParams = Depends(),
     include_deleted: bool = False,
@@ -91,4 +189,4 @@ async def read_posts_by_author(
     posts = await post_service.get_posts_by_author(
         session, current_user, author_id, params, include_deleted, only_deleted
     )
-    return posts
+    return page_response(posts, validators=False)
@@ -1,14 +1,30 @@
+from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, Request, Response, status
 
 from app.api.deps import (
     get_current_active_superuser,
+    ReadSessionDep,
     SessionDep,
-    get_current_user,
-    CurrentUser,
+    get_current_principal,
+    CurrentPrincipal,
+)
+from app.api.conditional import (
+    cached_response,
+    not_modified,
+    page_response,
+    set_validators,
+)
+from app.core.admission import Priority, priority
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.schemas.common import (
+    BulkCreateResponse,
+    PaginatedResponse,
+    PaginationParams,
+    MessageResponse,
 )
-from app.schemas.common import PaginatedResponse, PaginationParams, MessageResponse
 from app.schemas.tag_schema import TagCreate, TagUpdate, TagPublic
 from app.services.tag_service import tag_service
 
@@ -21,18 +37,34 @@ router = APIRouter(prefix="/tags", tags=["tags"])
     response_model=PaginatedResponse[TagPublic],
     summary="Retrieve all tags",
     description="Retrieve all tags with pagination. Any user can access this.",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
 )
+@priority(Priority.LOW)
 async def read_tags(
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: ReadSessionDep,
+    current_user: CurrentPrincipal,
+    request: Request,
     params: PaginationParams = Depends(),
     include_deleted: bool = False,
     only_deleted: bool = False,
 ):
-    return await tag_service.get_tags(
+    if response_cache.enabled:
+        entry = await tag_service.get_tags_response(
+            session, current_user, params, include_deleted, only_deleted
+        )
+        return cached_response(request, entry)
+    cached = await not_modified(
+        request,
+        lambda: tag_service.get_list_version(
+            session, current_user, params, include_deleted, only_deleted
+        ),
+    )
+    if cached is not None:
+        return cached
+    tags = await tag_service.get_tags(
         session, current_user, params, include_deleted, only_deleted
     )
+    return page_response(tags)
 
 
 @router.post(
@@ -50,18 +82,53 @@ async def create_tag(
     return await tag_service.create_tag(session, tag_in)
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResponse[TagPublic],
+    status_code=status.HTTP_201_CREATED,
+    summary="Create tags in bulk",
+    description="Create several tags in one transaction. Tags whose name is "
+    "taken are skipped and reported in errors, with a 422 when none could be "
+    "created. Only superusers can create tags.",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+async def create_tags_bulk(
+    session: SessionDep,
+    tags_in: Annotated[
+        list[TagCreate], Body(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ],
+    response: Response,
+):
+    created = await tag_service.bulk_create_tags(session, tags_in)
+    if not created.items and created.errors:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_CONTENT
+    return created
+
+
 @router.get(
     "/{tag_id}",
     response_model=TagPublic,
     summary="Retrieve a tag by ID",
     description="Retrieve a tag by its ID. Any user can access this.",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
 )
 async def read_tag_by_id(
-    session: SessionDep,
+    session: ReadSessionDep,
     tag_id: UUID,
+    request: Request,
+    response: Response,
 ):
-    return await tag_service.get_tag_by_id(session, tag_id)
+    if response_cache.enabled:
+        entry = await tag_service.get_tag_response(session, tag_id)
+        return cached_response(request, entry)
+    cached = await not_modified(
+        request, lambda: tag_service.get_version(session, tag_id)
+    )
+    if cached is not None:
+        return cached
+    tag = await tag_service.get_tag_by_id(session, tag_id)
+    set_validators(response, tag_service.version_of(tag))
+    return tag
 
 
 @router.put(
@@ -4,12 +4,18 @@ from fastapi import APIRouter, HTTPException, status
 from typing import Any
 
 from fastapi.params import Depends
+from fastapi.responses import StreamingResponse
 
 from app.api.deps import (
+    CurrentPrincipal,
     CurrentUser,
+    ReadSessionDep,
     SessionDep,
     get_current_active_superuser,
 )
+from app.api.conditional import page_response
+from app.api.export import ExportFormat, export_response
+from app.core.admission import Priority, priority
 from app.schemas.user_schema import (
     UserPublic,
     UserCreate,
@@ -28,20 +34,42 @@ router = APIRouter(prefix="/users", tags=["users"])
     dependencies=[Depends(get_current_active_superuser)],
     response_model=PaginatedResponse[UserPublic],
 )
+@priority(Priority.LOW)
 async def read_users(
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: ReadSessionDep,
+    current_user: CurrentPrincipal,
     params: PaginationParams = Depends(),  # type: ignore[assignment]
     include_deleted: bool = False,
     only_deleted: bool = False,
 ):
-    return await user_service.get_users(
+    users = await user_service.get_users(
         session,
         current_user,
         params=params,
         include_deleted=include_deleted,
         only_deleted=only_deleted,
     )
+    return page_response(users, validators=False)
+
+
+@router.get(
+    "/export",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+@priority(Priority.LOW)
+async def export_users(
+    session: ReadSessionDep,
+    current_user: CurrentPrincipal,
+    format: ExportFormat = ExportFormat.ndjson,
+    include_deleted: bool = False,
+    only_deleted: bool = False,
+):
+    users = await user_service.export(
+        session, current_user, include_deleted, only_deleted
+    )
+    return export_response(users, UserPublic, format, filename="users")
 
 
 @router.post(
@@ -87,7 +115,7 @@ async def update_user_me(
 @router.delete("/me", response_model=MessageResponse)
 async def delete_user_me(
     session: SessionDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
 ) -> MessageResponse:
     if current_user.is_superuser:
         raise HTTPException(
@@ -100,12 +128,12 @@ async def delete_user_me(
 
 @router.get("/{user_id}", response_model=UserPublic)
 async def read_user_by_id(
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: ReadSessionDep,
+    current_user: CurrentPrincipal,
     user_id: UUID,
 ):
     user = await user_service.get_user_by_id(session, user_id)
-    if user == current_user:
+    if user.id == current_user.id:
         return UserPublic.model_validate(user)
     if not current_user.is_superuser:
         raise HTTPException(
@@ -137,10 +165,10 @@ async def update_user(
     response_model=MessageResponse,
 )
 async def delete_user(
-    session: SessionDep, current_user: CurrentUser, user_id: UUID
+    session: SessionDep, current_user: CurrentPrincipal, user_id: UUID
 ) -> MessageResponse:
     user = await user_service.get_user_by_id(session, user_id)
-    if user == current_user:
+    if user.id == current_user.id:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
@@ -1,4 +1,10 @@
-from fastapi import APIRouter
+import asyncio
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import get_current_active_superuser
+from app.core.slow_queries import slow_query_recorder
+from app.schemas.slow_query_schema import SlowQueryStat
 
 router = APIRouter(prefix="/utils", tags=["utils"])
 
@@ -6,3 +12,15 @@ router = APIRouter(prefix="/utils", tags=["utils"])
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
+
+
+@router.get(
+    "/slow-queries",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=list[SlowQueryStat],
+    summary="Slowest statements by total time",
+    description="Aggregated from the slow-query logs of every worker. Only "
+    "superusers can access this.",
+)
+async def read_slow_queries(limit: int = Query(default=10, ge=1, le=100)):
+    return await asyncio.to_thread(slow_query_recorder.top, limit)
@@ -0,0 +1,423 @@
+"""Bulk load users, tags, posts, post-tag links and comments with COPY.
+
+Each table is read from ``<name>.ndjson`` or ``<name>.csv`` in a directory
+(``users``, ``tags``, ``posts``, ``post_tags``, ``comments``) and streamed to
+Postgres with ``COPY`` in chunks, so memory use does not grow with the input.
+Missing files are skipped; tables are loaded in foreign key order.
+
+Columns left out of a row get the same defaults the API would give them
+(new id, current timestamps, not deleted). User rows may carry a plain
+``password`` instead of ``hashed_password``; those are hashed in a process
+pool.
+
+    python -m app.bulk_import load data/ --rebuild-indexes
+    python -m app.bulk_import generate data/ --users 100000 --posts-per-user 20
+
+``generate`` writes a synthetic dataset in the same layout, which is how
+benchmark databases are built.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import random
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from datetime import UTC, datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+import asyncpg  # type: ignore[import-untyped]
+import sqlalchemy as sa
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models import Comment, Post, Tag, User
+from app.models.tag_model import PostTagLink
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# File name -> table, in foreign key order.
+SOURCES: dict[str, sa.Table] = {
+    "users": User.__table__,  # type: ignore[attr-defined]
+    "tags": Tag.__table__,  # type: ignore[attr-defined]
+    "posts": Post.__table__,  # type: ignore[attr-defined]
+    "post_tags": PostTagLink.__table__,  # type: ignore[attr-defined]
+    "comments": Comment.__table__,  # type: ignore[attr-defined]
+}
+
+Row = dict[str, Any]
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "t", "true", "y", "yes")
+
+
+def _converter(column: sa.Column) -> Callable[[Any], Any]:
+    if isinstance(column.type, sa.Uuid):
+        return lambda value: value if isinstance(value, uuid.UUID) else uuid.UUID(value)
+    if isinstance(column.type, sa.DateTime):
+        return lambda value: (
+            value if isinstance(value, datetime) else datetime.fromisoformat(value)
+        )
+    if isinstance(column.type, sa.Boolean):
+        return _parse_bool
+    return str
+
+
+class TableLoader:
+    """Turns input rows into COPY records for one table."""
+
+    def __init__(self, table: sa.Table, loaded_at: datetime):
+        self.table = table
+        self.columns = [column.name for column in table.columns]
+        self.converters = {column.name: _converter(column) for column in table.columns}
+        self.nullable = {column.name for column in table.columns if column.nullable}
+        self.defaults: dict[str, Callable[[], Any]] = {
+            "id": uuid.uuid4,
+            "created_at": lambda: loaded_at,
+            "updated_at": lambda: loaded_at,
+            "is_deleted": lambda: False,
+            "is_superuser": lambda: False,
+        }
+
+    def record(self, row: Row, line: int) -> tuple[Any, ...]:
+        values: list[Any] = []
+        for name in self.columns:
+            value = row.get(name)
+            if value is None or (value == "" and name in self.nullable):
+                if name in self.defaults:
+                    value = self.defaults[name]()
+                elif name in self.nullable:
+                    values.append(None)
+                    continue
+                else:
+                    raise ValueError(
+                        f"{self.table.name} line {line}: missing required {name!r}"
+                    )
+            values.append(self.converters[name](value))
+        return tuple(values)
+
+
+def _read_rows(path: Path) -> Iterator[Row]:
+    with path.open(newline="" if path.suffix == ".csv" else None) as f:
+        if path.suffix == ".csv":
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _chunks(rows: Iterable[Row], size: int) -> Iterator[list[Row]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _hash_passwords(passwords: list[str]) -> list[str]:
+    return [get_password_hash(password) for password in passwords]
+
+
+async def _hash_chunk(
+    chunk: list[Row], pool: ProcessPoolExecutor, workers: int
+) -> None:
+    """Replace plain ``password`` fields with hashes, spread over the pool."""
+    pending = [row for row in chunk if row.get("password")]
+    if not pending:
+        return
+    loop = asyncio.get_running_loop()
+    step = -(-len(pending) // workers)
+    slices = [pending[i : i + step] for i in range(0, len(pending), step)]
+    hashed = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                pool, _hash_passwords, [row["password"] for row in part]
+            )
+            for part in slices
+        )
+    )
+    for part, hashes in zip(slices, hashed):
+        for row, hashed_password in zip(part, hashes):
+            row["hashed_password"] = hashed_password
+
+
+async def _records(
+    path: Path,
+    loader: TableLoader,
+    pool: ProcessPoolExecutor,
+    args: argparse.Namespace,
+) -> AsyncIterator[tuple[Any, ...]]:
+    line = 0
+    for chunk in _chunks(_read_rows(path), args.chunk_size):
+        if loader.table.name == "user":
+            await _hash_chunk(chunk, pool, args.workers)
+        for row in chunk:
+            line += 1
+            yield loader.record(row, line)
+
+
+def _find_source(directory: Path, name: str) -> Path | None:
+    for suffix in (".ndjson", ".csv"):
+        path = directory / f"{name}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+async def _drop_indexes(conn: asyncpg.Connection, tables: list[str]) -> list[str]:
+    """Drop non-unique secondary indexes and return their definitions.
+
+    Primary keys and unique indexes stay, so duplicates are still rejected.
+    """
+    rows = await conn.fetch(
+        """
+        SELECT indexrelid::regclass::text AS name,
+               pg_get_indexdef(indexrelid) AS definition
+        FROM pg_index
+        WHERE indrelid = ANY($1::text[]::regclass[])
+          AND NOT indisprimary AND NOT indisunique
+        """,
+        [f'"{table}"' for table in tables],
+    )
+    for row in rows:
+        await conn.execute(f"DROP INDEX {row['name']}")
+    logger.info("Dropped %d indexes", len(rows))
+    return [row["definition"] for row in rows]
+
+
+async def _rebuild_indexes(conn: asyncpg.Connection, definitions: list[str]) -> None:
+    started = time.monotonic()
+    for definition in definitions:
+        await conn.execute(definition)
+    logger.info(
+        "Rebuilt %d indexes in %.1fs", len(definitions), time.monotonic() - started
+    )
+
+
+async def load(args: argparse.Namespace) -> None:
+    sources = [
+        (path, table)
+        for name, table in SOURCES.items()
+        if (path := _find_source(args.directory, name)) is not None
+    ]
+    if not sources:
+        raise SystemExit(f"No input files found in {args.directory}")
+
+    dsn = settings.async_database_url.replace("postgresql+asyncpg", "postgresql", 1)
+    conn = await asyncpg.connect(dsn)
+    loaded_at = datetime.now(UTC)
+    tables = [table.name for _, table in sources]
+    definitions: list[str] = []
+    try:
+        if args.rebuild_indexes:
+            definitions = await _drop_indexes(conn, tables)
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for path, table in sources:
+                loader = TableLoader(table, loaded_at)
+                started = time.monotonic()
+                status = await conn.copy_records_to_table(
+                    table.name,
+                    records=_records(path, loader, pool, args),
+                    columns=loader.columns,
+                )
+                elapsed = time.monotonic() - started
+                rows = int(status.split()[-1])
+                logger.info(
+                    "%s: %d rows in %.1fs (%.0f rows/s)",
+                    table.name,
+                    rows,
+                    elapsed,
+                    rows / elapsed if elapsed else rows,
+                )
+    finally:
+        # Indexes come back even when a COPY fails half way.
+        if definitions:
+            await _rebuild_indexes(conn, definitions)
+        for name in tables:
+            await conn.execute(f'ANALYZE "{name}"')
+        await conn.close()
+
+
+def generate(args: argparse.Namespace) -> None:
+    """Write a synthetic dataset, one row at a time.
+
+    User ids are derived from their number so comments can pick random
+    authors without keeping every user in memory.
+    """
+    rng = random.Random(args.seed)
+    namespace = uuid.uuid5(uuid.NAMESPACE_DNS, f"bulk-import-{args.seed}")
+    now = datetime.now(UTC)
+    hashed_password = get_password_hash(args.password)
+    words = [
+        "lorem",
+        "ipsum",
+        "dolor",
+        "sit",
+        "amet",
+        "consectetur",
+        "adipiscing",
+        "elit",
+        "sed",
+        "do",
+        "eiusmod",
+        "tempor",
+        "incididunt",
+        "ut",
+        "labore",
+        "et",
+        "dolore",
+        "magna",
+        "aliqua",
+    ]
+
+    def user_id(n: int) -> str:
+        return str(uuid.uuid5(namespace, f"user-{n}"))
+
+    def text(count: int) -> str:
+        return " ".join(rng.choices(words, k=count))
+
+    def deleted() -> tuple[bool, str | None]:
+        if rng.random() < args.deleted_ratio:
+            return True, now.isoformat()
+        return False, None
+
+    def write(f: Any, row: Row) -> None:
+        f.write(json.dumps(row))
+        f.write("\n")
+
+    args.directory.mkdir(parents=True, exist_ok=True)
+    with ExitStack() as stack:
+        files = {
+            name: stack.enter_context((args.directory / f"{name}.ndjson").open("w"))
+            for name in SOURCES
+        }
+        tag_ids = [str(uuid.uuid5(namespace, f"tag-{n}")) for n in range(args.tags)]
+        for n, tag_id in enumerate(tag_ids):
+            write(
+                files["tags"],
+                {"id": tag_id, "name": f"tag-{n}", "description": text(6)},
+            )
+
+        posts = comments = 0
+        for n in range(args.users):
+            user_created = now - timedelta(days=rng.uniform(30, 3 * 365))
+            is_deleted, deleted_at = deleted()
+            write(
+                files["users"],
+                {
+                    "id": user_id(n),
+                    "email": f"user{n}@example.com",
+                    "full_name": f"User {n}",
+                    "hashed_password": hashed_password,
+                    "created_at": user_created.isoformat(),
+                    "is_deleted": is_deleted,
+                    "deleted_at": deleted_at,
+                },
+            )
+            for _ in range(rng.randint(0, 2 * args.posts_per_user)):
+                post_id = str(uuid.uuid4())
+                post_created = user_created + (now - user_created) * rng.random()
+                is_deleted, deleted_at = deleted()
+                write(
+                    files["posts"],
+                    {
+                        "id": post_id,
+                        "title": text(rng.randint(3, 8)).capitalize(),
+                        "content": text(rng.randint(20, 200)),
+                        "author_id": user_id(n),
+                        "created_at": post_created.isoformat(),
+                        "is_deleted": is_deleted,
+                        "deleted_at": deleted_at,
+                    },
+                )
+                posts += 1
+                for tag_id in rng.sample(
+                    tag_ids, k=min(len(tag_ids), rng.randint(0, 3))
+                ):
+                    write(files["post_tags"], {"post_id": post_id, "tag_id": tag_id})
+                for _ in range(rng.randint(0, 2 * args.comments_per_post)):
+                    is_deleted, deleted_at = deleted()
+                    comment_created = post_created + (now - post_created) * rng.random()
+                    write(
+                        files["comments"],
+                        {
+                            "content": text(rng.randint(3, 40)),
+                            "post_id": post_id,
+                            "author_id": user_id(rng.randrange(args.users)),
+                            "created_at": comment_created.isoformat(),
+                            "is_deleted": is_deleted,
+                            "deleted_at": deleted_at,
+                        },
+                    )
+                    comments += 1
+
+    logger.info(
+        "Wrote %d users, %d tags, %d posts and %d comments to %s",
+        args.users,
+        args.tags,
+        posts,
+        comments,
+        args.directory,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load_parser = commands.add_parser("load", help="COPY input files into the database")
+    load_parser.add_argument("directory", type=Path)
+    load_parser.add_argument(
+        "--rebuild-indexes",
+        action="store_true",
+        help="Drop secondary indexes before loading and rebuild them afterwards",
+    )
+    load_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=10_000,
+        help="Rows read, hashed and sent at a time",
+    )
+    load_parser.add_argument(
+        "--workers", type=int, default=4, help="Processes hashing passwords"
+    )
+
+    generate_parser = commands.add_parser(
+        "generate", help="Write a synthetic dataset as NDJSON"
+    )
+    generate_parser.add_argument("directory", type=Path)
+    generate_parser.add_argument("--users", type=int, default=1000)
+    generate_parser.add_argument(
+        "--posts-per-user", type=int, default=10, help="Average, varies per user"
+    )
+    generate_parser.add_argument(
+        "--comments-per-post", type=int, default=5, help="Average, varies per post"
+    )
+    generate_parser.add_argument("--tags", type=int, default=50)
+    generate_parser.add_argument("--deleted-ratio", type=float, default=0.05)
+    generate_parser.add_argument(
+        "--password",
+        default="Bench123!x",
+        help="Password shared by all generated users",
+    )
+    generate_parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+    if args.command == "generate":
+        generate(args)
+    else:
+        asyncio.run(load(args))
+
+
+if __name__ == "__main__":
+    main()
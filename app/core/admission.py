@@ -0,0 +1,197 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import TypeVar
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+F = TypeVar("F", bound=Callable)
+
+ADMISSION_WAIT = registry.histogram(
+    "admission_wait_seconds", "Time requests waited for a database slot, by priority."
+)
+ADMISSION_REJECTED = registry.counter(
+    "admission_rejected_total",
+    "Requests turned away with a 503, by priority and reason.",
+)
+
+
+class Priority(IntEnum):
+    """Lower values are admitted first."""
+
+    CRITICAL = 0
+    NORMAL = 1
+    LOW = 2
+
+
+def priority(level: Priority) -> Callable[[F], F]:
+    """Mark a route's admission priority; apply it under the route decorator.
+
+    Routes that change data are CRITICAL whatever they are marked; reads are
+    NORMAL unless marked otherwise, e.g. LOW for list scans and exports.
+    """
+
+    def decorate(endpoint: F) -> F:
+        endpoint.admission_priority = level  # type: ignore[attr-defined]
+        return endpoint
+
+    return decorate
+
+
+class AdmissionController:
+    """Bound the requests doing database work at once, by priority.
+
+    Up to ``limit`` requests hold a slot; the last ``reserved`` slots are
+    only given to CRITICAL ones, so logins and writes still get through
+    while reads fill the pool. Waiting requests are admitted in priority
+    order and give up with a 503 after ``max_wait`` seconds. NORMAL ones are
+    turned away right away once ``max_queue`` requests of their priority or
+    higher wait, LOW ones at half of that, and LOW ones too while checkouts
+    from the pool take more than ``pool_wait_budget`` seconds on average.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        reserved: int,
+        max_queue: int,
+        max_wait: float,
+        pool_wait_budget: float,
+    ):
+        self.limit = limit
+        self.reserved = min(reserved, max(limit - 1, 0))
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.pool_wait_budget = pool_wait_budget
+        self.in_flight = 0
+        # Exponentially weighted mean of pool checkout times.
+        self.pool_wait = 0.0
+        self._waiters: dict[Priority, deque[asyncio.Future]] = {
+            level: deque() for level in Priority
+        }
+
+    @property
+    def queued(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def observe_pool_wait(self, seconds: float) -> None:
+        self.pool_wait += (seconds - self.pool_wait) * 0.1
+
+    def _capacity(self, level: Priority) -> int:
+        return self.limit if level == Priority.CRITICAL else self.limit - self.reserved
+
+    def _queue_limit(self, level: Priority) -> float:
+        if level == Priority.CRITICAL:
+            return float("inf")
+        if level == Priority.NORMAL:
+            return self.max_queue
+        return self.max_queue // 2
+
+    def _reject(self, level: Priority, reason: str) -> HTTPException:
+        ADMISSION_REJECTED.inc(priority=level.name.lower(), reason=reason)
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The server is busy, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    @asynccontextmanager
+    async def admit(self, level: Priority) -> AsyncIterator[None]:
+        if self.limit <= 0:
+            yield
+            return
+        await self._acquire(level)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, level: Priority) -> None:
+        ahead = sum(len(self._waiters[p]) for p in Priority if p <= level)
+        if not ahead and self.in_flight < self._capacity(level):
+            self.in_flight += 1
+            ADMISSION_WAIT.observe(0, priority=level.name.lower())
+            return
+        if level == Priority.LOW and self.pool_wait > self.pool_wait_budget:
+            raise self._reject(level, "pool_wait")
+        if ahead >= self._queue_limit(level):
+            raise self._reject(level, "queue_full")
+
+        start = time.perf_counter()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[level].append(waiter)
+        try:
+            async with asyncio.timeout(self.max_wait):
+                await waiter
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # Timed out or cancelled right after being handed a slot.
+                self._release()
+            else:
+                waiter.cancel()
+                self._waiters[level].remove(waiter)
+            if isinstance(exc, TimeoutError):
+                raise self._reject(level, "timeout") from None
+            raise
+        ADMISSION_WAIT.observe(time.perf_counter() - start, priority=level.name.lower())
+
+    def _release(self) -> None:
+        # The freed slot goes straight to the first waiter allowed to take it,
+        # so in_flight only drops when nobody eligible is waiting.
+        for level in Priority:
+            if self.in_flight - 1 >= self._capacity(level):
+                continue
+            waiters = self._waiters[level]
+            while waiters:
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+        self.in_flight -= 1
+
+
+admission_controller = AdmissionController(
+    limit=(
+        settings.ADMISSION_MAX_CONCURRENCY
+        if settings.ADMISSION_MAX_CONCURRENCY is not None
+        else settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW  # type: ignore[operator]
+    ),
+    reserved=settings.ADMISSION_RESERVED_SLOTS,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    max_wait=settings.ADMISSION_MAX_WAIT_SECONDS,
+    pool_wait_budget=settings.ADMISSION_POOL_WAIT_BUDGET_SECONDS,
+)
+
+
+def _collect():
+    yield (
+        "admission_in_flight",
+        "gauge",
+        "Requests holding a database slot.",
+        {},
+        admission_controller.in_flight,
+    )
+    for level, waiters in admission_controller._waiters.items():
+        yield (
+            "admission_queued",
+            "gauge",
+            "Requests waiting for a database slot, by priority.",
+            {"priority": level.name.lower()},
+            len(waiters),
+        )
+    yield (
+        "admission_pool_wait_seconds",
+        "gauge",
+        "Moving average of pool checkout times, which sheds LOW requests.",
+        {},
+        admission_controller.pool_wait,
+    )
+
+
+registry.register_collector(_collect)
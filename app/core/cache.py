@@ -0,0 +1,541 @@
+import asyncio
+import json
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+from app.core.logs import get_logger
+from app.core.metrics import registry
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A serialized JSON body and what the route needs to answer with it,
+    e.g. its validators."""
+
+    body: bytes
+    meta: dict[str, Any]
+
+    def encode(self) -> bytes:
+        return json.dumps(self.meta).encode() + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, raw: bytes) -> "CachedResponse":
+        meta, _, body = raw.partition(b"\n")
+        return cls(body=body, meta=json.loads(meta))
+
+
+# What a fill returns: the response and the tags that invalidate it.
+Fill = Callable[[], Awaitable[tuple[CachedResponse, Iterable[str]]]]
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    fills: int = 0
+    stale_fills: int = 0
+    oversized: int = 0
+    errors: int = 0
+
+
+class LRUBackend:
+    """Entries kept per worker, least recently used out past ``max_bytes``.
+
+    Invalidations only reach this worker; others keep serving their copy
+    until it expires.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float, bytes, tuple[str, ...]]] = (
+            OrderedDict()
+        )
+        self._tagged: dict[str, set[str]] = {}
+        self._invalidated: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(
+        self, key: str, value: bytes, ttl: float, tags: Iterable[str]
+    ) -> None:
+        self._remove(key)
+        tags = tuple(tags)
+        self._entries[key] = (time.monotonic() + ttl, value, tags)
+        self.size += len(value)
+        for tag in tags:
+            self._tagged.setdefault(tag, set()).add(key)
+        while self.size > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= len(entry[1])
+        for tag in entry[2]:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    async def invalidate(self, tags: Iterable[str], keep: float) -> None:
+        now = time.time()
+        if len(self._invalidated) > 1000:
+            self._invalidated = {
+                tag: at for tag, at in self._invalidated.items() if at > now - keep
+            }
+        for tag in tags:
+            self._invalidated[tag] = now
+            for key in list(self._tagged.get(tag, ())):
+                self._remove(key)
+
+    async def invalidated_since(self, tags: Iterable[str], since: float) -> bool:
+        return any(self._invalidated.get(tag, 0) >= since for tag in tags)
+
+    async def lock(self, key: str, ttl: float) -> bool:
+        # Fills in this worker are already coalesced by ResponseCache.
+        return True
+
+    async def unlock(self, key: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        self._entries.clear()
+        self._tagged.clear()
+        self.size = 0
+
+
+class RespError(Exception):
+    """An error reply from the server."""
+
+
+# What an unreachable or misbehaving cache server raises; requests then go
+# without the cache.
+CACHE_ERRORS: tuple[type[BaseException], ...] = (
+    OSError,
+    RespError,
+    asyncio.TimeoutError,
+)
+
+
+class RespConnection:
+    """One connection speaking RESP2, the Redis protocol.
+
+    Commands are pipelined: all of them are written at once, then as many
+    replies are read back.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @staticmethod
+    def _encode(command: tuple) -> bytes:
+        parts = [b"*%d\r\n" % len(command)]
+        for arg in command:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    async def _read(self):
+        line = await self.reader.readuntil(b"\r\n")
+        kind, value = line[:1], line[1:-2]
+        if kind == b"+":
+            return value.decode()
+        if kind == b"-":
+            return RespError(value.decode())
+        if kind == b":":
+            return int(value)
+        if kind == b"$":
+            if int(value) < 0:
+                return None
+            data = await self.reader.readexactly(int(value) + 2)
+            return data[:-2]
+        if kind == b"*":
+            if int(value) < 0:
+                return None
+            return [await self._read() for _ in range(int(value))]
+        raise ConnectionError(f"Unexpected reply {line!r}")
+
+    async def execute(self, *commands: tuple) -> list:
+        self.writer.write(b"".join(self._encode(command) for command in commands))
+        await self.writer.drain()
+        try:
+            replies = [await self._read() for _ in commands]
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError) as exc:
+            # Closed or garbled mid-reply: the connection is of no further use.
+            raise ConnectionError(f"Bad reply from the server: {exc!r}") from exc
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except OSError:
+            pass
+
+
+class RespPool:
+    """Up to ``size`` connections to the server at ``url``, opened lazily.
+
+    ``url`` is ``redis://[:password@]host[:port][/db]``. A connection that
+    fails mid-command is dropped rather than returned to the pool.
+    """
+
+    def __init__(self, url: str, size: int, timeout: float):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = parts.password
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(size)
+        self._idle: list[RespConnection] = []
+
+    async def _connect(self) -> RespConnection:
+        conn = RespConnection(*await asyncio.open_connection(self.host, self.port))
+        setup: list[tuple[str, str | int]] = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            await conn.execute(*setup)
+        return conn
+
+    async def execute(self, *commands: tuple) -> list:
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else None
+            try:
+                async with asyncio.timeout(self.timeout):
+                    if conn is None:
+                        conn = await self._connect()
+                    replies = await conn.execute(*commands)
+            except BaseException as exc:
+                if conn is not None and not isinstance(exc, RespError):
+                    await conn.close()
+                    conn = None
+                raise
+            finally:
+                if conn is not None:
+                    self._idle.append(conn)
+            return replies
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await conn.close()
+
+
+class RedisBackend:
+    """Entries shared by all workers through a Redis-protocol server.
+
+    Each tag is a set of the keys it covers; invalidating a tag deletes them
+    and records when it happened, which fills started earlier check.
+    """
+
+    def __init__(self, url: str, pool_size: int, timeout: float, prefix: str = "rc:"):
+        self.pool = RespPool(url, pool_size, timeout)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> bytes | None:
+        (value,) = await self.pool.execute(("GET", self.prefix + key))
+        return value
+
+    async def set(
+        self, key: str, value: bytes, ttl: float, tags: Iterable[str]
+    ) -> None:
+        ms = max(int(ttl * 1000), 1)
+        commands: list[tuple] = [("SET", self.prefix + key, value, "PX", ms)]
+        for tag in tags:
+            tag_key = f"{self.prefix}tag:{tag}"
+            commands.append(("SADD", tag_key, self.prefix + key))
+            # Outlive the longest entry; a set left behind only costs memory.
+            commands.append(("PEXPIRE", tag_key, ms * 2))
+        await self.pool.execute(*commands)
+
+    async def invalidate(self, tags: Iterable[str], keep: float) -> None:
+        tags = list(tags)
+        tag_keys = [f"{self.prefix}tag:{tag}" for tag in tags]
+        members = await self.pool.execute(
+            *(("SMEMBERS", tag_key) for tag_key in tag_keys)
+        )
+        keys = {key for found in members for key in found or ()}
+        now = time.time()
+        ms = max(int(keep * 1000), 1)
+        await self.pool.execute(
+            ("DEL", *keys, *tag_keys),
+            *(("SET", f"{self.prefix}inv:{tag}", now, "PX", ms) for tag in tags),
+        )
+
+    async def invalidated_since(self, tags: Iterable[str], since: float) -> bool:
+        tags = list(tags)
+        if not tags:
+            return False
+        (stamps,) = await self.pool.execute(
+            ("MGET", *(f"{self.prefix}inv:{tag}" for tag in tags))
+        )
+        return any(stamp is not None and float(stamp) >= since for stamp in stamps)
+
+    async def lock(self, key: str, ttl: float) -> bool:
+        (reply,) = await self.pool.execute(
+            ("SET", f"{self.prefix}lock:{key}", 1, "NX", "PX", max(int(ttl * 1000), 1))
+        )
+        return reply == "OK"
+
+    async def unlock(self, key: str) -> None:
+        await self.pool.execute(("DEL", f"{self.prefix}lock:{key}"))
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+
+Backend = LRUBackend | RedisBackend
+
+
+class ResponseCache:
+    """Serialized responses cached under per-entity keys, dropped by tag.
+
+    Entries live ``ttl`` seconds, shortened by up to ``jitter`` of that so
+    keys filled together do not expire together. Concurrent misses on a key
+    share a single fill in each worker; with a shared backend, the worker
+    holding the fill lock fills it while the others poll for the result for
+    up to ``lock_timeout`` seconds. A fill whose tags were invalidated after
+    it started, or within ``settle`` seconds before, is served but not
+    stored, since it may have read rows the invalidation was about; the
+    settle window covers reads from lagging replicas. Bodies over
+    ``max_entry_bytes`` are not stored either.
+
+    Backend errors count as misses: the response is built from the database
+    and the cache is skipped.
+    """
+
+    def __init__(
+        self,
+        backend: Backend | None,
+        ttl: float,
+        jitter: float,
+        max_entry_bytes: int,
+        lock_timeout: float,
+        settle: float,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.jitter = jitter
+        self.max_entry_bytes = max_entry_bytes
+        self.lock_timeout = lock_timeout
+        self.settle = settle
+        self.stats: dict[str, ResponseCacheStats] = {}
+        self._fills: dict[str, asyncio.Task] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl > 0
+
+    def _stats(self, key: str) -> ResponseCacheStats:
+        namespace = key.partition(":")[0]
+        stats = self.stats.get(namespace)
+        if stats is None:
+            stats = self.stats[namespace] = ResponseCacheStats()
+        return stats
+
+    def _error(self, key: str, exc: BaseException) -> None:
+        self._stats(key).errors += 1
+        get_logger().warning(f"Response cache unavailable for {key}: {exc!r}")
+
+    async def get_or_fill(self, key: str, fill: Fill) -> CachedResponse:
+        """The cached response for ``key``, calling ``fill`` on a miss."""
+        if not self.enabled:
+            response, _ = await fill()
+            return response
+        try:
+            raw = await self.backend.get(key)  # type: ignore[union-attr]
+        except CACHE_ERRORS as exc:
+            self._error(key, exc)
+            response, _ = await fill()
+            return response
+        if raw is not None:
+            self._stats(key).hits += 1
+            return CachedResponse.decode(raw)
+
+        task = self._fills.get(key)
+        if task is None:
+            self._stats(key).misses += 1
+            task = asyncio.ensure_future(self._fill(key, fill))
+            self._fills[key] = task
+            task.add_done_callback(lambda _: self._fills.pop(key, None))
+            # The fill uses this request's session, so it is cancelled along
+            # with the request.
+            return await task
+        self._stats(key).coalesced += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled() or asyncio.current_task().cancelling():  # type: ignore[union-attr]
+                raise
+        # The request filling the key went away; fill it with ours.
+        return await self._fill(key, fill)
+
+    async def _fill(self, key: str, fill: Fill) -> CachedResponse:
+        backend = self.backend
+        assert backend is not None
+        started = time.time()
+        try:
+            locked = await backend.lock(key, self.lock_timeout)
+        except CACHE_ERRORS as exc:
+            self._error(key, exc)
+            response, _ = await fill()
+            return response
+        if not locked:
+            raw = await self._wait_for(key)
+            if raw is not None:
+                self._stats(key).hits += 1
+                return CachedResponse.decode(raw)
+        try:
+            response, tags = await fill()
+            await self._store(key, response, list(tags), started)
+            return response
+        finally:
+            if locked:
+                try:
+                    await backend.unlock(key)
+                except CACHE_ERRORS as exc:
+                    self._error(key, exc)
+
+    async def _wait_for(self, key: str) -> bytes | None:
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.025)
+            try:
+                raw = await self.backend.get(key)  # type: ignore[union-attr]
+            except CACHE_ERRORS as exc:
+                self._error(key, exc)
+                return None
+            if raw is not None:
+                return raw
+        return None
+
+    async def _store(
+        self, key: str, response: CachedResponse, tags: list[str], started: float
+    ) -> None:
+        backend = self.backend
+        assert backend is not None
+        stats = self._stats(key)
+        value = response.encode()
+        if len(value) > self.max_entry_bytes:
+            stats.oversized += 1
+            return
+        try:
+            if await backend.invalidated_since(tags, started - self.settle):
+                stats.stale_fills += 1
+                return
+            ttl = self.ttl * (1 - self.jitter * random.random())
+            await backend.set(key, value, ttl, tags)
+        except CACHE_ERRORS as exc:
+            self._error(key, exc)
+            return
+        stats.fills += 1
+
+    async def invalidate(self, *tags: str) -> None:
+        """Drop the entries under ``tags``; call it once the write is committed."""
+        if self.backend is None or not tags:
+            return
+        try:
+            await self.backend.invalidate(
+                tags, keep=self.ttl + self.settle + self.lock_timeout
+            )
+        except CACHE_ERRORS as exc:
+            self._error(tags[0], exc)
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+
+def _backend() -> Backend | None:
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return LRUBackend(max_bytes=settings.RESPONSE_CACHE_MAX_BYTES)
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisBackend(
+            settings.RESPONSE_CACHE_REDIS_URL,
+            pool_size=settings.RESPONSE_CACHE_REDIS_POOL_SIZE,
+            timeout=settings.RESPONSE_CACHE_REDIS_TIMEOUT_SECONDS,
+        )
+    return None
+
+
+response_cache = ResponseCache(
+    backend=_backend(),
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    jitter=settings.RESPONSE_CACHE_TTL_JITTER,
+    max_entry_bytes=settings.RESPONSE_CACHE_MAX_ENTRY_BYTES,
+    lock_timeout=settings.RESPONSE_CACHE_LOCK_SECONDS,
+    settle=(settings.REPLICA_MAX_LAG_SECONDS if settings.POSTGRES_REPLICA_URLS else 0),
+)
+
+
+def _collect():
+    for namespace, stats in response_cache.stats.items():
+        labels = {"namespace": namespace}
+        for name, value in asdict(stats).items():
+            yield (
+                f"response_cache_{name}_total",
+                "counter",
+                f"Response cache {name.replace('_', ' ')}, by key namespace.",
+                labels,
+                value,
+            )
+        lookups = stats.hits + stats.misses + stats.coalesced
+        yield (
+            "response_cache_hit_ratio",
+            "gauge",
+            "Share of lookups answered from the cache, by key namespace.",
+            labels,
+            stats.hits / lookups if lookups else 0,
+        )
+    backend = response_cache.backend
+    if isinstance(backend, LRUBackend):
+        yield ("response_cache_entries", "gauge", "Responses cached.", {}, len(backend))
+        yield (
+            "response_cache_bytes",
+            "gauge",
+            "Size of the responses cached.",
+            {},
+            backend.size,
+        )
+        yield (
+            "response_cache_evictions_total",
+            "counter",
+            "Responses evicted to stay under RESPONSE_CACHE_MAX_BYTES.",
+            {},
+            backend.evictions,
+        )
+
+
+registry.register_collector(_collect)
@@ -8,6 +8,7 @@ from pydantic import (
     computed_field,
     BeforeValidator,
     AnyUrl,
+    model_validator,
 )
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -20,6 +21,29 @@ def parse_cors(v: Any) -> list[str] | str:
     raise ValueError(v)
 
 
+# Engine settings left unset take the value for the current ENVIRONMENT.
+ENVIRONMENT_DB_DEFAULTS: dict[str, dict[str, Any]] = {
+    "local": {
+        "DB_ECHO": True,
+        "DB_POOL_SIZE": 5,
+        "DB_MAX_OVERFLOW": 10,
+        "DB_POOL_TIMEOUT": 30,
+    },
+    "staging": {
+        "DB_ECHO": False,
+        "DB_POOL_SIZE": 10,
+        "DB_MAX_OVERFLOW": 10,
+        "DB_POOL_TIMEOUT": 10,
+    },
+    "production": {
+        "DB_ECHO": False,
+        "DB_POOL_SIZE": 20,
+        "DB_MAX_OVERFLOW": 10,
+        "DB_POOL_TIMEOUT": 5,
+    },
+}
+
+
 class Settings(BaseSettings):
     # Application
     PROJECT_NAME: str = "FastAPI CRUD Challenge"
@@ -42,9 +66,139 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
 
+    # Engine and pool. Each worker holds up to DB_POOL_SIZE + DB_MAX_OVERFLOW
+    # connections, so size them against max_connections divided by the
+    # number of workers. DB_POOL_TIMEOUT is how long a request waits for a
+    # connection before failing; DB_COMMAND_TIMEOUT caps a single statement.
+    # DB_STATEMENT_CACHE_SIZE is asyncpg's prepared statement cache per
+    # connection and DB_QUERY_CACHE_SIZE SQLAlchemy's compiled SQL cache.
+    DB_ECHO: bool | None = None
+    DB_POOL_SIZE: int | None = None
+    DB_MAX_OVERFLOW: int | None = None
+    DB_POOL_TIMEOUT: float | None = None
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_CONNECT_TIMEOUT: float = 10
+    DB_COMMAND_TIMEOUT: float | None = None
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_QUERY_CACHE_SIZE: int = 500
+    # On startup each worker waits up to DB_READY_TIMEOUT_SECONDS for the
+    # database, then opens and primes DB_WARMUP_CONNECTIONS connections
+    # (default: the pool size; 0 skips the warmup) before reporting ready.
+    DB_READY_TIMEOUT_SECONDS: float = 120
+    DB_WARMUP_CONNECTIONS: int | None = None
+
+    # Optional read replicas, as comma-separated postgresql+asyncpg URLs.
+    # Read-only routes use them round-robin while their health check passes
+    # (reachable, and replaying within REPLICA_MAX_LAG_SECONDS of the
+    # primary). After a user writes, their reads stay on the primary for
+    # READ_YOUR_WRITES_SECONDS.
+    POSTGRES_REPLICA_URLS: Annotated[list[str] | str, BeforeValidator(parse_cors)] = []
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = 5
+    REPLICA_MAX_LAG_SECONDS: float = 30
+    READ_YOUR_WRITES_SECONDS: float = 5
+
+    # Admission control in front of primary sessions: at most
+    # ADMISSION_MAX_CONCURRENCY requests (default: pool size plus overflow)
+    # hold one, the last ADMISSION_RESERVED_SLOTS only for logins and
+    # writes. Others wait up to ADMISSION_MAX_WAIT_SECONDS, in priority
+    # order, and get a 503 with Retry-After once ADMISSION_MAX_QUEUE wait
+    # (half that for list scans and exports). List scans are also turned
+    # away while pool checkouts average over ADMISSION_POOL_WAIT_BUDGET_SECONDS.
+    # A limit of 0 disables admission control.
+    ADMISSION_MAX_CONCURRENCY: int | None = None
+    ADMISSION_RESERVED_SLOTS: int = 2
+    ADMISSION_MAX_QUEUE: int = 100
+    ADMISSION_MAX_WAIT_SECONDS: float = 2
+    ADMISSION_POOL_WAIT_BUDGET_SECONDS: float = 0.25
+
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
 
+    # Pagination totals: "exact" counts inline with the page query,
+    # "estimated" uses planner estimates and "cached" keeps exact counts
+    # per worker for COUNT_CACHE_TTL_SECONDS.
+    COUNT_STRATEGY: Literal["exact", "estimated", "cached"] = "exact"
+    COUNT_ESTIMATE_EXACT_BELOW: int = 10_000
+    COUNT_CACHE_TTL_SECONDS: float = 30
+    COUNT_CACHE_MAX_ENTRIES: int = 1024
+
+    # Rows updated per transaction when a soft delete or restore cascades
+    # to dependent rows.
+    CASCADE_BATCH_SIZE: int = 1000
+
+    # Bulk create endpoints: items accepted per request and rows sent per
+    # multi-row INSERT. All batches of a request share one transaction.
+    BULK_MAX_ITEMS: int = 5000
+    BULK_INSERT_BATCH_SIZE: int = 500
+
+    # Rows fetched per round trip by the streaming export endpoints.
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Authenticated-user principals (id, superuser and deleted flags) kept
+    # per worker; a TTL of 0 disables the cache. With USER_CACHE_CHANNEL set,
+    # user writes are also sent on that Postgres NOTIFY channel so every
+    # worker drops its entry, not only the one that handled the write.
+    USER_CACHE_TTL_SECONDS: float = 60
+    USER_CACHE_MAX_ENTRIES: int = 10_000
+    USER_CACHE_CHANNEL: str | None = None
+
+    # Serialized post details and tag reads, cached for
+    # RESPONSE_CACHE_TTL_SECONDS (up to RESPONSE_CACHE_TTL_JITTER of it
+    # less) and dropped when a service writes what they show. "redis" shares
+    # them, and invalidations, through the server at RESPONSE_CACHE_REDIS_URL.
+    # "memory" keeps them per worker, up to RESPONSE_CACHE_MAX_BYTES, so other
+    # workers serve their copy until it expires and a client can miss its own
+    # write: only use it with a single worker. "none", the default, disables it.
+    RESPONSE_CACHE_BACKEND: Literal["none", "memory", "redis"] = "none"
+    RESPONSE_CACHE_TTL_SECONDS: float = 30
+    RESPONSE_CACHE_TTL_JITTER: float = 0.1
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_MAX_ENTRY_BYTES: int = 1024 * 1024
+    RESPONSE_CACHE_LOCK_SECONDS: float = 2
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_REDIS_POOL_SIZE: int = 10
+    RESPONSE_CACHE_REDIS_TIMEOUT_SECONDS: float = 0.5
+
+    # Tags are served, and tag_ids checked, from a snapshot of the tag table
+    # kept per worker. It is reloaded right after a tag write in the worker
+    # that made it, and by the others once a check, every
+    # TAG_CATALOG_CHECK_INTERVAL_SECONDS, finds the table changed. 0 queries
+    # the table on every request instead.
+    TAG_CATALOG_CHECK_INTERVAL_SECONDS: float = 5
+
+    # Argon2 runs in a pool of PASSWORD_HASH_WORKERS threads (0 runs it on the
+    # event loop). Requests beyond PASSWORD_HASH_MAX_QUEUE waiting for a
+    # thread are turned away with a 503 instead of piling up.
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Directory where each worker drops a snapshot of its metrics, every
+    # METRICS_FLUSH_INTERVAL_SECONDS and on each scrape, so /metrics reports
+    # all workers. Leave unset when running a single worker.
+    METRICS_DIR: str | None = None
+    METRICS_FLUSH_INTERVAL_SECONDS: float = 5
+
+    # Log a possible N+1 when a request runs the same SQL statement this many
+    # times or more; 0 turns the check off.
+    QUERY_REPEAT_WARN_THRESHOLD: int = 5
+
+    # Statements slower than SLOW_QUERY_THRESHOLD_MS (0 disables) are written
+    # to logs/api/slow-queries-<pid>.jsonl, one file per worker, with redacted
+    # parameters; that share of them is also explained again to capture the
+    # plan.
+    SLOW_QUERY_THRESHOLD_MS: float = 200
+    SLOW_QUERY_EXPLAIN_RATE: float = 0.1
+    SLOW_QUERY_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUPS: int = 5
+
+    @model_validator(mode="after")
+    def _apply_environment_defaults(self) -> "Settings":
+        for name, value in ENVIRONMENT_DB_DEFAULTS[self.ENVIRONMENT].items():
+            if getattr(self, name) is None:
+                setattr(self, name, value)
+        return self
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def async_database_url(self) -> str:
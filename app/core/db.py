@@ -1,31 +1,179 @@
+import time
+
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.models.user_model import User
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.repositories.user_repository import user_repository
 
+from app.core.admission import admission_controller
 from app.core.config import settings
+from app.core.metrics import registry
+from app.core.query_stats import instrument
+from app.core.replicas import ReplicaSet
+from app.core.slow_queries import slow_query_recorder
 from app.schemas.user_schema import UserCreate
 
-engine: AsyncEngine = create_async_engine(
-    settings.async_database_url,
-    echo=True,  # Set to False in production
-    future=True,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_size=5,  # Number of connections to maintain
-    max_overflow=10,  # Max connections beyond pool_size
+POOL_CHECKOUT = registry.histogram(
+    "db_pool_checkout_seconds",
+    "Time to get a connection from the pool, including waiting for one.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+POOL_TIMEOUTS = registry.counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after waiting DB_POOL_TIMEOUT for a connection.",
 )
 
-async_session_maker = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that times every checkout and counts the ones that time out.
+
+    Samples are labelled with the pool's logging name, the database it
+    connects to; the primary's checkout times also feed admission control.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        database = self.logging_name or "primary"
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc(database=database)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            POOL_CHECKOUT.observe(elapsed, database=database)
+            if database == "primary":
+                admission_controller.observe_pool_wait(elapsed)
+
+
+def create_engine(url: str, name: str) -> AsyncEngine:
+    """An instrumented engine configured from the DB_* settings."""
+    new_engine = create_async_engine(
+        url,
+        pool_logging_name=name,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedPool,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        connect_args={
+            "timeout": settings.DB_CONNECT_TIMEOUT,
+            "command_timeout": settings.DB_COMMAND_TIMEOUT,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+    instrument(new_engine)
+    slow_query_recorder.install(new_engine)
+    return new_engine
+
+
+engine: AsyncEngine = create_engine(settings.async_database_url, "primary")
+replica_set = ReplicaSet(
+    [
+        create_engine(url, f"replica{index}")
+        for index, url in enumerate(settings.POSTGRES_REPLICA_URLS)
+    ],
+    check_interval=settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
 )
 
 
+def _collect_pool():
+    engines = {"primary": engine} | {
+        f"replica{i}": replica for i, replica in enumerate(replica_set.engines)
+    }
+    for database, db_engine in engines.items():
+        pool = db_engine.pool
+        labels = {"database": database}
+        yield (
+            "db_pool_size",
+            "gauge",
+            "Connections the pool keeps open.",
+            labels,
+            pool.size(),  # type: ignore[attr-defined]
+        )
+        yield (
+            "db_pool_max_connections",
+            "gauge",
+            "Most connections the pool may open, pool size plus overflow.",
+            labels,
+            pool.size() + settings.DB_MAX_OVERFLOW,  # type: ignore[attr-defined,operator]
+        )
+        yield (
+            "db_pool_checked_out",
+            "gauge",
+            "Connections in use.",
+            labels,
+            pool.checkedout(),  # type: ignore[attr-defined]
+        )
+        yield (
+            "db_pool_checked_in",
+            "gauge",
+            "Idle connections in the pool.",
+            labels,
+            pool.checkedin(),  # type: ignore[attr-defined]
+        )
+        # overflow() counts up from -pool_size, so it is positive only once
+        # connections beyond the pool size are open.
+        yield (
+            "db_pool_overflow",
+            "gauge",
+            "Connections open beyond the pool size.",
+            labels,
+            max(pool.overflow(), 0),  # type: ignore[attr-defined]
+        )
+
+
+registry.register_collector(_collect_pool)
+
+
+def _collect_replicas():
+    for index, healthy in enumerate(replica_set.healthy):
+        labels = {"database": f"replica{index}"}
+        yield (
+            "db_replica_healthy",
+            "gauge",
+            "Whether the replica passed its last health check.",
+            labels,
+            int(healthy),
+        )
+        lag = replica_set.lag[index]
+        if lag is not None:
+            yield (
+                "db_replica_lag_seconds",
+                "gauge",
+                "Replication lag seen by the last health check.",
+                labels,
+                lag,
+            )
+
+
+registry.register_collector(_collect_replicas)
+
+
+def create_session_maker(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+async_session_maker = create_session_maker(engine)
+replica_session_makers = [
+    create_session_maker(replica) for replica in replica_set.engines
+]
+
+
 async def init_db(session: AsyncSession) -> None:
     user = await session.exec(
         select(User).where(User.email == settings.FIRST_SUPERUSER)
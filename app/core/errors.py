@@ -0,0 +1,15 @@
+import asyncio
+
+import asyncpg  # type: ignore[import-untyped]
+from sqlalchemy.exc import SQLAlchemyError
+
+# What a database that is down, unreachable or misconfigured raises. While a
+# connection is being opened asyncpg's own errors come through unwrapped,
+# e.g. for an unknown database or a rejected password.
+DATABASE_ERRORS: tuple[type[BaseException], ...] = (
+    OSError,
+    asyncio.TimeoutError,
+    SQLAlchemyError,
+    asyncpg.PostgresError,
+    asyncpg.InterfaceError,
+)
@@ -24,12 +24,16 @@ local_log_config = {
     },
     "formatters": {
         "standard": {
-            "format": "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s",
+            "format": "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s%(db_stats)s",
         },
     },
+    "filters": {
+        "query_stats": {"()": "app.core.query_stats.QueryStatsFilter"},
+    },
     "handlers": {
         "console": {
             "formatter": "standard",
+            "filters": ["query_stats"],
             "class": "logging.StreamHandler",
             "stream": "ext://sys.stderr",
         },
@@ -50,12 +54,16 @@ log_config = {
     },
     "formatters": {
         "standard": {
-            "format": "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s",
+            "format": "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s%(db_stats)s",
         },
     },
+    "filters": {
+        "query_stats": {"()": "app.core.query_stats.QueryStatsFilter"},
+    },
     "handlers": {
         "console": {
             "formatter": "standard",
+            "filters": ["query_stats"],
             "class": "logging.StreamHandler",
             "stream": "ext://sys.stderr",
         },
@@ -63,6 +71,7 @@ log_config = {
             "level": settings.LOG_LEVEL,
             "class": "logging.handlers.TimedRotatingFileHandler",
             "formatter": "standard",
+            "filters": ["query_stats"],
             "filename": os.path.join(BASE_DIR, "logs/api/challenge-api.log"),
             "utc": 1,
             "when": "midnight",
@@ -72,6 +81,7 @@ log_config = {
             "level": logging.ERROR,
             "class": "logging.handlers.TimedRotatingFileHandler",
             "formatter": "standard",
+            "filters": ["query_stats"],
             "filename": os.path.join(BASE_DIR, "logs/api/error.log"),
             "utc": 1,
             "when": "midnight",
@@ -0,0 +1,274 @@
+import asyncio
+import json
+import math
+import os
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+from app.core.config import settings
+from app.core.logs import get_logger
+
+Labels = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _labels(values: dict[str, str]) -> Labels:
+    return tuple(sorted(values.items()))
+
+
+@dataclass
+class Metric:
+    """One metric family kept by this worker.
+
+    Everything runs on the worker's event loop, so plain dicts are updated
+    without locks; only the event loop thread may call the mutators.
+    """
+
+    name: str
+    help: str
+    kind: str
+    samples: dict[Labels, float] = field(default_factory=dict)
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = _labels(labels)
+        self.samples[key] = self.samples.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        self.samples[_labels(labels)] = value
+
+
+@dataclass
+class Histogram:
+    name: str
+    help: str
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    kind: str = "histogram"
+    # Per label set: one count per bucket (non-cumulative), sum, count.
+    samples: dict[Labels, list[float]] = field(default_factory=dict)
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _labels(labels)
+        sample = self.samples.get(key)
+        if sample is None:
+            sample = self.samples[key] = [0.0] * (len(self.buckets) + 3)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                sample[i] += 1
+                break
+        else:
+            sample[len(self.buckets)] += 1
+        sample[-2] += value
+        sample[-1] += 1
+
+
+Collector = Callable[[], Iterable[tuple[str, str, str, dict[str, str], float]]]
+
+
+class Registry:
+    """This worker's metrics, rendered in the Prometheus text format.
+
+    With ``directory`` set, every worker writes a snapshot of its metrics to
+    ``<directory>/<pid>.json`` and a scrape sums the snapshots of all live
+    workers, so any worker can answer for the whole server.
+    """
+
+    def __init__(self, directory: str | None = None, flush_interval: float = 5):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._metrics: dict[str, Metric | Histogram] = {}
+        self._collectors: list[Collector] = []
+        self._flusher: asyncio.Task | None = None
+
+    def counter(self, name: str, help: str) -> Metric:
+        return self._add(Metric(name, help, "counter"))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help: str) -> Metric:
+        return self._add(Metric(name, help, "gauge"))  # type: ignore[return-value]
+
+    def histogram(
+        self, name: str, help: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, help, buckets))  # type: ignore[return-value]
+
+    def _add(self, metric: Metric | Histogram) -> Metric | Histogram:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def register_collector(self, collector: Collector) -> None:
+        """Add values read at scrape time, as (name, kind, help, labels, value)."""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        families: dict[str, dict] = {}
+        for metric in self._metrics.values():
+            families[metric.name] = {
+                "kind": metric.kind,
+                "help": metric.help,
+                "buckets": list(getattr(metric, "buckets", ())),
+                "samples": [
+                    [dict(labels), value] for labels, value in metric.samples.items()
+                ],
+            }
+        for collector in self._collectors:
+            for name, kind, help, labels, value in collector():
+                family = families.setdefault(
+                    name, {"kind": kind, "help": help, "buckets": [], "samples": []}
+                )
+                family["samples"].append([labels, value])
+        return families
+
+    def render(self) -> str:
+        if not self.directory:
+            return _render(self.snapshot())
+        self._write_snapshot()
+        return _render(_merge(self._read_snapshots()))
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"{pid}.json")  # type: ignore[arg-type]
+
+    def _write_snapshot(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)  # type: ignore[arg-type]
+        path = self._path(os.getpid())
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(self.snapshot(), file)
+        os.replace(f"{path}.tmp", path)
+
+    def _read_snapshots(self) -> list[dict]:
+        snapshots = []
+        for entry in os.scandir(self.directory):
+            name, ext = os.path.splitext(entry.name)
+            if ext != ".json" or not name.isdigit():
+                continue
+            if not _alive(int(name)):
+                # Gone workers take their in-flight requests with them; their
+                # counters restart from zero, which Prometheus treats as a reset.
+                os.remove(entry.path)
+                continue
+            try:
+                with open(entry.path) as file:
+                    snapshots.append(json.load(file))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    async def start(self) -> None:
+        if self.directory and self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_forever())
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        if self.directory:
+            try:
+                os.remove(self._path(os.getpid()))
+            except FileNotFoundError:
+                pass
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                self._write_snapshot()
+            except OSError as exc:
+                get_logger().warning(f"Could not write metrics snapshot: {exc}")
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge(snapshots: list[dict]) -> dict:
+    merged: dict[str, dict] = {}
+    for snapshot in snapshots:
+        for name, family in snapshot.items():
+            target = merged.setdefault(name, {**family, "samples": {}})
+            for labels, value in family["samples"]:
+                key = json.dumps(labels, sort_keys=True)
+                if key not in target["samples"]:
+                    target["samples"][key] = value
+                elif isinstance(value, list):
+                    current = target["samples"][key]
+                    target["samples"][key] = [a + b for a, b in zip(current, value)]
+                else:
+                    target["samples"][key] += value
+    for family in merged.values():
+        family["samples"] = [
+            [json.loads(key), value] for key, value in family["samples"].items()
+        ]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str], **extra: str) -> str:
+    items = {**labels, **extra}
+    if not items:
+        return ""
+    pairs = (f'{key}="{_escape(str(value))}"' for key, value in sorted(items.items()))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _render(families: dict[str, dict]) -> str:
+    lines: list[str] = []
+    for name in sorted(families):
+        family = families[name]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['kind']}")
+        for labels, value in family["samples"]:
+            if family["kind"] != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            cumulative = 0.0
+            bounds = [*family["buckets"], math.inf]
+            for bound, count in zip(bounds, value):
+                cumulative += count
+                le = _format_value(bound)
+                lines.append(
+                    f"{name}_bucket{_format_labels(labels, le=le)} {_format_value(cumulative)}"
+                )
+            lines.append(
+                f"{name}_sum{_format_labels(labels)} {_format_value(value[-2])}"
+            )
+            lines.append(
+                f"{name}_count{_format_labels(labels)} {_format_value(value[-1])}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+registry = Registry(
+    directory=settings.METRICS_DIR,
+    flush_interval=settings.METRICS_FLUSH_INTERVAL_SECONDS,
+)
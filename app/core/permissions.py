@@ -2,7 +2,7 @@ from typing import Protocol
 from fastapi import HTTPException, status
 from uuid import UUID
 
-from app.models.user_model import User
+from app.schemas.auth import Principal
 
 
 class OwnableResource(Protocol):
@@ -11,31 +11,31 @@ class OwnableResource(Protocol):
 
 class PermissionChecker:
     @staticmethod
-    def is_owner(user: User, resource: OwnableResource) -> bool:
+    def is_owner(user: Principal, resource: OwnableResource) -> bool:
         return user.id == resource.author_id
 
     @staticmethod
-    def is_superuser(user: User) -> bool:
+    def is_superuser(user: Principal) -> bool:
         return user.is_superuser
 
     @staticmethod
-    def can_modify(user: User, resource: OwnableResource) -> bool:
+    def can_modify(user: Principal, resource: OwnableResource) -> bool:
         return PermissionChecker.is_superuser(user) or PermissionChecker.is_owner(
             user, resource
         )
 
     @staticmethod
-    def can_delete(user: User, resource: OwnableResource) -> bool:
+    def can_delete(user: Principal, resource: OwnableResource) -> bool:
         return PermissionChecker.is_superuser(user) or PermissionChecker.is_owner(
             user, resource
         )
 
     @staticmethod
-    def can_view_deleted(user: User) -> bool:
+    def can_view_deleted(user: Principal) -> bool:
         return PermissionChecker.is_superuser(user)
 
     @staticmethod
-    def require_owner_or_superuser(user: User, resource: OwnableResource) -> None:
+    def require_owner_or_superuser(user: Principal, resource: OwnableResource) -> None:
         if not PermissionChecker.can_modify(user, resource):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -43,7 +43,7 @@ class PermissionChecker:
             )
 
     @staticmethod
-    def require_superuser(user: User) -> None:
+    def require_superuser(user: Principal) -> None:
         if not PermissionChecker.is_superuser(user):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
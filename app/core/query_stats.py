@@ -0,0 +1,136 @@
+import logging
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass
+class QueryStats:
+    """Statements sent to the database while tracking one unit of work."""
+
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+    parent: "QueryStats | None" = field(default=None, repr=False)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements run at least ``threshold`` times, most repeated first."""
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count the statements run by the current task until the block exits.
+
+    Blocks nest: statements seen by an inner block count towards the
+    enclosing ones too, so a budget around a test client call still sees
+    the statements of the request it makes.
+    """
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(
+    max_queries: int, max_repeats: int | None = None
+) -> Iterator[QueryStats]:
+    """Fail when the block runs more than ``max_queries`` statements, or any
+    single statement more than ``max_repeats`` times.
+
+    Meant for tests and scripts pinning the cost of an endpoint::
+
+        with query_budget(2):
+            await client.get("/api/v1/posts/")
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{stats.count} queries run, budget is {max_queries}:\n"
+            + "\n".join(stats.statements)
+        )
+    if max_repeats is not None:
+        repeated = stats.repeated(max_repeats + 1)
+        if repeated:
+            statement, count = repeated[0]
+            raise QueryBudgetExceeded(
+                f"Statement run {count} times, budget is {max_repeats}:\n{statement}"
+            )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _record(conn, statement: str) -> None:
+    stats = _current.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start")
+    elapsed = time.perf_counter() - starts.pop() if starts else 0.0
+    while stats is not None:
+        stats.duration += elapsed
+        stats.count += 1
+        stats.statements[statement] += 1
+        stats = stats.parent
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record(conn, statement)
+
+
+def _handle_error(exception_context) -> None:
+    # Failed statements never reach after_cursor_execute; count them here so
+    # the start time does not linger on the connection.
+    if exception_context.statement is not None:
+        _record(exception_context.connection, exception_context.statement)
+
+
+def instrument(engine: AsyncEngine) -> None:
+    """Feed the statements ``engine`` runs into the current ``QueryStats``."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+class QueryStatsFilter(logging.Filter):
+    """Add ``db_stats`` to log records emitted while queries are tracked.
+
+    It renders as `` [db queries=3 time=4.2ms]`` inside a request and as an
+    empty string elsewhere, so formats can always include ``%(db_stats)s``.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        stats = _current.get()
+        record.db_stats = (
+            f" [db queries={stats.count} time={stats.duration * 1000:.1f}ms]"
+            if stats is not None
+            else ""
+        )
+        return True
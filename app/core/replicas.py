@@ -0,0 +1,125 @@
+import asyncio
+import itertools
+import time
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.errors import DATABASE_ERRORS
+from app.core.logs import get_logger
+from app.core.metrics import registry
+
+READS = registry.counter(
+    "db_reads_total", "Read-only sessions opened, by database they were routed to."
+)
+
+# Seconds since the replica replayed its last transaction; NULL on a server
+# that is not in recovery, so a plain second database passes as an
+# up-to-date replica. On a primary without writes this grows although the
+# replica is caught up, so REPLICA_MAX_LAG_SECONDS should allow for idle
+# periods.
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaSet:
+    """Read replicas handed out round-robin while their health check passes.
+
+    A replica is healthy when ``LAG_QUERY`` answers within ``check_interval``
+    and reports less than ``max_lag`` seconds of replication lag. Checks run
+    every ``check_interval`` seconds once ``start`` is called; until then
+    every replica counts as healthy.
+    """
+
+    def __init__(
+        self, engines: list[AsyncEngine], check_interval: float, max_lag: float
+    ):
+        self.engines = engines
+        self.check_interval = check_interval
+        self.max_lag = max_lag
+        self.healthy = [True] * len(engines)
+        self.lag: list[float | None] = [None] * len(engines)
+        self._next = itertools.count()
+        self._checker: asyncio.Task | None = None
+
+    def pick(self) -> int | None:
+        """Index of the next healthy replica, or None if there is none."""
+        for _ in range(len(self.engines)):
+            index = next(self._next) % len(self.engines)
+            if self.healthy[index]:
+                return index
+        return None
+
+    async def check(self) -> None:
+        await asyncio.gather(
+            *(self._check(index) for index in range(len(self.engines)))
+        )
+
+    async def _check(self, index: int) -> None:
+        try:
+            async with asyncio.timeout(self.check_interval):
+                async with self.engines[index].connect() as conn:
+                    lag = (await conn.execute(LAG_QUERY)).scalar()
+        except DATABASE_ERRORS as exc:
+            if self.healthy[index]:
+                get_logger().warning(f"Replica {index} unavailable: {exc!r}")
+            self.healthy[index] = False
+            self.lag[index] = None
+            return
+        self.lag[index] = None if lag is None else float(lag)
+        healthy = lag is None or lag <= self.max_lag
+        if healthy != self.healthy[index]:
+            state = "healthy" if healthy else f"{lag:.1f}s behind"
+            get_logger().warning(f"Replica {index} is {state}")
+        self.healthy[index] = healthy
+
+    async def start(self) -> None:
+        if self.engines and self._checker is None:
+            await self.check()
+            self._checker = asyncio.create_task(self._check_forever())
+
+    async def stop(self) -> None:
+        if self._checker is not None:
+            self._checker.cancel()
+            self._checker = None
+        for engine in self.engines:
+            await engine.dispose()
+
+    async def _check_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.check()
+            except Exception:
+                # Keep checking: a dead checker would leave every replica's
+                # health frozen at its last value.
+                logger = get_logger()
+                logger.exception("Replica health check failed")
+
+
+class RecentWriters:
+    """Users who wrote in the last ``window`` seconds, kept per worker.
+
+    Their reads go to the primary so they see their own writes even while
+    replicas lag behind. The ``primary_until`` cookie set alongside covers
+    requests landing on other workers.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._until: dict[UUID, float] = {}
+
+    def mark(self, user_id: UUID) -> None:
+        now = time.monotonic()
+        if len(self._until) > 1000:
+            self._until = {
+                key: until for key, until in self._until.items() if until > now
+            }
+        self._until[user_id] = now + self.window
+
+    def __contains__(self, user_id: UUID) -> bool:
+        until = self._until.get(user_id)
+        return until is not None and until > time.monotonic()
@@ -1,11 +1,22 @@
+import asyncio
 import re
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from typing import TypeVar
+
 import jwt
+from fastapi import HTTPException, status
 from pwdlib import PasswordHash
 from app.core.config import settings
+from app.core.metrics import registry
 
 password_hash = PasswordHash.recommended()
 
+T = TypeVar("T")
+
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
@@ -28,6 +39,124 @@ def get_password_hash(password: str) -> str:
     return password_hash.hash(password)
 
 
+@dataclass
+class PasswordHasherStats:
+    completed: int = 0
+    rejected: int = 0
+    running: int = 0
+    queued: int = 0
+    max_queued: int = 0
+    wait_seconds: float = 0.0
+
+
+class PasswordHasher:
+    """Argon2 off the event loop, in a bounded thread pool.
+
+    Argon2 releases the GIL while hashing, so threads are enough to keep the
+    loop serving other requests. At most ``max_workers`` hashes run at once;
+    callers wait their turn on a semaphore, and once ``max_queue`` are
+    already waiting new ones get a 503 rather than a growing backlog.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.stats = PasswordHasherStats()
+        self._executor = (
+            ThreadPoolExecutor(max_workers, thread_name_prefix="password-hash")
+            if max_workers > 0
+            else None
+        )
+        self._slots = asyncio.Semaphore(max(max_workers, 1))
+
+    async def hash(self, password: str) -> str:
+        return await self._run(password_hash.hash, password)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """Check ``password``; also return a new hash when the stored one was
+        made with other parameters than the current ones."""
+        return await self._run(
+            password_hash.verify_and_update, password, hashed_password
+        )
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self._executor is None:
+            self.stats.completed += 1
+            return func(*args)
+        if self._slots.locked() and self.stats.queued >= self.max_queue:
+            self.stats.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many password checks in progress, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        self.stats.queued += 1
+        self.stats.max_queued = max(self.stats.max_queued, self.stats.queued)
+        start = time.perf_counter()
+        try:
+            await self._slots.acquire()
+        finally:
+            self.stats.queued -= 1
+        self.stats.wait_seconds += time.perf_counter() - start
+        self.stats.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.stats.running -= 1
+            self.stats.completed += 1
+            self._slots.release()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+def _collect():
+    stats = password_hasher.stats
+    yield (
+        "password_hash_completed_total",
+        "counter",
+        "Password hashes and checks completed.",
+        {},
+        stats.completed,
+    )
+    yield (
+        "password_hash_rejected_total",
+        "counter",
+        "Password hashes and checks turned away with a full queue.",
+        {},
+        stats.rejected,
+    )
+    yield (
+        "password_hash_wait_seconds_total",
+        "counter",
+        "Time spent waiting for a hashing thread.",
+        {},
+        stats.wait_seconds,
+    )
+    yield ("password_hash_running", "gauge", "Hashes running.", {}, stats.running)
+    yield ("password_hash_queued", "gauge", "Hashes waiting.", {}, stats.queued)
+    yield (
+        "password_hash_queued_max",
+        "gauge",
+        "Most hashes seen waiting at once.",
+        {},
+        stats.max_queued,
+    )
+
+
+registry.register_collector(_collect)
+
+
 def validate_password_strength(password: str) -> str:
     if len(password) < 8:
         raise ValueError("Password must be at least 8 characters")
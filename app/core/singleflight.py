@@ -0,0 +1,129 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import asdict, dataclass
+from typing import Any, TypeVar
+
+from app.core.metrics import registry
+
+T = TypeVar("T")
+
+# Key of the flag set in a session's ``info`` when its lookups may be shared:
+# it only reads, and its client has no write that a lookup started before
+# it could miss.
+COALESCE_READS = "coalesce_reads"
+
+
+@dataclass
+class SingleFlightStats:
+    # Calls that ran the lookup, calls that waited for another one's, and
+    # waiting calls that ended up running it because the one they waited for
+    # was cancelled. Each call counts at most once in each.
+    leaders: int = 0
+    coalesced: int = 0
+    takeovers: int = 0
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.result: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.followers = 0
+
+
+class SingleFlight:
+    """Share one in-flight call among concurrent callers asking for the same
+    key.
+
+    The first caller, the leader, runs the call in its own task, so it uses
+    the leader's database session and is cancelled with the leader's
+    request. The others wait for its result or exception. A caller cancelled
+    while waiting leaves without disturbing the call; if the leader is
+    cancelled instead, one of the waiters runs the call again for the rest.
+    Nothing is kept once the call returns.
+    """
+
+    def __init__(self) -> None:
+        self.stats: dict[str, SingleFlightStats] = {}
+        self._flights: dict[tuple[str, Hashable], _Flight] = {}
+
+    def _stats(self, namespace: str) -> SingleFlightStats:
+        stats = self.stats.get(namespace)
+        if stats is None:
+            stats = self.stats[namespace] = SingleFlightStats()
+        return stats
+
+    def in_flight(self, namespace: str) -> int:
+        return sum(1 for name, _ in self._flights if name == namespace)
+
+    async def do(
+        self, namespace: str, key: Hashable, call: Callable[[], Awaitable[T]]
+    ) -> T:
+        """The result of ``call``, shared with concurrent callers of the same
+        ``namespace`` and ``key``; ``namespace`` also labels the metrics."""
+        stats = self._stats(namespace)
+        flight_key = (namespace, key)
+        waited = False
+        while True:
+            flight = self._flights.get(flight_key)
+            if flight is None:
+                break
+            if not waited:
+                stats.coalesced += 1
+                waited = True
+            flight.followers += 1
+            try:
+                return await asyncio.shield(flight.result)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if not flight.result.cancelled() or (current and current.cancelling()):
+                    raise
+            # The leader went away; the first waiter to get here leads, the
+            # others wait for it.
+
+        if waited:
+            stats.takeovers += 1
+        stats.leaders += 1
+        flight = self._flights[flight_key] = _Flight()
+        try:
+            result: Any = await call()
+        except asyncio.CancelledError:
+            flight.result.cancel()
+            raise
+        except BaseException as exc:
+            # Only hand the exception over when someone waits for it, or
+            # asyncio logs it as never retrieved.
+            if flight.followers:
+                flight.result.set_exception(exc)
+            else:
+                flight.result.cancel()
+            raise
+        else:
+            flight.result.set_result(result)
+            return result
+        finally:
+            del self._flights[flight_key]
+
+
+single_flight = SingleFlight()
+
+
+def _collect():
+    for namespace, stats in single_flight.stats.items():
+        labels = {"namespace": namespace}
+        for name, value in asdict(stats).items():
+            yield (
+                f"singleflight_{name}_total",
+                "counter",
+                f"Single-flight {name}, by lookup.",
+                labels,
+                value,
+            )
+        yield (
+            "singleflight_in_flight",
+            "gauge",
+            "Shared lookups running, by lookup.",
+            labels,
+            single_flight.in_flight(namespace),
+        )
+
+
+registry.register_collector(_collect)
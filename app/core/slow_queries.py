@@ -0,0 +1,286 @@
+import asyncio
+import contextvars
+import glob
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+from collections.abc import Iterator
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from logging.handlers import RotatingFileHandler
+from types import FrameType
+from typing import Any
+from uuid import UUID
+
+import greenlet  # type: ignore[import-untyped]
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.logs import BASE_DIR, get_logger
+
+# Each worker writes its own file, named after this one with its pid
+# appended: a rotating file handler is not safe across processes.
+LOG_PATH = os.path.join(BASE_DIR, "logs/api/slow-queries.jsonl")
+REPOSITORIES_DIR = os.path.join(BASE_DIR, "repositories") + os.sep
+
+# Execution option that keeps a statement out of the recorder, e.g. the
+# EXPLAIN it runs itself.
+SKIP_OPTION = "skip_slow_query_log"
+
+_PARAMETER_LIST = re.compile(r"\$\d+(?:::[\w ]+)?(?:, \$\d+(?:::[\w ]+)?)+")
+_SELECT = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+_QUOTED = re.compile(r"'(?:[^']|'')*'")
+
+
+def redact(value: Any) -> Any:
+    """Keep the shape of a bound parameter but none of its text.
+
+    Ids, numbers, flags and timestamps say a lot about a plan and little
+    about a person; strings and bytes may hold emails or password hashes.
+    """
+    if value is None or isinstance(value, bool | int | float | Decimal | UUID):
+        return value if not isinstance(value, Decimal | UUID) else str(value)
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, list | tuple):
+        return [redact(item) for item in value]
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, str | bytes):
+        return f"<{type(value).__name__} len={len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_plan(plan: Any) -> Any:
+    """Blank quoted literals in a JSON plan; conditions embed the parameters."""
+    if isinstance(plan, str):
+        return _QUOTED.sub("'?'", plan)
+    if isinstance(plan, list):
+        return [redact_plan(item) for item in plan]
+    if isinstance(plan, dict):
+        return {key: redact_plan(item) for key, item in plan.items()}
+    return plan
+
+
+def fingerprint(statement: str) -> str:
+    """Statement text with whitespace and expanded IN lists collapsed."""
+    return _PARAMETER_LIST.sub("$n, ...", " ".join(statement.split()))
+
+
+def _repository_caller() -> str | None:
+    """The outermost repository method on the stack, as ``Class.method``.
+
+    Under the async engine the repository coroutine runs in the parent of
+    the greenlet executing the statement, so its stack is walked as well.
+    """
+    frames = [sys._getframe(1)]
+    parent = greenlet.getcurrent().parent
+    if parent is not None and parent.gr_frame is not None:
+        frames.append(parent.gr_frame)
+    caller = None
+    for start in frames:
+        frame: FrameType | None = start
+        while frame is not None:
+            if frame.f_code.co_filename.startswith(REPOSITORIES_DIR):
+                caller = frame
+            frame = frame.f_back
+    if caller is None:
+        return None
+    owner = caller.f_locals.get("self")
+    if owner is None:
+        return caller.f_code.co_qualname
+    return f"{type(owner).__name__}.{caller.f_code.co_name}"
+
+
+def _read_records(path: str) -> Iterator[dict]:
+    try:
+        with open(path) as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        # Rotated away since it was listed.
+        return
+
+
+class SlowQueryRecorder:
+    """Write statements slower than ``threshold_ms`` to a rotating JSONL file
+    per worker, ``path`` with the worker's pid appended.
+
+    A ``explain_rate`` share of them is explained again on another
+    connection, inside a transaction that is rolled back: SELECTs with
+    ``EXPLAIN (ANALYZE, BUFFERS)``, writes with a plain ``EXPLAIN`` so they
+    are not run twice. One EXPLAIN runs at a time per worker; slow queries
+    arriving meanwhile are logged without a plan.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        explain_rate: float,
+        path: str = LOG_PATH,
+        max_bytes: int = 10 * 1024 * 1024,
+        backups: int = 5,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain_rate = explain_rate
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._engines: dict[Engine, AsyncEngine] = {}
+        self._logger = logging.getLogger("slow_queries")
+        self._explain_task: asyncio.Task | None = None
+
+    def install(self, engine: AsyncEngine) -> None:
+        if self.threshold_ms <= 0 or engine.sync_engine in self._engines:
+            return
+        if not self._engines:
+            handler = RotatingFileHandler(
+                self._worker_path(os.getpid()),
+                maxBytes=self.max_bytes,
+                backupCount=self.backups,
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._logger.addHandler(handler)
+            self._logger.setLevel(logging.INFO)
+            self._logger.propagate = False
+        self._engines[engine.sync_engine] = engine
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after)
+        event.listen(engine.sync_engine, "handle_error", self._handle_error)
+
+    def _worker_path(self, pid: int) -> str:
+        root, ext = os.path.splitext(self.path)
+        return f"{root}-{pid}{ext}"
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    def _handle_error(self, exception_context) -> None:
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("slow_query_start"):
+            connection.info["slow_query_start"].pop()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("slow_query_start")
+        if not starts:
+            return
+        duration_ms = (time.perf_counter() - starts.pop()) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        if context is not None and context.execution_options.get(SKIP_OPTION):
+            return
+        record = {
+            "ts": datetime.now(UTC).isoformat(),
+            "duration_ms": round(duration_ms, 3),
+            "repository": _repository_caller(),
+            "statement": statement,
+            "parameters": redact(parameters),
+            "plan": None,
+        }
+        if (
+            not executemany
+            and self._explain_task is None
+            and random.random() < self.explain_rate
+        ):
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                # A fresh context keeps the EXPLAIN out of the request's stats.
+                self._explain_task = loop.create_task(
+                    self._explain_and_write(
+                        self._engines[conn.engine], record, statement, parameters
+                    ),
+                    context=contextvars.Context(),
+                )
+                return
+        self._write(record)
+
+    async def _explain_and_write(
+        self, engine: AsyncEngine, record: dict, statement: str, parameters: Any
+    ) -> None:
+        try:
+            record["plan"] = await self._explain(engine, statement, parameters)
+        except (SQLAlchemyError, OSError, ValueError, TimeoutError) as exc:
+            record["plan_error"] = str(exc)
+        finally:
+            self._explain_task = None
+        self._write(record)
+
+    async def _explain(
+        self, engine: AsyncEngine, statement: str, parameters: Any
+    ) -> Any:
+        options = (
+            "ANALYZE, BUFFERS, FORMAT JSON"
+            if _SELECT.match(statement)
+            else "FORMAT JSON"
+        )
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            try:
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN ({options}) {statement}",
+                    parameters,
+                    execution_options={SKIP_OPTION: True},
+                )
+                plan = result.scalar()
+            finally:
+                await transaction.rollback()
+        return redact_plan(json.loads(plan) if isinstance(plan, str) else plan)
+
+    def _write(self, record: dict) -> None:
+        try:
+            self._logger.info(json.dumps(record, default=str))
+        except (TypeError, ValueError) as exc:
+            get_logger().warning(f"Could not record slow query: {exc}")
+
+    def top(self, limit: int) -> list[dict]:
+        """Statements with the most total time across the current and rotated
+        files of every worker, past ones included."""
+        root, ext = os.path.splitext(self.path)
+        stats: dict[str, dict] = {}
+        for path in sorted(glob.glob(f"{glob.escape(root)}-*{ext}*")):
+            for record in _read_records(path):
+                key = fingerprint(record["statement"])
+                entry = stats.setdefault(
+                    key,
+                    {
+                        "statement": key,
+                        "repository": record.get("repository"),
+                        "count": 0,
+                        "total_ms": 0.0,
+                        "max_ms": 0.0,
+                        "last_seen": record["ts"],
+                        "plan": None,
+                    },
+                )
+                entry["count"] += 1
+                entry["total_ms"] += record["duration_ms"]
+                entry["max_ms"] = max(entry["max_ms"], record["duration_ms"])
+                if record["ts"] >= entry["last_seen"]:
+                    entry["last_seen"] = record["ts"]
+                    entry["repository"] = record.get("repository")
+                if record.get("plan") is not None:
+                    entry["plan"] = record["plan"]
+        ranked = sorted(stats.values(), key=lambda entry: -entry["total_ms"])
+        for entry in ranked:
+            entry["mean_ms"] = entry["total_ms"] / entry["count"]
+        return ranked[:limit]
+
+
+slow_query_recorder = SlowQueryRecorder(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    explain_rate=settings.SLOW_QUERY_EXPLAIN_RATE,
+    max_bytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+    backups=settings.SLOW_QUERY_LOG_BACKUPS,
+)
@@ -0,0 +1,91 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.errors import DATABASE_ERRORS
+from app.core.logs import get_logger
+from app.repositories.comment_repository import comment_repository
+from app.repositories.post_repository import post_repository
+from app.repositories.tag_repository import tag_repository
+from app.repositories.user_repository import user_repository
+
+# The statements behind the busiest endpoints. Run against ids that do not
+# exist and one-row pages, they return next to nothing but get compiled into
+# the engine's query cache and prepared on the connection they run on; the
+# SQL, and so the prepared statement, does not depend on the values bound.
+PRIMERS: list[Callable[[AsyncSession], Awaitable[object]]] = [
+    lambda session: user_repository.get_principal(session, uuid4()),
+    lambda session: user_repository.get(session, uuid4()),
+    lambda session: post_repository.get(session, uuid4()),
+    lambda session: post_repository.get_page(session, limit=1),
+    lambda session: comment_repository.get_page_by_post(session, uuid4(), limit=1),
+    lambda session: tag_repository.get_page(session, limit=1),
+]
+
+
+class Readiness:
+    """Whether this worker has warmed up and should receive traffic.
+
+    Set once the lifespan startup is done, cleared when shutdown begins.
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+
+
+readiness = Readiness()
+
+
+async def wait_for_database(
+    engine: AsyncEngine, timeout: float, interval: float = 1
+) -> None:
+    """Return once ``engine`` answers a ``SELECT 1``, or raise the last error
+    after ``timeout`` seconds."""
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            return
+        except DATABASE_ERRORS as exc:
+            if time.monotonic() + interval > deadline:
+                raise
+            get_logger().warning(
+                f"Database not ready (attempt {attempt}): {exc!r}, retrying"
+            )
+            await asyncio.sleep(interval)
+
+
+async def _prime(conn: AsyncConnection) -> None:
+    async with AsyncSession(bind=conn) as session:
+        for primer in PRIMERS:
+            await primer(session)
+        await session.rollback()
+
+
+async def warm_up(engine: AsyncEngine, connections: int) -> None:
+    """Open ``connections`` pool connections at once and prime each of them.
+
+    Connecting pays for the TCP and auth handshake and for asyncpg's type
+    introspection; priming prepares the hot statements. Closing the
+    connections returns them to the pool, ready for the first requests.
+    """
+    opened = await asyncio.gather(
+        *(engine.connect() for _ in range(connections)), return_exceptions=True
+    )
+    conns = [conn for conn in opened if isinstance(conn, AsyncConnection)]
+    try:
+        for error in opened:
+            if isinstance(error, BaseException):
+                raise error
+        await asyncio.gather(*(_prime(conn) for conn in conns))
+    finally:
+        for conn in conns:
+            await conn.close()
@@ -1,13 +1,24 @@
 import logging.config
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
+from app.api.responses import FastJSONResponse
+from app.api.routes import health, metrics
+from app.core.cache import response_cache
 from app.core.config import settings
+from app.core.db import engine, replica_set
 from app.core.logs import local_log_config, log_config
+from app.core.metrics import registry
+from app.core.security import password_hasher
+from app.core.warmup import readiness, wait_for_database, warm_up
+from app.middlewares.query_stats import QueryStatsMiddleware
 from app.middlewares.timing import TimingMiddleware
+from app.repositories.principal_cache import principal_cache
+from app.repositories.tag_catalog import tag_catalog
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -19,10 +30,42 @@ if settings.ENVIRONMENT == "local":
 else:
     logging.config.dictConfig(log_config)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await wait_for_database(engine, timeout=settings.DB_READY_TIMEOUT_SECONDS)
+    warmup_connections = (
+        settings.DB_WARMUP_CONNECTIONS
+        if settings.DB_WARMUP_CONNECTIONS is not None
+        else settings.DB_POOL_SIZE
+    )
+    if warmup_connections:
+        await warm_up(engine, warmup_connections)
+    await principal_cache.listen(engine)
+    await tag_catalog.start(engine)
+    await registry.start()
+    await replica_set.start()
+    for index, replica in enumerate(replica_set.engines):
+        if warmup_connections and replica_set.healthy[index]:
+            await warm_up(replica, warmup_connections)
+    readiness.ready = True
+    yield
+    readiness.ready = False
+    await replica_set.stop()
+    await registry.stop()
+    await principal_cache.close()
+    await tag_catalog.stop()
+    await response_cache.close()
+    password_hasher.close()
+    await engine.dispose()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -34,6 +77,9 @@ if settings.all_cors_origins:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+app.add_middleware(QueryStatsMiddleware)
 app.add_middleware(TimingMiddleware)
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
+app.include_router(metrics.router)
+app.include_router(health.router)
@@ -0,0 +1,73 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logs import get_logger
+from app.core.metrics import registry
+from app.core.query_stats import QueryStats, track_queries
+from app.middlewares.timing import UNMATCHED
+
+QUERY_COUNT = registry.histogram(
+    "db_queries_per_request",
+    "Statements sent to the database per request, by route.",
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+QUERY_TIME = registry.histogram(
+    "db_query_seconds_per_request",
+    "Time spent in database statements per request, by route.",
+)
+REPEATED = registry.counter(
+    "db_repeated_statements_total",
+    "Requests that ran one statement at least QUERY_REPEAT_WARN_THRESHOLD times.",
+)
+
+
+class QueryStatsMiddleware:
+    """Count the SQL statements of each request.
+
+    The totals so far are sent as ``X-DB-Query-Count`` and ``X-DB-Time``
+    response headers; a streaming body may run more statements after the
+    headers are out, and those only reach the metrics. Requests that run the
+    same statement ``QUERY_REPEAT_WARN_THRESHOLD`` times or more are logged
+    as a likely N+1.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(stats.count)
+                    headers["X-DB-Time"] = f"{stats.duration:.6f}"
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", UNMATCHED)
+                self._record(scope["method"], route, stats)
+
+    @staticmethod
+    def _record(method: str, route: str, stats: QueryStats) -> None:
+        QUERY_COUNT.observe(stats.count, method=method, route=route)
+        QUERY_TIME.observe(stats.duration, method=method, route=route)
+        threshold = settings.QUERY_REPEAT_WARN_THRESHOLD
+        if not threshold:
+            return
+        repeated = stats.repeated(threshold)
+        if not repeated:
+            return
+        REPEATED.inc(method=method, route=route)
+        statement, count = repeated[0]
+        get_logger().warning(
+            f"Possible N+1 in {method} {route}: statement run {count} times: "
+            f"{' '.join(statement.split())[:300]}"
+        )
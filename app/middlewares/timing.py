@@ -1,19 +1,61 @@
 import time
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import Request
-from app.core.logs import get_logger
-
-
-class TimingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        logger = get_logger()
-        start = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start
-        logger.info(
-            f"[TIMING] {request.method} {request.url.path} "
-            f"- Status: {response.status_code} "
-            f"- Time: {process_time:.3f}s"
-        )
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import registry
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Time to send the full response, by route."
+)
+REQUESTS = registry.counter(
+    "http_requests_total", "Responses sent, by route and status code."
+)
+IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "Requests being handled, by method."
+)
+
+# Label for requests no route matched, so unknown paths cannot blow up the
+# number of series.
+UNMATCHED = "<unmatched>"
+
+
+class TimingMiddleware:
+    """Record latency, status and concurrency of every HTTP request.
+
+    Routes are labelled with their path template (``/api/v1/posts/{post_id}``),
+    read from the scope once the router has matched the request. The route is
+    not known before that, so the in-flight gauge is per method only.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = str(time.perf_counter() - start)
+            await send(message)
+
+        IN_FLIGHT.inc(method=method)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec(method=method)
+            route = scope.get("route")
+            path = getattr(route, "path", UNMATCHED)
+            REQUEST_DURATION.observe(
+                time.perf_counter() - start, method=method, route=path
+            )
+            REQUESTS.inc(method=method, route=path, status=str(status_code))
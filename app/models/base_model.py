@@ -43,5 +43,22 @@ class SoftDeleteMixin(SQLModel):
         self.deleted_at = None
 
 
+def live_index(table: str, *columns: str) -> sa.Index:
+    """Partial index over rows that are not soft-deleted.
+
+    Default queries filter on ``is_deleted = false`` and page by
+    ``(created_at, id)``, so these indexes match them exactly.
+    """
+    return sa.Index(
+        f"ix_{table}_{'_'.join(columns)}_live",
+        *columns,
+        postgresql_where=sa.text("NOT is_deleted"),
+    )
+
+
 class BaseModel(TimestampMixin, SoftDeleteMixin, SQLModel):
+    # Fetch server-generated values (updated_at on UPDATE) through RETURNING
+    # in the same statement, so written objects need no reload.
+    __mapper_args__ = {"eager_defaults": True}
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
@@ -2,17 +2,19 @@ from uuid import UUID
 
 from sqlmodel import Field, Relationship
 
-from app.models.base_model import BaseModel
+from app.models.base_model import BaseModel, live_index
 from app.schemas.comment_schema import CommentBase
 
 
 class Comment(BaseModel, CommentBase, table=True):
-    post_id: UUID = Field(foreign_key="post.id", nullable=False, ondelete="CASCADE")
-    author_id: UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    __table_args__ = (live_index("comment", "post_id", "created_at", "id"),)
 
-    post: "Post" = Relationship(  # type: ignore # noqa: F821
-        back_populates="comments", sa_relationship_kwargs={"lazy": "selectin"}
+    post_id: UUID = Field(
+        foreign_key="post.id", nullable=False, ondelete="CASCADE", index=True
     )
-    author: "User" = Relationship(  # type: ignore # noqa: F821
-        back_populates="comments", sa_relationship_kwargs={"lazy": "selectin"}
+    author_id: UUID = Field(
+        foreign_key="user.id", nullable=False, ondelete="CASCADE", index=True
     )
+
+    post: "Post" = Relationship(back_populates="comments")  # type: ignore # noqa: F821
+    author: "User" = Relationship(back_populates="comments")  # type: ignore # noqa: F821
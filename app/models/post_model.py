@@ -2,21 +2,22 @@ from uuid import UUID
 
 from sqlmodel import Field, Relationship
 
-from app.models.base_model import BaseModel
+from app.models.base_model import BaseModel, live_index
 from app.models.tag_model import PostTagLink
 from app.schemas.post_schema import PostBase
 
 
 class Post(BaseModel, PostBase, table=True):
-    author_id: UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
-    author: "User" = Relationship(  # type: ignore # noqa: F821
-        back_populates="posts", sa_relationship_kwargs={"lazy": "selectin"}
+    __table_args__ = (
+        live_index("post", "created_at", "id"),
+        live_index("post", "author_id", "created_at", "id"),
     )
-    comments: list["Comment"] = Relationship(  # type: ignore # noqa: F821
-        back_populates="post", sa_relationship_kwargs={"lazy": "selectin"}
+
+    author_id: UUID = Field(
+        foreign_key="user.id", nullable=False, ondelete="CASCADE", index=True
     )
+    author: "User" = Relationship(back_populates="posts")  # type: ignore # noqa: F821
+    comments: list["Comment"] = Relationship(back_populates="post")  # type: ignore # noqa: F821
     tags: list["Tag"] = Relationship(  # type: ignore # noqa: F821
-        back_populates="posts",
-        link_model=PostTagLink,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        back_populates="posts", link_model=PostTagLink
     )
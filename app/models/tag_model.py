@@ -8,12 +8,12 @@ from app.schemas.tag_schema import TagBase
 
 class PostTagLink(SQLModel, table=True):
     post_id: UUID = Field(foreign_key="post.id", primary_key=True, ondelete="CASCADE")
-    tag_id: UUID = Field(foreign_key="tag.id", primary_key=True, ondelete="CASCADE")
+    tag_id: UUID = Field(
+        foreign_key="tag.id", primary_key=True, ondelete="CASCADE", index=True
+    )
 
 
 class Tag(BaseModel, TagBase, table=True):
     posts: list["Post"] = Relationship(  # type: ignore # noqa: F821
-        back_populates="tags",
-        link_model=PostTagLink,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        back_populates="tags", link_model=PostTagLink
     )
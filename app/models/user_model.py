@@ -1,11 +1,13 @@
 from sqlmodel import Relationship
 
-from app.models.base_model import BaseModel
+from app.models.base_model import BaseModel, live_index
 from app.schemas.user_schema import UserBase
 
 
 # Database model, database table inferred from class name
 class User(BaseModel, UserBase, table=True):
+    __table_args__ = (live_index("user", "created_at", "id"),)
+
     hashed_password: str
     posts: list["Post"] = Relationship(back_populates="author", cascade_delete=True)  # type: ignore # noqa: F821
     comments: list["Comment"] = Relationship(  # type: ignore # noqa: F821
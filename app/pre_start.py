@@ -1,32 +1,17 @@
 import asyncio
 import logging
 
-from sqlmodel import select
-from tenacity import after_log, before_log, retry, stop_after_attempt, wait_fixed
-
-from app.core.db import async_session_maker
+from app.core.config import settings
+from app.core.db import engine
+from app.core.warmup import wait_for_database
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-max_tries = 60 * 2  # 2 minutes
-wait_seconds = 1
-
 
-@retry(
-    stop=stop_after_attempt(max_tries),
-    wait=wait_fixed(wait_seconds),
-    before=before_log(logger, logging.INFO),
-    after=after_log(logger, logging.WARN),
-)
 async def init() -> None:
-    try:
-        async with async_session_maker() as session:
-            # Try to create session to check if DB is awake
-            await session.exec(select(1))
-    except Exception as e:
-        logger.error(e)
-        raise e
+    await wait_for_database(engine, timeout=settings.DB_READY_TIMEOUT_SECONDS)
+    await engine.dispose()
 
 
 def main() -> None:
@@ -1,40 +1,296 @@
+from collections.abc import AsyncIterator, Collection, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from uuid import UUID
-from typing import Any, Generic, TypeVar
+from typing import Any, ClassVar, Generic, TypeVar
 
-from sqlmodel import select, func
+from sqlalchemy import ColumnElement, delete, insert, literal, tuple_, update
+from sqlalchemy.orm import raiseload
+from sqlalchemy.sql.base import ExecutableOption
+from sqlmodel import col, func, not_, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel.sql._expression_select_cls import Select, SelectOfScalar
 
+from app.core.config import settings
 from app.models.base_model import BaseModel
+from app.repositories.cascade import (
+    CascadeRule,
+    restore_dependents,
+    soft_delete_dependents,
+)
+from app.repositories.count_strategy import (
+    CountStrategy,
+    count_strategies,
+    invalidate_counts,
+)
+from app.schemas.common import Cursor
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
 CreateSchemaType = TypeVar("CreateSchemaType")
 UpdateSchemaType = TypeVar("UpdateSchemaType")
+StatementType = TypeVar("StatementType", Select, SelectOfScalar)
+ItemType = TypeVar("ItemType")
+
+# The (id, updated_at) of a row, enough to tell whether a page changed.
+RowVersion = tuple[UUID, datetime]
+
+
+@dataclass
+class Page(Generic[ItemType]):
+    """A page of rows in display order.
+
+    ``has_more`` tells whether rows exist beyond the page in the direction of
+    travel; ``total`` is ``None`` when counting was skipped and
+    ``total_exact`` is false when it came from an estimate or a cache.
+    """
+
+    items: list[ItemType]
+    has_more: bool
+    total: int | None = None
+    total_exact: bool = True
 
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
-    def __init__(self, model: type[ModelType]):
+    # Loader options applied per query shape. Relationships are lazy by
+    # default, so each profile must eager-load what its response schema reads;
+    # "list" raises on any lazy load to keep list endpoints at a fixed number
+    # of queries.
+    loader_profiles: ClassVar[dict[str, tuple[ExecutableOption, ...]]] = {
+        "list": (raiseload("*"),),
+        "detail": (),
+    }
+    # Dependent rows soft-deleted and restored along with a row of this model.
+    cascade: ClassVar[tuple[CascadeRule, ...]] = ()
+
+    def __init__(
+        self,
+        model: type[ModelType],
+        count_strategy: CountStrategy | None = None,
+    ):
         self.model = model
+        self.count_strategy = (
+            count_strategy or count_strategies[settings.COUNT_STRATEGY]
+        )
+
+    @property
+    def table_name(self) -> str:
+        return self.model.__tablename__  # type: ignore[return-value]
+
+    def _invalidate_counts(self) -> None:
+        invalidate_counts(self.table_name)
+
+    def _with_profile(
+        self,
+        statement: StatementType,
+        profile: str,
+    ) -> StatementType:
+        return statement.options(*self.loader_profiles[profile])
+
+    def _version_columns(self) -> tuple[Any, ...]:
+        """Columns a detail response depends on, for ``get_version``.
+
+        ``version_of`` must return the same values from a row loaded with the
+        ``detail`` profile, so both give the same ETag.
+        """
+        return (self.model.id, self.model.updated_at)
+
+    def version_of(self, obj: ModelType) -> tuple[Any, ...]:
+        return (obj.id, obj.updated_at)
 
     def _get_query_with_filter(
         self,
-        statement: Select | SelectOfScalar,
+        statement: StatementType,
         include_deleted: bool = False,
         only_deleted: bool = False,
-    ) -> Select | SelectOfScalar:
+    ) -> StatementType:
         if only_deleted:
             return statement.where(self.model.is_deleted == True)  # noqa: E712
         if not include_deleted:
             return statement.where(self.model.is_deleted == False)  # noqa: E712
         return statement
 
+    def _apply_order(
+        self,
+        statement: StatementType,
+        backwards: bool = False,
+    ) -> StatementType:
+        if backwards:
+            return statement.order_by(
+                self.model.created_at.asc(),  # type: ignore[attr-defined]
+                self.model.id.asc(),  # type: ignore[attr-defined]
+            )
+        return statement.order_by(
+            self.model.created_at.desc(),  # type: ignore[attr-defined]
+            self.model.id.desc(),  # type: ignore[attr-defined]
+        )
+
+    def _paginate(
+        self,
+        statement: StatementType,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Cursor | None = None,
+    ) -> StatementType:
+        """Apply ordering and either OFFSET paging or a keyset seek predicate.
+
+        With a cursor the page starts right after the cursor row, so the
+        database walks the ``(created_at, id)`` index instead of skipping rows.
+        """
+        if cursor is None:
+            return self._apply_order(statement).offset(skip).limit(limit)
+
+        position = tuple_(col(self.model.created_at), col(self.model.id))
+        boundary = tuple_(literal(cursor.created_at), literal(cursor.id))
+        if cursor.backwards:
+            statement = statement.where(position > boundary)
+        else:
+            statement = statement.where(position < boundary)
+        return self._apply_order(statement, backwards=cursor.backwards).limit(limit)
+
+    async def _fetch_rows(
+        self,
+        session: AsyncSession,
+        columns: tuple[Any, ...],
+        criteria: tuple[ColumnElement[bool], ...],
+        skip: int,
+        limit: int,
+        include_deleted: bool,
+        only_deleted: bool,
+        cursor: Cursor | None,
+        include_total: bool,
+        profile: str | None,
+    ) -> Page[tuple[Any, ...]]:
+        """Fetch a page of ``columns`` rows and, optionally, its total in a
+        single statement.
+
+        With an inline count strategy the total is an uncorrelated scalar
+        subquery, which Postgres evaluates once per statement; other
+        strategies count separately. One row past ``limit`` is fetched to fill
+        ``has_more`` without counting.
+        """
+        count_statement = self._get_query_with_filter(
+            select(func.count()).select_from(self.model).where(*criteria),
+            include_deleted=include_deleted,
+            only_deleted=only_deleted,
+        )
+        inline_total = include_total and self.count_strategy.inline
+        selected = columns
+        if inline_total:
+            total_column = count_statement.scalar_subquery().correlate(None)
+            selected = (*columns, total_column)
+        statement = self._get_query_with_filter(
+            select(*selected).where(*criteria),
+            include_deleted=include_deleted,
+            only_deleted=only_deleted,
+        )
+        if profile is not None:
+            statement = self._with_profile(statement, profile)
+        statement = self._paginate(statement, skip=skip, limit=limit + 1, cursor=cursor)
+
+        result = await session.exec(statement)
+        rows = list(result.all())
+        total = None
+        total_exact = True
+        if inline_total:
+            if rows:
+                total = rows[0][-1]
+            elif skip == 0 and cursor is None:
+                total = 0
+            else:
+                # Past the end: no row carried the count.
+                total = (await session.exec(count_statement)).one()
+            items = [tuple(row[:-1]) for row in rows]
+        else:
+            # A single column comes back as scalars.
+            items = [tuple(row) if len(columns) > 1 else (row,) for row in rows]
+            if include_total:
+                counted = await self.count_strategy.count(
+                    session, self.table_name, count_statement
+                )
+                total, total_exact = counted.value, counted.exact
+
+        has_more = len(items) > limit
+        if has_more:
+            items = items[:limit]
+        if cursor is not None and cursor.backwards:
+            items.reverse()
+        return Page(
+            items=items, has_more=has_more, total=total, total_exact=total_exact
+        )
+
+    async def _fetch_page(
+        self,
+        session: AsyncSession,
+        criteria: tuple[ColumnElement[bool], ...] = (),
+        skip: int = 0,
+        limit: int = 100,
+        include_deleted: bool = False,
+        only_deleted: bool = False,
+        cursor: Cursor | None = None,
+        include_total: bool = True,
+        profile: str = "list",
+    ) -> Page[ModelType]:
+        """A page of models matching ``criteria``, loaded with ``profile``."""
+        page = await self._fetch_rows(
+            session,
+            (self.model,),
+            criteria,
+            skip=skip,
+            limit=limit,
+            include_deleted=include_deleted,
+            only_deleted=only_deleted,
+            cursor=cursor,
+            include_total=include_total,
+            profile=profile,
+        )
+        return Page(
+            items=[row[0] for row in page.items],
+            has_more=page.has_more,
+            total=page.total,
+            total_exact=page.total_exact,
+        )
+
+    async def _fetch_page_versions(
+        self,
+        session: AsyncSession,
+        criteria: tuple[ColumnElement[bool], ...] = (),
+        skip: int = 0,
+        limit: int = 100,
+        include_deleted: bool = False,
+        only_deleted: bool = False,
+        cursor: Cursor | None = None,
+        include_total: bool = True,
+    ) -> Page[RowVersion]:
+        """The ``RowVersion`` of each row ``_fetch_page`` would return, with
+        the same ``has_more`` and total, without loading the models."""
+        page = await self._fetch_rows(
+            session,
+            (self.model.id, self.model.updated_at),
+            criteria,
+            skip=skip,
+            limit=limit,
+            include_deleted=include_deleted,
+            only_deleted=only_deleted,
+            cursor=cursor,
+            include_total=include_total,
+            profile=None,
+        )
+        return Page(
+            items=[(row[0], row[1]) for row in page.items],
+            has_more=page.has_more,
+            total=page.total,
+            total_exact=page.total_exact,
+        )
+
     async def get(
         self,
         session: AsyncSession,
         entity_id: UUID,
         include_deleted: bool = False,
+        profile: str = "detail",
     ) -> ModelType | None:
         statement = select(self.model).where(self.model.id == entity_id)
+        statement = self._with_profile(statement, profile)
         filtered_statement = self._get_query_with_filter(
             statement, include_deleted=include_deleted
         )
@@ -42,21 +298,85 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await session.exec(filtered_statement)
         return result.first()
 
-    async def get_list(
+    async def get_version(
+        self,
+        session: AsyncSession,
+        entity_id: UUID,
+        include_deleted: bool = False,
+    ) -> tuple[Any, ...] | None:
+        """What ``get`` would return, reduced to ``version_of`` its result,
+        without loading the row or its relations."""
+        statement = select(*self._version_columns()).where(self.model.id == entity_id)
+        filtered_statement = self._get_query_with_filter(
+            statement, include_deleted=include_deleted
+        )
+        row = (await session.exec(filtered_statement)).first()
+        return None if row is None else tuple(row)
+
+    async def get_page(
         self,
         session: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         include_deleted: bool = False,
         only_deleted: bool = False,
-    ) -> list[ModelType]:
-        statement = select(self.model)
-        filtered_statement = self._get_query_with_filter(
+        cursor: Cursor | None = None,
+        include_total: bool = True,
+        profile: str = "list",
+    ) -> Page[ModelType]:
+        return await self._fetch_page(
+            session,
+            skip=skip,
+            limit=limit,
+            include_deleted=include_deleted,
+            only_deleted=only_deleted,
+            cursor=cursor,
+            include_total=include_total,
+            profile=profile,
+        )
+
+    async def get_page_versions(
+        self,
+        session: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        include_deleted: bool = False,
+        only_deleted: bool = False,
+        cursor: Cursor | None = None,
+        include_total: bool = True,
+    ) -> Page[RowVersion]:
+        """What ``get_page`` would return, reduced to each row's version."""
+        return await self._fetch_page_versions(
+            session,
+            skip=skip,
+            limit=limit,
+            include_deleted=include_deleted,
+            only_deleted=only_deleted,
+            cursor=cursor,
+            include_total=include_total,
+        )
+
+    async def stream(
+        self,
+        session: AsyncSession,
+        include_deleted: bool = False,
+        only_deleted: bool = False,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[ModelType]:
+        """Yield every matching row in list order through a server-side cursor.
+
+        Rows are fetched ``batch_size`` at a time and only as fast as the
+        caller consumes them. The session keeps no strong reference to
+        yielded rows, so memory stays flat however many rows are streamed.
+        """
+        statement = self._with_profile(select(self.model), "list")
+        statement = self._get_query_with_filter(
             statement, include_deleted=include_deleted, only_deleted=only_deleted
         )
-        filtered_statement = filtered_statement.offset(skip).limit(limit)
-        result = await session.exec(filtered_statement)
-        return list(result.all())
+        statement = self._apply_order(statement).execution_options(yield_per=batch_size)
+        result = await session.stream_scalars(statement)
+        async for item in result:
+            yield item
 
     async def count(
         self,
@@ -68,8 +388,10 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         filtered_statement = self._get_query_with_filter(
             statement, include_deleted=include_deleted, only_deleted=only_deleted
         )
-        result = await session.exec(filtered_statement)
-        return result.one()
+        counted = await self.count_strategy.count(
+            session, self.table_name, filtered_statement
+        )
+        return counted.value
 
     async def create(
         self,
@@ -79,9 +401,56 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj = self.model.model_validate(obj_in)
         session.add(db_obj)
         await session.commit()
-        await session.refresh(db_obj)
+        self._invalidate_counts()
         return db_obj
 
+    async def _insert_many(
+        self,
+        session: AsyncSession,
+        db_objs: Sequence[ModelType],
+    ) -> list[ModelType]:
+        """Insert rows with multi-row ``INSERT ... RETURNING``, uncommitted.
+
+        Rows are sent ``BULK_INSERT_BATCH_SIZE`` at a time to stay well under
+        the bind parameter limit of a single statement.
+        """
+        created: list[ModelType] = []
+        batch_size = settings.BULK_INSERT_BATCH_SIZE
+        for start in range(0, len(db_objs), batch_size):
+            rows = [
+                db_obj.model_dump() for db_obj in db_objs[start : start + batch_size]
+            ]
+            statement = insert(self.model).values(rows).returning(self.model)
+            result = await session.exec(statement)
+            created.extend(result.scalars().all())
+        return created
+
+    async def bulk_create(
+        self,
+        session: AsyncSession,
+        objs_in: Sequence[CreateSchemaType],
+    ) -> list[ModelType]:
+        db_objs = [self.model.model_validate(obj_in) for obj_in in objs_in]
+        created = await self._insert_many(session, db_objs)
+        await session.commit()
+        self._invalidate_counts()
+        return created
+
+    async def get_live_ids(
+        self,
+        session: AsyncSession,
+        ids: Collection[UUID],
+    ) -> set[UUID]:
+        """The subset of ``ids`` that belong to rows that are not deleted."""
+        if not ids:
+            return set()
+        statement = select(self.model.id).where(
+            self.model.id.in_(ids),  # type: ignore[attr-defined]
+            not_(self.model.is_deleted),
+        )
+        result = await session.exec(statement)
+        return set(result.all())
+
     async def update(
         self,
         session: AsyncSession,
@@ -95,7 +464,6 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj.sqlmodel_update(update_data)
         session.add(db_obj)
         await session.commit()
-        await session.refresh(db_obj)
         return db_obj
 
     async def soft_delete(
@@ -103,30 +471,73 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         session: AsyncSession,
         entity_id: UUID,
     ) -> bool:
-        db_obj = await self.get(session, entity_id=entity_id)
-        if not db_obj:
-            return False
+        """Mark a live row as deleted; false when no live row matched.
 
-        db_obj.soft_delete()
-        session.add(db_obj)
+        Dependents listed in ``cascade`` are then deleted in batches, and
+        share the row's ``deleted_at`` so a restore can tell them apart from
+        rows deleted on their own. The row is committed along with the first
+        batch, so a cascade cut short leaves it deleted with the marker its
+        deleted dependents carry, and restoring it undoes the lot.
+        """
+        marker = datetime.now(UTC)
+        statement = (
+            update(self.model)
+            .where(col(self.model.id) == entity_id, not_(self.model.is_deleted))
+            .values(is_deleted=True, deleted_at=marker)
+            .returning(col(self.model.id))
+        )
+        result = await session.exec(statement)
+        deleted = result.first() is not None
+        if deleted and self.cascade:
+            await soft_delete_dependents(
+                session,
+                self.cascade,
+                parent_id=entity_id,
+                marker=marker,
+                batch_size=settings.CASCADE_BATCH_SIZE,
+            )
         await session.commit()
-        return True
+        if deleted:
+            self._invalidate_counts()
+        return deleted
 
     async def restore(
         self,
         session: AsyncSession,
         entity_id: UUID,
     ) -> ModelType | None:
-        db_obj = await self.get(session, entity_id=entity_id, include_deleted=True)
-        if not db_obj:
-            return None
-        if not db_obj.is_deleted:
-            return db_obj
+        """Un-delete a row and return it; a live row is returned unchanged.
 
-        db_obj.restore()
-        session.add(db_obj)
+        Dependents that were deleted by the same cascade are restored first;
+        the row keeps its marker until they all are, so a restore cut short
+        can simply be run again.
+        """
+        if self.cascade:
+            deleted_at = select(self.model.deleted_at).where(
+                self.model.id == entity_id, self.model.is_deleted
+            )
+            marker = (await session.exec(deleted_at)).first()
+            if marker is not None:
+                await restore_dependents(
+                    session,
+                    self.cascade,
+                    parent_id=entity_id,
+                    marker=marker,
+                    batch_size=settings.CASCADE_BATCH_SIZE,
+                )
+
+        statement = (
+            update(self.model)
+            .where(col(self.model.id) == entity_id, col(self.model.is_deleted))
+            .values(is_deleted=False, deleted_at=None)
+            .returning(self.model)
+        )
+        result = await session.exec(statement)
+        db_obj = result.scalars().first()
         await session.commit()
-        await session.refresh(db_obj)
+        if db_obj is None:
+            return await self.get(session, entity_id=entity_id)
+        self._invalidate_counts()
         return db_obj
 
     async def remove(
@@ -134,10 +545,18 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         session: AsyncSession,
         entity_id: UUID,
     ) -> bool:
-        db_obj = await self.get(session, entity_id=entity_id, include_deleted=True)
-        if not db_obj:
-            return False
+        """Hard-delete a row, deleted or not; false when it did not exist.
 
-        await session.delete(db_obj)
+        Dependent rows go through the ``ON DELETE CASCADE`` foreign keys.
+        """
+        statement = (
+            delete(self.model)
+            .where(col(self.model.id) == entity_id)
+            .returning(col(self.model.id))
+        )
+        result = await session.exec(statement)
+        removed = result.first() is not None
         await session.commit()
-        return True
+        if removed:
+            self._invalidate_counts()
+        return removed
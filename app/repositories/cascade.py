@@ -0,0 +1,151 @@
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, update
+from sqlmodel import not_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.base_model import BaseModel
+from app.repositories.count_strategy import invalidate_counts
+
+
+@dataclass(frozen=True)
+class CascadeRule:
+    """Rows of ``model`` whose ``foreign_key`` points at the parent row.
+
+    ``children`` cascade further from the rows of ``model``, e.g. a user's
+    posts carry on to the comments on those posts.
+    """
+
+    model: type[BaseModel]
+    foreign_key: Any
+    children: tuple["CascadeRule", ...] = ()
+
+
+State = Callable[[type[BaseModel]], ColumnElement[bool]]
+
+
+def _walk(
+    rules: tuple[CascadeRule, ...], path: tuple[CascadeRule, ...] = ()
+) -> Iterator[tuple[CascadeRule, ...]]:
+    """Yield the path to every rule, deepest rules first."""
+    for rule in rules:
+        yield from _walk(rule.children, path + (rule,))
+        yield path + (rule,)
+
+
+def _scope(
+    path: tuple[CascadeRule, ...], parent_id: UUID, state: State
+) -> ColumnElement[bool]:
+    """Rows of ``path[-1]`` that hang off the root through ``path``.
+
+    Intermediate levels are only followed through rows in ``state``: live
+    rows while deleting, live rows or rows carrying the marker while
+    restoring.
+    """
+    rule = path[-1]
+    if len(path) == 1:
+        return rule.foreign_key == parent_id
+    parent = path[-2].model
+    parent_ids = select(parent.id).where(
+        _scope(path[:-1], parent_id, state), state(parent)
+    )
+    return rule.foreign_key.in_(parent_ids)
+
+
+async def _update_in_batches(
+    session: AsyncSession,
+    model: type[BaseModel],
+    criteria: ColumnElement[bool],
+    values: dict[str, Any],
+    batch_size: int,
+) -> int:
+    """Update matching rows ``batch_size`` at a time, committing each batch.
+
+    Each batch stops matching ``criteria`` once updated, so the next one
+    picks up where it left off and row locks are held for one batch only.
+    """
+    total = 0
+    while True:
+        batch = select(model.id).where(criteria).limit(batch_size)
+        statement = (
+            update(model)
+            .where(model.id.in_(batch))  # type: ignore[attr-defined]
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.exec(statement)
+        await session.commit()
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
+
+
+async def soft_delete_dependents(
+    session: AsyncSession,
+    rules: tuple[CascadeRule, ...],
+    parent_id: UUID,
+    marker: datetime,
+    batch_size: int,
+) -> int:
+    """Soft-delete live rows under ``parent_id``, stamping them with ``marker``.
+
+    Rows are processed deepest first, so intermediate levels are still live
+    while their own dependents are being selected. The caller deletes the
+    parent row first, with the same marker, in the transaction the first
+    batch commits: if the cascade fails partway, restoring the parent puts
+    back the rows already deleted.
+    """
+
+    def live(model: type[BaseModel]) -> ColumnElement[bool]:
+        return not_(model.is_deleted)
+
+    total = 0
+    for path in _walk(rules):
+        model = path[-1].model
+        total += await _update_in_batches(
+            session,
+            model,
+            _scope(path, parent_id, live) & live(model),
+            {"is_deleted": True, "deleted_at": marker},
+            batch_size,
+        )
+        invalidate_counts(model.__tablename__)  # type: ignore[arg-type]
+    return total
+
+
+async def restore_dependents(
+    session: AsyncSession,
+    rules: tuple[CascadeRule, ...],
+    parent_id: UUID,
+    marker: datetime,
+    batch_size: int,
+) -> int:
+    """Restore rows under ``parent_id`` that were deleted with ``marker``.
+
+    Rows deleted on their own, before or after the cascade, carry another
+    ``deleted_at`` and stay deleted. Live intermediate rows are followed too,
+    for a cascade that failed before reaching them.
+    """
+
+    def marked(model: type[BaseModel]) -> ColumnElement[bool]:
+        return model.deleted_at == marker  # type: ignore[return-value]
+
+    def reachable(model: type[BaseModel]) -> ColumnElement[bool]:
+        return not_(model.is_deleted) | marked(model)
+
+    total = 0
+    for path in _walk(rules):
+        model = path[-1].model
+        total += await _update_in_batches(
+            session,
+            model,
+            _scope(path, parent_id, reachable) & marked(model),
+            {"is_deleted": False, "deleted_at": None},
+            batch_size,
+        )
+        invalidate_counts(model.__tablename__)  # type: ignore[arg-type]
+    return total
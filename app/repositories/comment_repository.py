@@ -1,12 +1,17 @@
+from collections.abc import Sequence
 from uuid import UUID
 
-from sqlalchemy import func
+from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
 
 from app.models import Comment
-from app.repositories.base_repository import BaseRepository
-from app.schemas.comment_schema import CommentCreate, CommentUpdate
+from app.repositories.base_repository import BaseRepository, Page, RowVersion
+from app.schemas.comment_schema import (
+    CommentBulkCreate,
+    CommentCreate,
+    CommentUpdate,
+)
+from app.schemas.common import Cursor
 
 
 class CommentRepository(BaseRepository[Comment, CommentCreate, CommentUpdate]):
@@ -25,10 +30,26 @@ class CommentRepository(BaseRepository[Comment, CommentCreate, CommentUpdate]):
         )
         session.add(db_obj)
         await session.commit()
-        await session.refresh(db_obj)
+        self._invalidate_counts()
         return db_obj
 
-    async def get_by_post(
+    async def bulk_create_comments(
+        self,
+        session: AsyncSession,
+        objs_in: Sequence[CommentBulkCreate],
+        author_id: UUID,
+    ) -> list[Comment]:
+        """Insert comments in one transaction; posts must already be checked."""
+        db_objs = [
+            Comment.model_validate(obj_in, update={"author_id": author_id})
+            for obj_in in objs_in
+        ]
+        created = await self._insert_many(session, db_objs)
+        await session.commit()
+        self._invalidate_counts()
+        return created
+
+    async def get_page_by_post(
         self,
         session: AsyncSession,
         post_id: UUID,
@@ -36,30 +57,54 @@ class CommentRepository(BaseRepository[Comment, CommentCreate, CommentUpdate]):
         limit: int = 100,
         include_deleted: bool = False,
         only_deleted: bool = False,
-    ) -> list[Comment]:
-        statement = select(Comment).where(Comment.post_id == post_id)
-        filtered_statement = self._get_query_with_filter(
-            statement, include_deleted=include_deleted, only_deleted=only_deleted
+        cursor: Cursor | None = None,
+        include_total: bool = True,
+        profile: str = "list",
+    ) -> Page[Comment]:
+        return await self._fetch_page(
+            session,
+            criteria=(col(Comment.post_id) == post_id,),
+            skip=skip,
+            limit=limit,
+            include_deleted=include_deleted,
+            only_deleted=only_deleted,
+            cursor=cursor,
+            include_total=include_total,
+            profile=profile,
         )
-        filtered_statement = filtered_statement.offset(skip).limit(limit)
-        result = await session.exec(filtered_statement)
-        return list(result.all())
 
-    async def count_by_post(
+    async def get_page_versions_by_post(
         self,
         session: AsyncSession,
         post_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
         include_deleted: bool = False,
         only_deleted: bool = False,
-    ) -> int:
-        statement = (
-            select(func.count()).select_from(Comment).where(Comment.post_id == post_id)
+        cursor: Cursor | None = None,
+        include_total: bool = True,
+    ) -> Page[RowVersion]:
+        return await self._fetch_page_versions(
+            session,
+            criteria=(col(Comment.post_id) == post_id,),
+            skip=skip,
+            limit=limit,
+            include_deleted=include_deleted,
+            only_deleted=only_deleted,
+            cursor=cursor,
+            include_total=include_total,
         )
-        filtered_statement = self._get_query_with_filter(
-            statement, include_deleted=include_deleted, only_deleted=only_deleted
+
+    async def get_commented_post_ids(
+        self, session: AsyncSession, author_id: UUID
+    ) -> set[UUID]:
+        """Posts ``author_id`` has commented on, deleted comments included."""
+        statement = (
+            select(Comment.post_id)
+            .where(col(Comment.author_id) == author_id)
+            .distinct()
         )
-        result = await session.exec(filtered_statement)
-        return result.one()
+        return set((await session.exec(statement)).all())
 
 
 comment_repository = CommentRepository()
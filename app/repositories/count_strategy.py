@@ -0,0 +1,147 @@
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Select, literal_column, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql._expression_select_cls import SelectOfScalar
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class CountResult:
+    value: int
+    exact: bool
+
+
+async def _exact_count(session: AsyncSession, statement: SelectOfScalar) -> int:
+    result = await session.exec(statement)
+    return result.one()
+
+
+class CountStrategy:
+    """How repositories compute ``total_items`` for list pages.
+
+    ``inline`` strategies are exact and cheap enough to embed in the page
+    query; the others are called separately with the count statement.
+    """
+
+    inline = False
+
+    async def count(
+        self, session: AsyncSession, table: str, statement: SelectOfScalar
+    ) -> CountResult:
+        raise NotImplementedError
+
+    def invalidate(self, table: str) -> None:
+        """Forget anything known about ``table`` after a write to it."""
+
+
+class ExactCount(CountStrategy):
+    inline = True
+
+    async def count(
+        self, session: AsyncSession, table: str, statement: SelectOfScalar
+    ) -> CountResult:
+        return CountResult(await _exact_count(session, statement), exact=True)
+
+
+class EstimatedCount(CountStrategy):
+    """Planner row estimates, falling back to an exact count for small sets.
+
+    Unfiltered counts read ``pg_class.reltuples``; filtered ones take the row
+    estimate from ``EXPLAIN``. Estimates are only as fresh as the last
+    ANALYZE/autovacuum of the table.
+    """
+
+    def __init__(self, exact_below: int):
+        self.exact_below = exact_below
+
+    async def count(
+        self, session: AsyncSession, table: str, statement: SelectOfScalar
+    ) -> CountResult:
+        estimate = await self._estimate(session, table, statement)
+        if estimate is None or estimate < self.exact_below:
+            return CountResult(await _exact_count(session, statement), exact=True)
+        return CountResult(estimate, exact=False)
+
+    async def _estimate(
+        self, session: AsyncSession, table: str, statement: SelectOfScalar
+    ) -> int | None:
+        if statement.whereclause is None:
+            reltuples = await session.scalar(
+                text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"),
+                {"table": table},
+            )
+            # reltuples is -1 until the table is first analyzed.
+            if reltuples is None or reltuples < 0:
+                return None
+            return int(reltuples)
+
+        rows: Select[Any] = statement.with_only_columns(literal_column("1"))
+        compiled = rows.compile(
+            dialect=session.get_bind().dialect,
+            compile_kwargs={"literal_binds": True},
+        )
+        plan = await session.scalar(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CachedCount(CountStrategy):
+    """Exact counts kept per worker for ``ttl`` seconds.
+
+    Writes through the repositories invalidate the table's entries in this
+    worker only, so other workers may serve a stale total for up to ``ttl``.
+    Cache hits are therefore reported as inexact.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, int]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+
+    async def count(
+        self, session: AsyncSession, table: str, statement: SelectOfScalar
+    ) -> CountResult:
+        compiled = statement.compile()
+        key = (table, str(compiled), tuple(sorted(compiled.params.items())))
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            return CountResult(entry[1], exact=False)
+
+        generation = self._generations.get(table, 0)
+        value = await _exact_count(session, statement)
+        # A write that landed while counting makes this value unsafe to keep.
+        if self._generations.get(table, 0) == generation:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return CountResult(value, exact=True)
+
+    def invalidate(self, table: str) -> None:
+        self._generations[table] = self._generations.get(table, 0) + 1
+        for key in [key for key in self._entries if key[0] == table]:
+            del self._entries[key]
+
+
+count_strategies: dict[str, CountStrategy] = {
+    "exact": ExactCount(),
+    "estimated": EstimatedCount(exact_below=settings.COUNT_ESTIMATE_EXACT_BELOW),
+    "cached": CachedCount(
+        ttl=settings.COUNT_CACHE_TTL_SECONDS,
+        max_entries=settings.COUNT_CACHE_MAX_ENTRIES,
+    ),
+}
+
+
+def invalidate_counts(table: str) -> None:
+    for strategy in count_strategies.values():
+        strategy.invalidate(table)
@@ -1,26 +1,86 @@
-from typing import Any
+from collections.abc import Collection, Sequence
+from typing import Any, ClassVar
 from uuid import UUID
 
-from sqlalchemy import func
-from sqlmodel import select, not_
+from sqlalchemy import func, insert
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from sqlalchemy.sql.base import ExecutableOption
+from sqlmodel import col, select, not_
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models import Post, Tag
-from app.repositories.base_repository import BaseRepository
+from app.core.config import settings
+from app.models import Comment, Post, Tag, User
+from app.models.tag_model import PostTagLink
+from app.repositories.base_repository import BaseRepository, Page
+from app.repositories.cascade import CascadeRule
+from app.repositories.tag_catalog import tag_catalog
+from app.schemas.common import Cursor
 from app.schemas.post_schema import PostCreate, PostUpdate
 
 
 class PostRepository(BaseRepository[Post, PostCreate, PostUpdate]):
+    loader_profiles: ClassVar[dict[str, tuple[ExecutableOption, ...]]] = {
+        "list": (raiseload("*"),),
+        "list_with_author": (
+            joinedload(Post.author),  # type: ignore[arg-type]
+            raiseload("*"),
+        ),
+        "detail": (
+            joinedload(Post.author),  # type: ignore[arg-type]
+            selectinload(Post.tags),  # type: ignore[arg-type]
+            selectinload(Post.comments.and_(not_(Comment.is_deleted))),  # type: ignore[attr-defined]
+        ),
+    }
+    cascade = (CascadeRule(Comment, Comment.post_id),)
+
     def __init__(self):
         super().__init__(Post)
 
+    def _version_columns(self) -> tuple[Any, ...]:
+        # Replacing a post's tags writes only the link table, and deleting a
+        # comment may leave the newest one in place, so the tag ids and the
+        # comment count are part of the version too.
+        live_comments = (Comment.post_id == Post.id, not_(Comment.is_deleted))
+        return (
+            Post.id,
+            Post.updated_at,
+            select(User.updated_at).where(User.id == Post.author_id).scalar_subquery(),
+            select(
+                func.array_agg(
+                    aggregate_order_by(col(PostTagLink.tag_id), col(PostTagLink.tag_id))
+                )
+            )
+            .where(PostTagLink.post_id == Post.id)
+            .scalar_subquery(),
+            select(func.max(Tag.updated_at))
+            .join(PostTagLink, col(PostTagLink.tag_id) == Tag.id)
+            .where(PostTagLink.post_id == Post.id)
+            .scalar_subquery(),
+            select(func.count()).where(*live_comments).scalar_subquery(),
+            select(func.max(Comment.updated_at))
+            .where(*live_comments)
+            .scalar_subquery(),
+        )
+
+    def version_of(self, obj: Post) -> tuple[Any, ...]:
+        return (
+            obj.id,
+            obj.updated_at,
+            obj.author.updated_at,
+            sorted(tag.id for tag in obj.tags) or None,
+            max((tag.updated_at for tag in obj.tags), default=None),
+            len(obj.comments),
+            max((comment.updated_at for comment in obj.comments), default=None),
+        )
+
     async def get_by_title(self, session: AsyncSession, title: str) -> Post | None:
         statement = select(self.model).where(self.model.title == title)
         filtered_statement = self._get_query_with_filter(statement)
         result = await session.exec(filtered_statement)
         return result.first()
 
-    async def get_by_author(
+    async def get_page_by_author(
         self,
         session: AsyncSession,
         author_id: UUID,
@@ -28,62 +88,110 @@ class PostRepository(BaseRepository[Post, PostCreate, PostUpdate]):
         limit: int = 100,
         include_deleted: bool = False,
         only_deleted: bool = False,
-    ) -> list[Post]:
-        statement = select(Post).where(Post.author_id == author_id)
-        filtered_statement = self._get_query_with_filter(
-            statement, include_deleted=include_deleted, only_deleted=only_deleted
+        cursor: Cursor | None = None,
+        include_total: bool = True,
+        profile: str = "list",
+    ) -> Page[Post]:
+        return await self._fetch_page(
+            session,
+            criteria=(col(Post.author_id) == author_id,),
+            skip=skip,
+            limit=limit,
+            include_deleted=include_deleted,
+            only_deleted=only_deleted,
+            cursor=cursor,
+            include_total=include_total,
+            profile=profile,
         )
-        filtered_statement = filtered_statement.offset(skip).limit(limit)
-        result = await session.exec(filtered_statement)
-        return list(result.all())
 
-    async def count_by_author(
-        self,
-        session: AsyncSession,
-        author_id: UUID,
-        include_deleted: bool = False,
-        only_deleted: bool = False,
-    ) -> int:
+    async def _live_tags(
+        self, session: AsyncSession, tag_ids: Collection[UUID]
+    ) -> list[Tag]:
+        """The tags among ``tag_ids`` that are not deleted, attached to
+        ``session``.
+
+        With the tag catalog loaded no query is run: copies of its tags are
+        merged into the session, as the catalog's own are shared by the
+        worker and must stay detached.
+        """
+        if not tag_ids:
+            return []
+        snapshot = tag_catalog.snapshot
+        if snapshot is not None:
+            return [
+                await session.merge(tag, load=False)
+                for tag in snapshot.live(dict.fromkeys(tag_ids))
+            ]
         statement = (
-            select(func.count())
-            .select_from(self.model)
-            .where(Post.author_id == author_id)
-        )
-        filtered_statement = self._get_query_with_filter(
-            statement, include_deleted=include_deleted, only_deleted=only_deleted
+            select(Tag).where(Tag.id.in_(tag_ids)).where(not_(Tag.is_deleted))  # type: ignore[attr-defined]
         )
-        result = await session.exec(filtered_statement)
-        return result.one()
+        result = await session.exec(statement)
+        return list(result.all())
 
     async def create_with_tags(
         self,
         session: AsyncSession,
         obj_in: PostCreate,
-        author_id: UUID,
+        author: User,
     ) -> Post:
-        db_obj = Post.model_validate(obj_in, update={"author_id": author_id})
+        """Insert a post with its tags.
 
-        if obj_in.tag_ids:
-            statement = (
-                select(Tag)
-                .where(Tag.id.in_(obj_in.tag_ids))  # type: ignore[attr-defined]
-                .where(not_(Tag.is_deleted))
-            )
-            result = await session.exec(statement)
-            tags = list(result.all())
-            db_obj.tags = tags
+        The relationships the response reads are filled from objects already
+        in hand (the author, the validated tags, no comments yet), so nothing
+        is reloaded after the commit.
+        """
+        db_obj = Post.model_validate(obj_in, update={"author_id": author.id})
+
+        db_obj.author = author
+        db_obj.tags = await self._live_tags(session, obj_in.tag_ids)
+        db_obj.comments = []
 
         session.add(db_obj)
         await session.commit()
-        await session.refresh(db_obj)
+        self._invalidate_counts()
         return db_obj
 
+    async def bulk_create_with_tags(
+        self,
+        session: AsyncSession,
+        objs_in: Sequence[PostCreate],
+        author_id: UUID,
+    ) -> list[Post]:
+        """Insert posts and their tag links in one transaction.
+
+        ``tag_ids`` must already be checked against live tags.
+        """
+        db_objs = [
+            Post.model_validate(obj_in, update={"author_id": author_id})
+            for obj_in in objs_in
+        ]
+        created = await self._insert_many(session, db_objs)
+
+        links = [
+            {"post_id": db_obj.id, "tag_id": tag_id}
+            for db_obj, obj_in in zip(db_objs, objs_in)
+            for tag_id in dict.fromkeys(obj_in.tag_ids)
+        ]
+        batch_size = settings.BULK_INSERT_BATCH_SIZE
+        for start in range(0, len(links), batch_size):
+            statement = insert(PostTagLink).values(links[start : start + batch_size])
+            await session.exec(statement)
+
+        await session.commit()
+        self._invalidate_counts()
+        return created
+
     async def update_with_tags(
         self,
         session: AsyncSession,
         db_obj: Post,
         obj_in: PostUpdate | dict[str, Any],
     ) -> Post:
+        """Update a post loaded with the ``detail`` profile.
+
+        Its author and comments are already loaded and the tags are replaced
+        in memory, so the returned object needs no reload.
+        """
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
@@ -94,18 +202,12 @@ class PostRepository(BaseRepository[Post, PostCreate, PostUpdate]):
         db_obj.sqlmodel_update(update_data)
 
         if tag_ids is not None:
-            statement = (
-                select(Tag).where(Tag.id.in_(tag_ids)).where(not_(Tag.is_deleted))  # type: ignore[attr-defined]
-            )
-            result = await session.exec(statement)
-            tags = list(result.all())
-            db_obj.tags = tags
+            db_obj.tags = await self._live_tags(session, tag_ids)
         else:
             db_obj.tags = []
 
         session.add(db_obj)
         await session.commit()
-        await session.refresh(db_obj)
         return db_obj
 
 
@@ -0,0 +1,151 @@
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.logs import get_logger
+from app.core.metrics import registry
+from app.schemas.auth import Principal
+
+
+@dataclass
+class PrincipalCacheStats:
+    hits: int = 0
+    misses: int = 0
+    expirations: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class PrincipalCache:
+    """Principals kept per worker for ``ttl`` seconds, least recently used out.
+
+    Writes through ``UserRepository`` drop the user's entry in this worker.
+    With a ``channel`` they also ``NOTIFY`` it, and workers that called
+    ``listen`` drop their entry as well; without one, other workers may act on
+    a stale principal for up to ``ttl``.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, channel: str | None = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.channel = channel
+        self.stats = PrincipalCacheStats()
+        self._entries: OrderedDict[UUID, tuple[float, Principal]] = OrderedDict()
+        self._generation = 0
+        self._connection: AsyncConnection | None = None
+
+    @property
+    def generation(self) -> int:
+        """Bumped by every invalidation; pass it back to ``put``."""
+        return self._generation
+
+    def get(self, user_id: UUID) -> Principal | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[user_id]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.stats.hits += 1
+        return entry[1]
+
+    def put(self, principal: Principal, generation: int) -> None:
+        """Cache ``principal`` unless an invalidation happened since it was read."""
+        if self.ttl <= 0 or generation != self._generation:
+            return
+        self._entries[principal.id] = (time.monotonic() + self.ttl, principal)
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def discard(self, user_id: UUID) -> None:
+        self._generation += 1
+        self.stats.invalidations += 1
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def invalidate(self, session: AsyncSession, user_id: UUID) -> None:
+        """Drop ``user_id`` here and, with a channel, in every listening worker.
+
+        Call it after the write is committed, so no worker can reload the old
+        row once its entry is gone.
+        """
+        self.discard(user_id)
+        if self.channel:
+            await session.exec(select(func.pg_notify(self.channel, str(user_id))))
+            await session.commit()
+
+    async def listen(self, engine: AsyncEngine) -> None:
+        """Hold a connection from ``engine`` listening on the channel."""
+        if not self.channel or self._connection is not None:
+            return
+        self._connection = await engine.connect()
+        raw = await self._connection.get_raw_connection()
+        driver = raw.driver_connection
+        await driver.add_listener(self.channel, self._on_notify)  # type: ignore[union-attr]
+        driver.add_termination_listener(self._on_terminate)  # type: ignore[union-attr]
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            self.discard(UUID(payload))
+        except ValueError:
+            get_logger().warning(f"Ignoring principal invalidation {payload!r}")
+
+    def _on_terminate(self, connection) -> None:
+        # Notifications sent while nobody listens are lost; start over and
+        # fall back to the TTL until the worker restarts.
+        self.clear()
+        get_logger().warning(
+            "Principal invalidation listener disconnected, "
+            f"entries now expire after {self.ttl}s only"
+        )
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+    channel=settings.USER_CACHE_CHANNEL,
+)
+
+
+def _collect():
+    for name, value in asdict(principal_cache.stats).items():
+        yield (
+            f"principal_cache_{name}_total",
+            "counter",
+            f"Principal cache {name}.",
+            {},
+            value,
+        )
+    yield (
+        "principal_cache_entries",
+        "gauge",
+        "Principals cached.",
+        {},
+        len(principal_cache),
+    )
+
+
+registry.register_collector(_collect)
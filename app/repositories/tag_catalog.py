@@ -0,0 +1,195 @@
+import asyncio
+from collections.abc import Collection, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.errors import DATABASE_ERRORS
+from app.core.logs import get_logger
+from app.core.metrics import registry
+from app.models.tag_model import Tag
+from app.repositories.base_repository import Page
+from app.schemas.common import Cursor
+
+# Changes with any insert, update or delete of a tag row, whatever the order
+# in which concurrent writes commit. Tags are few, so hashing them all is
+# cheaper than keeping a version column in step.
+VERSION_QUERY = text(
+    "SELECT md5(coalesce(string_agg(id::text || updated_at::text, ',' "
+    "ORDER BY id), '')) FROM tag"
+)
+
+
+@dataclass(frozen=True)
+class TagSnapshot:
+    """Every tag row as of ``version``, deleted ones included.
+
+    The tags are detached from any session and shared by all requests of the
+    worker: read them, never modify them.
+    """
+
+    version: str
+    # In display order, newest first, as the repositories page them.
+    tags: tuple[Tag, ...]
+    by_id: Mapping[UUID, Tag]
+    by_name: Mapping[str, UUID]
+
+    @classmethod
+    def of(cls, version: str, tags: list[Tag]) -> "TagSnapshot":
+        ordered = sorted(tags, key=lambda tag: (tag.created_at, tag.id), reverse=True)
+        return cls(
+            version=version,
+            tags=tuple(ordered),
+            by_id=MappingProxyType({tag.id: tag for tag in ordered}),
+            by_name=MappingProxyType({tag.name: tag.id for tag in ordered}),
+        )
+
+    def get(self, tag_id: UUID, include_deleted: bool = False) -> Tag | None:
+        tag = self.by_id.get(tag_id)
+        if tag is None or (tag.is_deleted and not include_deleted):
+            return None
+        return tag
+
+    def live(self, tag_ids: Collection[UUID]) -> list[Tag]:
+        """The tags among ``tag_ids`` that are not deleted."""
+        return [tag for tag_id in tag_ids if (tag := self.get(tag_id)) is not None]
+
+    def page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        include_deleted: bool = False,
+        only_deleted: bool = False,
+        cursor: Cursor | None = None,
+        include_total: bool = True,
+    ) -> Page[Tag]:
+        """The page ``TagRepository.get_page`` would return, with an exact
+        total."""
+        if only_deleted:
+            rows = [tag for tag in self.tags if tag.is_deleted]
+        elif include_deleted:
+            rows = list(self.tags)
+        else:
+            rows = [tag for tag in self.tags if not tag.is_deleted]
+        total = len(rows) if include_total else None
+
+        if cursor is None:
+            items = rows[skip : skip + limit + 1]
+        else:
+            boundary = (cursor.created_at, cursor.id)
+            if cursor.backwards:
+                rows = [
+                    tag for tag in reversed(rows) if (tag.created_at, tag.id) > boundary
+                ]
+            else:
+                rows = [tag for tag in rows if (tag.created_at, tag.id) < boundary]
+            items = rows[: limit + 1]
+
+        has_more = len(items) > limit
+        items = items[:limit]
+        if cursor is not None and cursor.backwards:
+            items.reverse()
+        return Page(items=items, has_more=has_more, total=total)
+
+
+class TagCatalog:
+    """An immutable snapshot of the tag table, kept per worker.
+
+    Tag reads and ``tag_ids`` checks use it instead of querying the table.
+    ``TagService`` reloads it after each write; other workers compare
+    ``VERSION_QUERY`` with their snapshot every ``check_interval`` seconds
+    and reload when it changed, so they see the write within that time.
+    Each reload builds a new snapshot and swaps it in whole, so a request
+    never sees a half-updated catalog. Until ``start`` loads it, or with a
+    ``check_interval`` of 0, ``snapshot`` is None and callers query the
+    table as before.
+    """
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self.snapshot: TagSnapshot | None = None
+        self.reloads = 0
+        self._engine: AsyncEngine | None = None
+        self._lock = asyncio.Lock()
+        self._checker: asyncio.Task | None = None
+
+    async def reload(self) -> None:
+        """Swap in a snapshot of the table as it is now; call it once a tag
+        write is committed."""
+        if self._engine is None:
+            return
+        # Reloads read in turn, so the last one to finish read the newest
+        # rows and an older snapshot never replaces a newer one.
+        async with self._lock, AsyncSession(self._engine) as session:
+            # A write landing between the two statements only makes the next
+            # check reload again.
+            version = await session.scalar(VERSION_QUERY)
+            tags = list((await session.exec(select(Tag))).all())
+            session.expunge_all()
+            self.snapshot = TagSnapshot.of(version, tags)
+            self.reloads += 1
+
+    async def check(self) -> None:
+        """Reload if the table changed since the snapshot was taken."""
+        if self._engine is None:
+            return
+        async with AsyncSession(self._engine) as session:
+            version = await session.scalar(VERSION_QUERY)
+        if self.snapshot is None or version != self.snapshot.version:
+            await self.reload()
+
+    async def start(self, engine: AsyncEngine) -> None:
+        if self.check_interval <= 0 or self._engine is not None:
+            return
+        self._engine = engine
+        await self.reload()
+        self._checker = asyncio.create_task(self._check_forever())
+
+    async def stop(self) -> None:
+        if self._checker is not None:
+            self._checker.cancel()
+            self._checker = None
+        self._engine = None
+        self.snapshot = None
+
+    async def _check_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.check()
+            except DATABASE_ERRORS as exc:
+                get_logger().warning(f"Tag catalog check failed: {exc!r}")
+            except Exception:
+                # Keep checking, or the snapshot would never be reloaded.
+                logger = get_logger()
+                logger.exception("Tag catalog check failed")
+
+
+tag_catalog = TagCatalog(check_interval=settings.TAG_CATALOG_CHECK_INTERVAL_SECONDS)
+
+
+def _collect():
+    snapshot = tag_catalog.snapshot
+    yield (
+        "tag_catalog_tags",
+        "gauge",
+        "Tags in this worker's catalog snapshot.",
+        {},
+        0 if snapshot is None else len(snapshot.tags),
+    )
+    yield (
+        "tag_catalog_reloads_total",
+        "counter",
+        "Tag catalog snapshots loaded.",
+        {},
+        tag_catalog.reloads,
+    )
+
+
+registry.register_collector(_collect)
@@ -1,3 +1,4 @@
+from collections.abc import Collection
 from typing import Optional
 from uuid import UUID
 
@@ -7,6 +8,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.tag_model import Tag, PostTagLink
 from app.repositories.base_repository import BaseRepository
+from app.repositories.tag_catalog import tag_catalog
 from app.schemas.tag_schema import TagCreate, TagUpdate
 
 
@@ -19,6 +21,26 @@ class TagRepository(BaseRepository[Tag, TagCreate, TagUpdate]):
         result = await session.exec(statement)
         return result.first()
 
+    async def get_existing_names(
+        self, session: AsyncSession, names: Collection[str]
+    ) -> set[str]:
+        """Names already taken, by live or deleted tags."""
+        if not names:
+            return set()
+        statement = select(self.model.name).where(self.model.name.in_(names))  # type: ignore[attr-defined]
+        result = await session.exec(statement)
+        return set(result.all())
+
+    async def get_live_ids(
+        self,
+        session: AsyncSession,
+        ids: Collection[UUID],
+    ) -> set[UUID]:
+        snapshot = tag_catalog.snapshot
+        if snapshot is None:
+            return await super().get_live_ids(session, ids)
+        return {tag.id for tag in snapshot.live(ids)}
+
     async def count_posts_by_tag(self, session: AsyncSession, tag_id: UUID) -> int:
         statement = select(func.count(PostTagLink.post_id)).where(  # type: ignore [arg-type]
             PostTagLink.tag_id == tag_id
@@ -1,25 +1,38 @@
 from typing import Any
+from uuid import UUID
 
 from pydantic import EmailStr
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from app.core.security import get_password_hash, verify_password
+from app.core.security import password_hasher
+from app.models import Comment, Post
 from app.models.user_model import User
 from app.repositories.base_repository import BaseRepository
+from app.repositories.cascade import CascadeRule
+from app.repositories.principal_cache import principal_cache
+from app.schemas.auth import Principal
 from app.schemas.user_schema import UserCreate, UserUpdate
 
 
 class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
+    cascade = (
+        CascadeRule(
+            Post, Post.author_id, children=(CascadeRule(Comment, Comment.post_id),)
+        ),
+        CascadeRule(Comment, Comment.author_id),
+    )
+
     def __init__(self) -> None:
         super().__init__(User)
 
     async def create(self, session: AsyncSession, obj_in: UserCreate) -> User:
+        hashed_password = await password_hasher.hash(obj_in.password)
         db_obj = User.model_validate(
-            obj_in, update={"hashed_password": get_password_hash(obj_in.password)}
+            obj_in, update={"hashed_password": hashed_password}
         )
         session.add(db_obj)
         await session.commit()
-        await session.refresh(db_obj)
+        self._invalidate_counts()
         return db_obj
 
     async def update(
@@ -31,9 +44,58 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
             user_data = obj_in.model_dump(exclude_unset=True, exclude_none=True)
         if "password" in user_data and user_data["password"]:
             password = user_data["password"]
-            hashed_password = get_password_hash(password)
+            hashed_password = await password_hasher.hash(password)
             user_data["hashed_password"] = hashed_password
-        return await super().update(session, db_obj=db_obj, obj_in=user_data)
+        user = await super().update(session, db_obj=db_obj, obj_in=user_data)
+        await principal_cache.invalidate(session, user.id)
+        return user
+
+    async def soft_delete(self, session: AsyncSession, entity_id: UUID) -> bool:
+        deleted = await super().soft_delete(session, entity_id=entity_id)
+        if deleted:
+            await principal_cache.invalidate(session, entity_id)
+        return deleted
+
+    async def restore(self, session: AsyncSession, entity_id: UUID) -> User | None:
+        user = await super().restore(session, entity_id=entity_id)
+        if user is not None:
+            await principal_cache.invalidate(session, entity_id)
+        return user
+
+    async def remove(self, session: AsyncSession, entity_id: UUID) -> bool:
+        removed = await super().remove(session, entity_id=entity_id)
+        if removed:
+            await principal_cache.invalidate(session, entity_id)
+        return removed
+
+    def get_cached_principal(self, user_id: UUID) -> Principal | None:
+        """The user's principal, deleted or not, if this worker has it cached."""
+        return principal_cache.get(user_id)
+
+    async def get_principal(
+        self, session: AsyncSession, user_id: UUID
+    ) -> Principal | None:
+        """The user's principal, deleted or not, from the cache when possible."""
+        principal = self.get_cached_principal(user_id)
+        if principal is not None:
+            return principal
+        return await self.load_principal(session, user_id)
+
+    async def load_principal(
+        self, session: AsyncSession, user_id: UUID
+    ) -> Principal | None:
+        """The user's principal, deleted or not, read from the database and
+        cached."""
+        generation = principal_cache.generation
+        statement = select(User.id, User.is_superuser, User.is_deleted).where(
+            User.id == user_id
+        )
+        row = (await session.exec(statement)).first()
+        if row is None:
+            return None
+        principal = Principal(*row)
+        principal_cache.put(principal, generation)
+        return principal
 
     @staticmethod
     async def get_by_email(
@@ -53,8 +115,16 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         )
         if not db_user:
             return None
-        if not verify_password(password, db_user.hashed_password):
+        verified, new_hash = await password_hasher.verify_and_update(
+            password, db_user.hashed_password
+        )
+        if not verified:
             return None
+        if new_hash is not None:
+            # Hashed with older parameters; upgrade while the password is known.
+            db_user.hashed_password = new_hash
+            session.add(db_user)
+            await session.commit()
         return db_user
 
 
@@ -1,4 +1,6 @@
+from dataclasses import dataclass
 from uuid import UUID
+
 from pydantic import BaseModel
 
 
@@ -9,3 +11,12 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     sub: UUID
+
+
+@dataclass(frozen=True)
+class Principal:
+    """What authorization needs to know about the user behind a token."""
+
+    id: UUID
+    is_superuser: bool
+    is_deleted: bool
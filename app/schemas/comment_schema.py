@@ -12,6 +12,10 @@ class CommentCreate(CommentBase):
     pass
 
 
+class CommentBulkCreate(CommentCreate):
+    post_id: UUID
+
+
 class CommentUpdate(CommentBase):
     content: str | None = Field(default=None, min_length=1, max_length=1000)  # type: ignore
 
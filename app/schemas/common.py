@@ -1,17 +1,81 @@
+import base64
+import binascii
+import hashlib
+from datetime import datetime
 from math import ceil
-from typing import Generic, TypeVar
+from typing import Any, Generic, TypeVar
+from uuid import UUID
 
 from fastapi import Query
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError
 
 T = TypeVar("T")
 
 
+class Cursor(BaseModel):
+    """Position of a row in the ``(created_at, id)`` ordering used by keyset pages."""
+
+    created_at: datetime
+    id: UUID
+    backwards: bool = False
+
+    def encode(self) -> str:
+        raw = self.model_dump_json().encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "Cursor":
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            return cls.model_validate_json(raw)
+        except (binascii.Error, ValueError, ValidationError) as e:
+            raise ValueError("Invalid cursor") from e
+
+
+class Version(BaseModel):
+    """HTTP validators derived from the values a response body depends on.
+
+    The ETag is weak: it changes with those values, not with the exact bytes
+    sent, so a representation is only ever compared for equivalence.
+    """
+
+    etag: str
+    last_modified: datetime | None = None
+
+    @classmethod
+    def of(cls, *parts: Any, last_modified: datetime | None = None) -> "Version":
+        digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+        return cls(etag=f'W/"{digest}"', last_modified=last_modified)
+
+
 class PaginationParams(BaseModel):
     page: int = Field(Query(default=1, ge=1, description="Current page number"))
     page_size: int = Field(
         Query(default=100, ge=1, le=100, description="Number of items per page")
     )
+    cursor: str | None = Field(
+        Query(
+            default=None,
+            description="Opaque cursor returned as next_cursor/prev_cursor. "
+            "When set, keyset pagination is used and page is ignored",
+        )
+    )
+    use_cursor: bool = Field(
+        Query(
+            default=False,
+            description="Use keyset pagination starting from the first page",
+        )
+    )
+    include_total: bool = Field(
+        Query(
+            default=True,
+            description="Count matching items. Set to false to only get has_more",
+        )
+    )
+
+    @property
+    def is_keyset(self) -> bool:
+        return self.use_cursor or self.cursor is not None
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
@@ -19,22 +83,86 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int = Field(description="Current page number", examples=[1])
     page_size: int = Field(description="Number of items per page", examples=[10])
 
-    total_pages: int = Field(description="Total pages", examples=[5])
-    total_items: int = Field(description="Total items", examples=[48])
+    total_pages: int | None = Field(
+        description="Total pages, null when include_total=false", examples=[5]
+    )
+    total_items: int | None = Field(
+        description="Total items, null when include_total=false", examples=[48]
+    )
+    has_more: bool = Field(
+        default=False, description="Whether items exist after this page"
+    )
+    total_is_exact: bool = Field(
+        default=True,
+        description="False when total_items is a planner estimate or a cached value",
+    )
+
+    next_cursor: str | None = Field(
+        default=None, description="Cursor for the next page (keyset mode only)"
+    )
+    prev_cursor: str | None = Field(
+        default=None, description="Cursor for the previous page (keyset mode only)"
+    )
+
+    _version: Version | None = PrivateAttr(default=None)
+    _json: bytes | None = PrivateAttr(default=None)
+
+    @property
+    def version(self) -> Version | None:
+        """Validators of this page, when the service computed them."""
+        return self._version
+
+    def to_json(self) -> bytes:
+        """The page as a JSON body, serialized on first use and kept.
+
+        Items are the response schemas the service built, serialized as
+        they are; a page shared by coalesced requests is serialized once.
+        """
+        if self._json is None:
+            self._json = self.__pydantic_serializer__.to_json(self)
+        return self._json
 
     @classmethod
     def create(
-        cls, items: list[T], total_items: int, params: PaginationParams
+        cls,
+        items: list[T],
+        total_items: int | None,
+        params: PaginationParams,
+        has_more: bool = False,
+        total_is_exact: bool = True,
+        next_cursor: str | None = None,
+        prev_cursor: str | None = None,
+        version: Version | None = None,
     ) -> "PaginatedResponse[T]":
-        total_pages = ceil(total_items / params.page_size) if total_items else 0
-        return cls(
+        total_pages = None
+        if total_items is not None:
+            total_pages = ceil(total_items / params.page_size) if total_items else 0
+        response = cls(
             items=items,
             total_items=total_items,
             page=params.page,
             page_size=params.page_size,
             total_pages=total_pages,
+            has_more=has_more,
+            total_is_exact=total_is_exact,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
         )
+        response._version = version
+        return response
 
 
 class MessageResponse(BaseModel):
     message: str
+
+
+class BulkItemError(BaseModel):
+    index: int = Field(description="Position of the item in the request body")
+    detail: str
+
+
+class BulkCreateResponse(BaseModel, Generic[T]):
+    items: list[T] = Field(description="Created items, in request order")
+    errors: list[BulkItemError] = Field(
+        default_factory=list, description="Items that were skipped and why"
+    )
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class SlowQueryStat(BaseModel):
+    statement: str
+    repository: str | None
+    count: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    last_seen: datetime
+    plan: Any | None = None
@@ -1,18 +1,26 @@
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from datetime import datetime
 from uuid import UUID
-from typing import Generic, TypeVar
+from typing import Any, Generic, TypeVar
 
 from fastapi import HTTPException, status
+from pydantic import BaseModel as Schema
+from pydantic_core import to_json
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models import User
+from app.core.cache import CachedResponse
+from app.core.config import settings
+from app.core.singleflight import COALESCE_READS, single_flight
 from app.models.base_model import BaseModel
-from app.repositories.base_repository import BaseRepository
-from app.schemas.common import PaginatedResponse, PaginationParams
+from app.repositories.base_repository import BaseRepository, Page
+from app.schemas.auth import Principal
+from app.schemas.common import Cursor, PaginatedResponse, PaginationParams, Version
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
 CreateSchemaType = TypeVar("CreateSchemaType")
 UpdateSchemaType = TypeVar("UpdateSchemaType")
 PublicSchemaType = TypeVar("PublicSchemaType")
+T = TypeVar("T")
 
 
 class BaseService(
@@ -26,50 +34,257 @@ class BaseService(
         self.repository = repository
         self.public_schema = public_schema
 
-    async def get_list_paginated(
+    async def _read(
         self,
         session: AsyncSession,
-        current_user: User,
+        lookup: str,
+        key: Hashable,
+        call: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Run ``call``, sharing it with concurrent identical lookups.
+
+        Only sessions flagged by ``get_read_session`` take part, and only
+        with lookups on the same database; callers get the same objects, so
+        they must not modify them.
+        """
+        if not session.info.get(COALESCE_READS):
+            return await call()
+        return await single_flight.do(
+            f"{self.repository.table_name}.{lookup}", (session.bind, key), call
+        )
+
+    @staticmethod
+    def _page_window(params: PaginationParams) -> tuple[int, Cursor | None]:
+        """Translate pagination params into ``(skip, cursor)``."""
+        if not params.is_keyset:
+            return (params.page - 1) * params.page_size, None
+        if params.cursor is None:
+            return 0, None
+        try:
+            return 0, Cursor.decode(params.cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor",
+            )
+
+    @staticmethod
+    def _page_version(
+        page: Page[Any],
         params: PaginationParams,
-        include_deleted: bool = False,
-        only_deleted: bool = False,
-    ) -> PaginatedResponse[PublicSchemaType]:
+        include_deleted: bool,
+        only_deleted: bool,
+    ) -> Version:
+        """Validators of a page, from its models or from the ``RowVersion``
+        rows of ``get_page_versions``.
+
+        Lists send no Last-Modified: a row leaving the page changes it
+        without making it any newer.
+        """
+        return Version.of(
+            params.model_dump(),
+            include_deleted,
+            only_deleted,
+            [
+                item if isinstance(item, tuple) else (item.id, item.updated_at)
+                for item in page.items
+            ],
+            page.has_more,
+            page.total,
+            page.total_exact,
+        )
+
+    @staticmethod
+    def _check_deleted_access(
+        current_user: Principal, include_deleted: bool, only_deleted: bool
+    ) -> None:
         if (only_deleted or include_deleted) and not current_user.is_superuser:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions to view deleted items",
             )
-        skip = (params.page - 1) * params.page_size
-        items = await self.repository.get_list(
+
+    @staticmethod
+    def _paginated_response(
+        page: Page[Any],
+        params: PaginationParams,
+        cursor: Cursor | None,
+        schema: Any,
+        version: Version | None = None,
+    ) -> PaginatedResponse[Any]:
+        items = [schema.model_validate(item) for item in page.items]
+        if not params.is_keyset:
+            return PaginatedResponse.create(
+                items=items,
+                total_items=page.total,
+                params=params,
+                has_more=page.has_more,
+                total_is_exact=page.total_exact,
+                version=version,
+            )
+
+        # Backward pages report has_more for the rows before them, and always
+        # have a next page: the one the cursor came from.
+        backwards = cursor is not None and cursor.backwards
+        has_next = True if backwards else page.has_more
+        has_prev = page.has_more if backwards else cursor is not None
+        next_cursor = prev_cursor = None
+        if page.items and has_next:
+            last = page.items[-1]
+            next_cursor = Cursor(created_at=last.created_at, id=last.id).encode()
+        if page.items and has_prev:
+            first = page.items[0]
+            prev_cursor = Cursor(
+                created_at=first.created_at, id=first.id, backwards=True
+            ).encode()
+
+        return PaginatedResponse.create(
+            items=items,
+            total_items=page.total,
+            params=params,
+            has_more=has_next,
+            total_is_exact=page.total_exact,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+            version=version,
+        )
+
+    async def get_list_paginated(
+        self,
+        session: AsyncSession,
+        current_user: Principal,
+        params: PaginationParams,
+        include_deleted: bool = False,
+        only_deleted: bool = False,
+    ) -> PaginatedResponse[PublicSchemaType]:
+        self._check_deleted_access(current_user, include_deleted, only_deleted)
+        skip, cursor = self._page_window(params)
+
+        async def fetch() -> PaginatedResponse[PublicSchemaType]:
+            page = await self.repository.get_page(
+                session,
+                skip=skip,
+                limit=params.page_size,
+                include_deleted=include_deleted,
+                only_deleted=only_deleted,
+                cursor=cursor,
+                include_total=params.include_total,
+            )
+            version = self._page_version(page, params, include_deleted, only_deleted)
+            return self._paginated_response(
+                page, params, cursor, self.public_schema, version
+            )
+
+        return await self._read(
+            session,
+            "page",
+            (params.model_dump_json(), include_deleted, only_deleted),
+            fetch,
+        )
+
+    async def get_list_version(
+        self,
+        session: AsyncSession,
+        current_user: Principal,
+        params: PaginationParams,
+        include_deleted: bool = False,
+        only_deleted: bool = False,
+    ) -> Version:
+        """The version ``get_list_paginated`` would report, without loading
+        the page."""
+        self._check_deleted_access(current_user, include_deleted, only_deleted)
+        skip, cursor = self._page_window(params)
+        page = await self.repository.get_page_versions(
             session,
             skip=skip,
             limit=params.page_size,
             include_deleted=include_deleted,
             only_deleted=only_deleted,
+            cursor=cursor,
+            include_total=params.include_total,
+        )
+        return self._page_version(page, params, include_deleted, only_deleted)
+
+    async def export(
+        self,
+        session: AsyncSession,
+        current_user: Principal,
+        include_deleted: bool = False,
+        only_deleted: bool = False,
+    ) -> AsyncIterator[PublicSchemaType]:
+        self._check_deleted_access(current_user, include_deleted, only_deleted)
+        return self._export(session, include_deleted, only_deleted)
+
+    async def _export(
+        self,
+        session: AsyncSession,
+        include_deleted: bool,
+        only_deleted: bool,
+    ) -> AsyncIterator[PublicSchemaType]:
+        async for item in self.repository.stream(
+            session,
+            include_deleted=include_deleted,
+            only_deleted=only_deleted,
+            batch_size=settings.EXPORT_BATCH_SIZE,
+        ):
+            yield self.public_schema.model_validate(item)  # type: ignore[attr-defined]
+
+    def version_of(self, item: ModelType) -> Version:
+        """Validators of a detail response; Last-Modified is the newest
+        ``updated_at`` among the item and the relations it embeds."""
+        return self._detail_version(self.repository.version_of(item))
+
+    async def get_version(
+        self, session: AsyncSession, entity_id: UUID
+    ) -> Version | None:
+        """The version of what ``get_by_id`` would return, without loading it;
+        None when it would 404."""
+        parts = await self._read(
+            session,
+            "version",
+            entity_id,
+            lambda: self.repository.get_version(session, entity_id),
         )
-        total = await self.repository.count(
-            session, include_deleted=include_deleted, only_deleted=only_deleted
+        return None if parts is None else self._detail_version(parts)
+
+    @staticmethod
+    def _detail_version(parts: tuple[Any, ...]) -> Version:
+        return Version.of(
+            *parts,
+            last_modified=max(part for part in parts if isinstance(part, datetime)),
         )
-        return PaginatedResponse.create(
-            items=[self.public_schema.model_validate(item) for item in items],  # type: ignore[attr-defined]
-            total_items=total,
-            params=params,
+
+    @staticmethod
+    def _cache_entry(body: Schema, version: Version | None) -> CachedResponse:
+        """``body`` serialized for the response cache, with its validators."""
+        return CachedResponse(
+            body=to_json(body),
+            meta={} if version is None else version.model_dump(mode="json"),
         )
 
     async def get_by_id(
         self,
         session: AsyncSession,
         entity_id: UUID,
-        current_user: User | None = None,
+        current_user: Principal | None = None,
         include_deleted: bool = False,
+        profile: str = "detail",
     ) -> ModelType:
         if include_deleted and current_user and not current_user.is_superuser:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions to view deleted items",
             )
-        item = await self.repository.get(
-            session, entity_id=entity_id, include_deleted=include_deleted
+        item = await self._read(
+            session,
+            "get",
+            (entity_id, include_deleted, profile),
+            lambda: self.repository.get(
+                session,
+                entity_id=entity_id,
+                include_deleted=include_deleted,
+                profile=profile,
+            ),
         )
         if not item:
             raise HTTPException(
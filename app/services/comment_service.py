@@ -1,12 +1,26 @@
 from uuid import UUID
 
-from fastapi import HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models import Comment, User
+from app.core.cache import response_cache
+from app.core.permissions import permission_checker
+from app.models import Comment
 from app.repositories.comment_repository import comment_repository
-from app.schemas.comment_schema import CommentCreate, CommentUpdate, CommentPublic
-from app.schemas.common import PaginationParams, PaginatedResponse
+from app.repositories.post_repository import post_repository
+from app.schemas.auth import Principal
+from app.schemas.comment_schema import (
+    CommentBulkCreate,
+    CommentCreate,
+    CommentUpdate,
+    CommentPublic,
+)
+from app.schemas.common import (
+    BulkCreateResponse,
+    BulkItemError,
+    PaginationParams,
+    PaginatedResponse,
+    Version,
+)
 from app.services.base_service import BaseService
 
 
@@ -24,44 +38,115 @@ class CommentService(BaseService[Comment, CommentCreate, CommentUpdate, CommentP
         comment = await comment_repository.create_comment(
             session, comment_in, post_id, author_id
         )
+        await response_cache.invalidate(f"post:{post_id}")
         return comment
 
+    async def bulk_create_comments(
+        self,
+        session: AsyncSession,
+        comments_in: list[CommentBulkCreate],
+        author_id: UUID,
+    ) -> BulkCreateResponse[CommentPublic]:
+        """Create the valid comments in one transaction and report the rest.
+
+        Posts of the whole batch are resolved with a single query; comments
+        on missing or deleted posts are skipped.
+        """
+        post_ids = {comment_in.post_id for comment_in in comments_in}
+        live_post_ids = await post_repository.get_live_ids(session, post_ids)
+
+        valid: list[CommentBulkCreate] = []
+        errors: list[BulkItemError] = []
+        for index, comment_in in enumerate(comments_in):
+            if comment_in.post_id not in live_post_ids:
+                errors.append(BulkItemError(index=index, detail="Post not found"))
+                continue
+            valid.append(comment_in)
+
+        comments = await comment_repository.bulk_create_comments(
+            session, objs_in=valid, author_id=author_id
+        )
+        await response_cache.invalidate(
+            *{f"post:{comment.post_id}" for comment in comments}
+        )
+        return BulkCreateResponse(
+            items=[CommentPublic.model_validate(comment) for comment in comments],
+            errors=errors,
+        )
+
+    async def update_comment(
+        self,
+        session: AsyncSession,
+        current_user: Principal,
+        comment_id: UUID,
+        comment_in: CommentUpdate,
+    ) -> Comment:
+        comment = await self.get_by_id(session, comment_id)
+        permission_checker.require_owner_or_superuser(current_user, comment)
+
+        updated = await comment_repository.update(
+            session, db_obj=comment, obj_in=comment_in
+        )
+        await response_cache.invalidate(f"post:{updated.post_id}")
+        return updated
+
+    async def delete_comment(
+        self, session: AsyncSession, comment_id: UUID, current_user: Principal
+    ) -> bool:
+        comment = await self.get_by_id(session, comment_id)
+        permission_checker.require_owner_or_superuser(current_user, comment)
+
+        post_id = comment.post_id
+        deleted = await self.delete(session, comment_id)
+        await response_cache.invalidate(f"post:{post_id}")
+        return deleted
+
     async def get_by_post(
         self,
         session: AsyncSession,
         post_id: UUID,
         params: PaginationParams,
-        current_user: User,
+        current_user: Principal,
         include_deleted: bool = False,
         only_deleted: bool = False,
     ) -> PaginatedResponse[CommentPublic]:
-        if (only_deleted or include_deleted) and not current_user.is_superuser:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Insufficient permissions to view deleted items",
-            )
-
-        skip = (params.page - 1) * params.page_size
-        comments = await comment_repository.get_by_post(
+        self._check_deleted_access(current_user, include_deleted, only_deleted)
+        skip, cursor = self._page_window(params)
+        page = await comment_repository.get_page_by_post(
             session,
             post_id=post_id,
             skip=skip,
             limit=params.page_size,
             include_deleted=include_deleted,
             only_deleted=only_deleted,
+            cursor=cursor,
+            include_total=params.include_total,
         )
-        total = await comment_repository.count_by_post(
+        version = self._page_version(page, params, include_deleted, only_deleted)
+        return self._paginated_response(page, params, cursor, CommentPublic, version)
+
+    async def get_by_post_version(
+        self,
+        session: AsyncSession,
+        post_id: UUID,
+        params: PaginationParams,
+        current_user: Principal,
+        include_deleted: bool = False,
+        only_deleted: bool = False,
+    ) -> Version:
+        self._check_deleted_access(current_user, include_deleted, only_deleted)
+        skip, cursor = self._page_window(params)
+        page = await comment_repository.get_page_versions_by_post(
             session,
             post_id=post_id,
+            skip=skip,
+            limit=params.page_size,
             include_deleted=include_deleted,
             only_deleted=only_deleted,
+            cursor=cursor,
+            include_total=params.include_total,
         )
-
-        return PaginatedResponse.create(
-            items=[CommentPublic.model_validate(comment) for comment in comments],
-            total_items=total,
-            params=params,
-        )
+        return self._page_version(page, params, include_deleted, only_deleted)
 
 
 comment_service = CommentService()
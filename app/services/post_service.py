@@ -3,10 +3,24 @@ from uuid import UUID
 from fastapi import HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.cache import CachedResponse, response_cache
 from app.core.permissions import permission_checker
 from app.repositories.post_repository import post_repository
-from app.schemas.common import PaginationParams, PaginatedResponse
-from app.schemas.post_schema import PostCreate, PostUpdate, PostPublic
+from app.schemas.auth import Principal
+from app.repositories.tag_repository import tag_repository
+from app.schemas.common import (
+    BulkCreateResponse,
+    BulkItemError,
+    PaginationParams,
+    PaginatedResponse,
+)
+from app.schemas.post_schema import (
+    PostCreate,
+    PostUpdate,
+    PostPublic,
+    PostPublicWithRelations,
+    PostReadWithAuthor,
+)
 from app.models import User, Post
 from app.services.base_service import BaseService
 
@@ -16,54 +30,106 @@ class PostService(BaseService[Post, PostCreate, PostUpdate, PostPublic]):
         super().__init__(repository=post_repository, public_schema=PostPublic)
 
     async def create_post(
-        self, session: AsyncSession, post_in: PostCreate, author_id: UUID
+        self, session: AsyncSession, post_in: PostCreate, author: User
     ) -> Post:
         post = await post_repository.create_with_tags(
-            session, obj_in=post_in, author_id=author_id
+            session, obj_in=post_in, author=author
         )
         return post
 
+    async def bulk_create_posts(
+        self, session: AsyncSession, posts_in: list[PostCreate], author_id: UUID
+    ) -> BulkCreateResponse[PostPublic]:
+        """Create the valid posts in one transaction and report the rest.
+
+        Tag ids of the whole batch are resolved with a single query; posts
+        referring to unknown or deleted tags are skipped.
+        """
+        tag_ids = {tag_id for post_in in posts_in for tag_id in post_in.tag_ids}
+        live_tag_ids = await tag_repository.get_live_ids(session, tag_ids)
+
+        valid: list[PostCreate] = []
+        errors: list[BulkItemError] = []
+        for index, post_in in enumerate(posts_in):
+            unknown = [
+                str(tag_id) for tag_id in post_in.tag_ids if tag_id not in live_tag_ids
+            ]
+            if unknown:
+                errors.append(
+                    BulkItemError(
+                        index=index, detail=f"Tags not found: {', '.join(unknown)}"
+                    )
+                )
+                continue
+            valid.append(post_in)
+
+        posts = await post_repository.bulk_create_with_tags(
+            session, objs_in=valid, author_id=author_id
+        )
+        return BulkCreateResponse(
+            items=[PostPublic.model_validate(post) for post in posts], errors=errors
+        )
+
+    async def get_post_response(
+        self, session: AsyncSession, post_id: UUID
+    ) -> CachedResponse:
+        """The post detail body, from the response cache when it is there.
+
+        The entry is dropped by writes to the post, its comments, its author
+        and its tags.
+        """
+
+        async def fill():
+            post = await self.get_by_id(session, post_id)
+            tags = [f"post:{post.id}", f"user:{post.author_id}"]
+            tags += [f"tag:{tag.id}" for tag in post.tags]
+            body = PostPublicWithRelations.model_validate(post)
+            return self._cache_entry(body, self.version_of(post)), tags
+
+        return await response_cache.get_or_fill(f"post:{post_id}", fill)
+
     async def get_posts_by_author(
         self,
         session: AsyncSession,
-        current_user: User,
+        current_user: Principal,
         author_id: UUID,
         params: PaginationParams,
         include_deleted: bool = False,
         only_deleted: bool = False,
-    ) -> PaginatedResponse[PostPublic]:
+    ) -> PaginatedResponse[PostReadWithAuthor]:
         if (only_deleted or include_deleted) and not current_user.is_superuser:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions to view deleted items",
             )
 
-        skip = (params.page - 1) * params.page_size
-        posts = await post_repository.get_by_author(
-            session,
-            author_id=author_id,
-            skip=skip,
-            limit=params.page_size,
-            include_deleted=include_deleted,
-            only_deleted=only_deleted,
-        )
-        total = await post_repository.count_by_author(
-            session,
-            author_id=author_id,
-            include_deleted=include_deleted,
-            only_deleted=only_deleted,
-        )
+        skip, cursor = self._page_window(params)
+
+        async def fetch() -> PaginatedResponse[PostReadWithAuthor]:
+            page = await post_repository.get_page_by_author(
+                session,
+                author_id=author_id,
+                skip=skip,
+                limit=params.page_size,
+                include_deleted=include_deleted,
+                only_deleted=only_deleted,
+                cursor=cursor,
+                include_total=params.include_total,
+                profile="list_with_author",
+            )
+            return self._paginated_response(page, params, cursor, PostReadWithAuthor)
 
-        return PaginatedResponse.create(
-            items=[PostPublic.model_validate(post) for post in posts],
-            total_items=total,
-            params=params,
+        return await self._read(
+            session,
+            "page_by_author",
+            (author_id, params.model_dump_json(), include_deleted, only_deleted),
+            fetch,
         )
 
     async def update_post(
         self,
         session: AsyncSession,
-        current_user: User,
+        current_user: Principal,
         post_id: UUID,
         post_in: PostUpdate,
     ) -> Post:
@@ -73,17 +139,26 @@ class PostService(BaseService[Post, PostCreate, PostUpdate, PostPublic]):
         updated = await post_repository.update_with_tags(
             session, db_obj=post, obj_in=post_in
         )
+        await response_cache.invalidate(f"post:{post_id}")
         return updated
 
     async def delete_post(
-        self, session: AsyncSession, post_id: UUID, current_user: User
+        self, session: AsyncSession, post_id: UUID, current_user: Principal
     ) -> bool:
-        post = await self.get_by_id(session, post_id)
+        # Only author_id is needed for the permission check.
+        post = await self.get_by_id(session, post_id, profile="list")
 
         permission_checker.require_owner_or_superuser(current_user, post)
 
-        # TODO before delete the post i need to delete the associated comments
-        return await self.delete(session, post_id)
+        # Its comments are soft-deleted along with it (see PostRepository.cascade).
+        deleted = await self.delete(session, post_id)
+        await response_cache.invalidate(f"post:{post_id}")
+        return deleted
+
+    async def restore_post(self, session: AsyncSession, post_id: UUID) -> Post:
+        post = await self.restore(session, post_id)
+        await response_cache.invalidate(f"post:{post_id}")
+        return post
 
 
 post_service = PostService()
@@ -1,13 +1,25 @@
+import hashlib
 from uuid import UUID
 
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models import User
+from app.core.cache import CachedResponse, response_cache
 from app.models.tag_model import Tag
 from app.schemas.tag_schema import TagCreate, TagUpdate, TagPublic
+from app.repositories.base_repository import Page
+from app.schemas.auth import Principal
+from app.repositories.tag_catalog import TagSnapshot, tag_catalog
 from app.repositories.tag_repository import tag_repository
-from app.schemas.common import PaginationParams, PaginatedResponse
+from app.schemas.common import (
+    BulkCreateResponse,
+    BulkItemError,
+    Cursor,
+    PaginationParams,
+    PaginatedResponse,
+    Version,
+)
 from app.services.base_service import BaseService
 
 
@@ -16,23 +28,123 @@ class TagService(BaseService[Tag, TagCreate, TagUpdate, TagPublic]):
         super().__init__(tag_repository, TagPublic)
 
     async def get_tag_by_id(self, session: AsyncSession, tag_id: UUID) -> Tag:
-        return await self.get_by_id(session, tag_id)
+        snapshot = tag_catalog.snapshot
+        if snapshot is None:
+            return await self.get_by_id(session, tag_id)
+        tag = snapshot.get(tag_id)
+        if tag is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Tag not found"
+            )
+        return tag
+
+    async def get_version(
+        self, session: AsyncSession, entity_id: UUID
+    ) -> Version | None:
+        snapshot = tag_catalog.snapshot
+        if snapshot is None:
+            return await super().get_version(session, entity_id)
+        tag = snapshot.get(entity_id)
+        return None if tag is None else self.version_of(tag)
+
+    def _catalog_page(
+        self,
+        snapshot: TagSnapshot,
+        params: PaginationParams,
+        include_deleted: bool,
+        only_deleted: bool,
+    ) -> tuple[Page[Tag], Cursor | None]:
+        skip, cursor = self._page_window(params)
+        page = snapshot.page(
+            skip=skip,
+            limit=params.page_size,
+            include_deleted=include_deleted,
+            only_deleted=only_deleted,
+            cursor=cursor,
+            include_total=params.include_total,
+        )
+        return page, cursor
 
     async def get_tags(
         self,
         session: AsyncSession,
-        current_user: User,
+        current_user: Principal,
         params: PaginationParams,
         include_deleted: bool = False,
         only_deleted: bool = False,
     ) -> PaginatedResponse[TagPublic]:
-        return await self.get_list_paginated(
-            session,
-            current_user,
-            params=params,
-            include_deleted=include_deleted,
-            only_deleted=only_deleted,
+        snapshot = tag_catalog.snapshot
+        if snapshot is None:
+            return await self.get_list_paginated(
+                session,
+                current_user,
+                params=params,
+                include_deleted=include_deleted,
+                only_deleted=only_deleted,
+            )
+        self._check_deleted_access(current_user, include_deleted, only_deleted)
+        page, cursor = self._catalog_page(
+            snapshot, params, include_deleted, only_deleted
         )
+        version = self._page_version(page, params, include_deleted, only_deleted)
+        return self._paginated_response(page, params, cursor, TagPublic, version)
+
+    async def get_list_version(
+        self,
+        session: AsyncSession,
+        current_user: Principal,
+        params: PaginationParams,
+        include_deleted: bool = False,
+        only_deleted: bool = False,
+    ) -> Version:
+        snapshot = tag_catalog.snapshot
+        if snapshot is None:
+            return await super().get_list_version(
+                session, current_user, params, include_deleted, only_deleted
+            )
+        self._check_deleted_access(current_user, include_deleted, only_deleted)
+        page, _ = self._catalog_page(snapshot, params, include_deleted, only_deleted)
+        return self._page_version(page, params, include_deleted, only_deleted)
+
+    async def get_tag_response(
+        self, session: AsyncSession, tag_id: UUID
+    ) -> CachedResponse:
+        """The tag body, from the response cache when it is there."""
+
+        async def fill():
+            tag = await self.get_tag_by_id(session, tag_id)
+            entry = self._cache_entry(
+                TagPublic.model_validate(tag), self.version_of(tag)
+            )
+            return entry, [f"tag:{tag.id}"]
+
+        return await response_cache.get_or_fill(f"tag:{tag_id}", fill)
+
+    async def get_tags_response(
+        self,
+        session: AsyncSession,
+        current_user: Principal,
+        params: PaginationParams,
+        include_deleted: bool = False,
+        only_deleted: bool = False,
+    ) -> CachedResponse:
+        """A page of tags, from the response cache when it is there.
+
+        Every page is dropped by any tag write.
+        """
+        self._check_deleted_access(current_user, include_deleted, only_deleted)
+        digest = hashlib.blake2b(
+            repr((params.model_dump(), include_deleted, only_deleted)).encode(),
+            digest_size=16,
+        ).hexdigest()
+
+        async def fill():
+            tags = await self.get_tags(
+                session, current_user, params, include_deleted, only_deleted
+            )
+            return self._cache_entry(tags, tags.version), ["tags"]
+
+        return await response_cache.get_or_fill(f"tags:{digest}", fill)
 
     async def create_tag(self, session: AsyncSession, tag_in: TagCreate) -> Tag:
         existing_tag = await tag_repository.get_by_name(session, tag_in.name)
@@ -41,7 +153,49 @@ class TagService(BaseService[Tag, TagCreate, TagUpdate, TagPublic]):
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Tag with this name already exists",
             )
-        return await self.create(session, tag_in)
+        tag = await self.create(session, tag_in)
+        await tag_catalog.reload()
+        await response_cache.invalidate("tags")
+        return tag
+
+    async def bulk_create_tags(
+        self, session: AsyncSession, tags_in: list[TagCreate]
+    ) -> BulkCreateResponse[TagPublic]:
+        """Create the valid tags in one transaction and report the rest.
+
+        Names already taken, or repeated within the batch, are skipped.
+        """
+        taken = await tag_repository.get_existing_names(
+            session, {tag_in.name for tag_in in tags_in}
+        )
+
+        valid: list[TagCreate] = []
+        errors: list[BulkItemError] = []
+        for index, tag_in in enumerate(tags_in):
+            if tag_in.name in taken:
+                errors.append(
+                    BulkItemError(
+                        index=index, detail="Tag with this name already exists"
+                    )
+                )
+                continue
+            taken.add(tag_in.name)
+            valid.append(tag_in)
+
+        try:
+            tags = await tag_repository.bulk_create(session, objs_in=valid)
+        except IntegrityError:
+            # A name was taken by a concurrent request after the check above.
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Tag with this name already exists",
+            )
+        await tag_catalog.reload()
+        await response_cache.invalidate("tags")
+        return BulkCreateResponse(
+            items=[TagPublic.model_validate(tag) for tag in tags], errors=errors
+        )
 
     async def update_tag(
         self, session: AsyncSession, tag_id: UUID, tag_in: TagUpdate
@@ -54,7 +208,10 @@ class TagService(BaseService[Tag, TagCreate, TagUpdate, TagPublic]):
                     status_code=status.HTTP_409_CONFLICT,
                     detail="Tag with this name already exists",
                 )
-        return await tag_repository.update(session, tag, tag_in)
+        updated = await tag_repository.update(session, tag, tag_in)
+        await tag_catalog.reload()
+        await response_cache.invalidate("tags", f"tag:{tag_id}")
+        return updated
 
     async def delete_tag(self, session: AsyncSession, tag_id: UUID) -> bool:
         posts_count = await tag_repository.count_posts_by_tag(session, tag_id=tag_id)
@@ -63,10 +220,16 @@ class TagService(BaseService[Tag, TagCreate, TagUpdate, TagPublic]):
                 status_code=status.HTTP_409_CONFLICT,
                 detail=f"Cannot delete this tag. It is associated with {posts_count} post(s)",
             )
-        return await self.delete(session, tag_id)
+        deleted = await self.delete(session, tag_id)
+        await tag_catalog.reload()
+        await response_cache.invalidate("tags", f"tag:{tag_id}")
+        return deleted
 
     async def restore_tag(self, session: AsyncSession, tag_id: UUID) -> Tag:
-        return await self.restore(session, tag_id)
+        tag = await self.restore(session, tag_id)
+        await tag_catalog.reload()
+        await response_cache.invalidate("tags", f"tag:{tag_id}")
+        return tag
 
 
 tag_service = TagService()
@@ -4,6 +4,9 @@ from pydantic import EmailStr
 from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException, status
 
+from app.core.cache import response_cache
+from app.schemas.auth import Principal
+from app.repositories.comment_repository import comment_repository
 from app.repositories.user_repository import user_repository
 from app.models.user_model import User
 from app.schemas.common import PaginatedResponse, PaginationParams
@@ -18,6 +21,23 @@ class UserService(BaseService[User, UserCreate, UserUpdate, UserPublic]):
     async def get_user_by_id(self, session: AsyncSession, user_id: UUID) -> User:
         return await self.get_by_id(session, entity_id=user_id)
 
+    @staticmethod
+    def _active_principal(principal: Principal | None) -> Principal:
+        if principal is None or principal.is_deleted:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            )
+        return principal
+
+    def get_cached_principal(self, user_id: UUID) -> Principal | None:
+        """The principal from this worker's cache, None on a miss."""
+        principal = user_repository.get_cached_principal(user_id)
+        return None if principal is None else self._active_principal(principal)
+
+    async def load_principal(self, session: AsyncSession, user_id: UUID) -> Principal:
+        principal = await user_repository.load_principal(session, user_id=user_id)
+        return self._active_principal(principal)
+
     async def get_user_by_email(
         self, session: AsyncSession, email: EmailStr, include_deleted: bool = False
     ) -> User:
@@ -54,12 +74,32 @@ class UserService(BaseService[User, UserCreate, UserUpdate, UserPublic]):
                     detail="Email already registered",
                 )
 
-        return await user_repository.update(
+        user = await user_repository.update(
             session, db_obj=current_user, obj_in=user_in
         )
+        # Post details embed their author.
+        await response_cache.invalidate(f"user:{user.id}")
+        return user
 
     async def delete_user(self, session: AsyncSession, user_id: UUID) -> bool:
-        return await self.delete(session, entity_id=user_id)
+        deleted = await self.delete(session, entity_id=user_id)
+        await self._invalidate_cascade(session, user_id)
+        return deleted
+
+    async def _invalidate_cascade(self, session: AsyncSession, user_id: UUID) -> None:
+        """Drop the post details a delete or restore of the user changes.
+
+        Those are the user's posts, tagged with their author, and the posts
+        they commented on, whose comments the cascade (see
+        ``UserRepository.cascade``) deletes or restores.
+        """
+        tags = [f"user:{user_id}"]
+        if response_cache.enabled:
+            post_ids = await comment_repository.get_commented_post_ids(
+                session, author_id=user_id
+            )
+            tags += [f"post:{post_id}" for post_id in post_ids]
+        await response_cache.invalidate(*tags)
 
     async def authenticate(
         self, session: AsyncSession, email: EmailStr, password: str
@@ -82,7 +122,7 @@ class UserService(BaseService[User, UserCreate, UserUpdate, UserPublic]):
     async def get_users(
         self,
         session: AsyncSession,
-        current_user: User,
+        current_user: Principal,
         params: PaginationParams,
         include_deleted: bool = False,
         only_deleted: bool = False,
@@ -92,7 +132,9 @@ class UserService(BaseService[User, UserCreate, UserUpdate, UserPublic]):
         )
 
     async def restore_user(self, session: AsyncSession, user_id: UUID) -> User:
-        return await self.restore(session, user_id)
+        user = await self.restore(session, user_id)
+        await self._invalidate_cascade(session, user_id)
+        return user
 
 
 user_service = UserService()
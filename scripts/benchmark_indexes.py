@@ -0,0 +1,301 @@
+"""Seed benchmark data and EXPLAIN ANALYZE the repository queries.
+
+Every statement the repositories send for the list, detail and count paths is
+captured while running them, then explained twice: once with the
+soft-delete-aware indexes dropped (inside a transaction that is rolled back)
+and once with them in place.
+
+Run it against a development database, from the project root:
+
+    PYTHONPATH=. python scripts/benchmark_indexes.py --users 1000 --posts-per-user 20
+
+Seeded rows use ``bench-`` emails/tag names and are kept between runs; pass
+``--clean`` to remove them.
+"""
+
+import argparse
+import asyncio
+import logging
+import re
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel import not_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db import async_session_maker, engine
+from app.models import Post, Tag, User
+from app.repositories.comment_repository import comment_repository
+from app.repositories.post_repository import post_repository
+from app.repositories.tag_repository import tag_repository
+from app.repositories.user_repository import user_repository
+from app.schemas.common import Cursor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Indexes added by revision acd662a480a3.
+NEW_INDEXES = (
+    "ix_comment_author_id",
+    "ix_comment_post_id",
+    "ix_comment_post_id_created_at_id_live",
+    "ix_post_author_id",
+    "ix_post_author_id_created_at_id_live",
+    "ix_post_created_at_id_live",
+    "ix_posttaglink_tag_id",
+    "ix_user_created_at_id_live",
+)
+
+PAGE_SIZE = 20
+
+SEED_STATEMENTS = (
+    """
+    INSERT INTO "user" (id, email, hashed_password, is_superuser, is_deleted,
+                        deleted_at, created_at, updated_at)
+    SELECT gen_random_uuid(), 'bench-' || n || '@example.com', '!', false,
+           n % 10 = 0, CASE WHEN n % 10 = 0 THEN now() END,
+           now() - n * interval '1 minute', now()
+    FROM generate_series(1, :users) AS n
+    """,
+    """
+    INSERT INTO tag (id, name, is_deleted, created_at, updated_at)
+    SELECT gen_random_uuid(), 'bench-' || n, false,
+           now() - n * interval '1 minute', now()
+    FROM generate_series(1, :tags) AS n
+    """,
+    """
+    INSERT INTO post (id, title, content, author_id, is_deleted, deleted_at,
+                      created_at, updated_at)
+    SELECT gen_random_uuid(), 'Bench post ' || u.n || '-' || p,
+           repeat('lorem ipsum ', 20), u.id, p % 10 = 0,
+           CASE WHEN p % 10 = 0 THEN now() END,
+           now() - random() * interval '365 days', now()
+    FROM (SELECT id, row_number() OVER () AS n
+          FROM "user" WHERE email LIKE 'bench-%') AS u,
+         generate_series(1, :posts_per_user) AS p
+    """,
+    """
+    INSERT INTO comment (id, content, post_id, author_id, is_deleted,
+                         deleted_at, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Bench comment ' || c, p.id, p.author_id,
+           c % 10 = 0, CASE WHEN c % 10 = 0 THEN now() END,
+           p.created_at + c * interval '1 minute', now()
+    FROM post AS p, generate_series(1, :comments_per_post) AS c
+    WHERE p.title LIKE 'Bench post %'
+    """,
+    """
+    INSERT INTO posttaglink (post_id, tag_id)
+    SELECT DISTINCT p.id, t.id
+    FROM post AS p
+    CROSS JOIN generate_series(0, 2) AS k
+    JOIN (SELECT id, row_number() OVER () - 1 AS n
+          FROM tag WHERE name LIKE 'bench-%') AS t
+      ON t.n = (abs(hashtext(p.id::text)) + k * 7) % :tags
+    WHERE p.title LIKE 'Bench post %'
+    """,
+)
+
+CLEAN_STATEMENTS = (
+    # Posts and comments go with their authors through ON DELETE CASCADE.
+    """DELETE FROM "user" WHERE email LIKE 'bench-%'""",
+    "DELETE FROM tag WHERE name LIKE 'bench-%'",
+)
+
+Capture = list[tuple[str, Any]]
+
+
+async def seed(args: argparse.Namespace) -> None:
+    async with engine.begin() as conn:
+        seeded = await conn.scalar(
+            text("""SELECT count(*) FROM "user" WHERE email LIKE 'bench-%'""")
+        )
+        if seeded:
+            logger.info("Found %s benchmark users, skipping seed", seeded)
+            return
+        params = {
+            "users": args.users,
+            "tags": args.tags,
+            "posts_per_user": args.posts_per_user,
+            "comments_per_post": args.comments_per_post,
+        }
+        for statement in SEED_STATEMENTS:
+            await conn.execute(text(statement), params)
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+    logger.info("Seeded benchmark data")
+
+
+async def clean() -> None:
+    async with engine.begin() as conn:
+        for statement in CLEAN_STATEMENTS:
+            await conn.execute(text(statement))
+    logger.info("Removed benchmark data")
+
+
+async def capture(
+    call: Callable[[AsyncSession], Awaitable[Any]],
+) -> Capture:
+    """Run a repository call and return the statements it sent."""
+    statements: Capture = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    async with async_session_maker() as session:
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            await call(session)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+async def explain(
+    conn: AsyncConnection, statement: str, parameters: Any, repeat: int
+) -> tuple[float, list[str]]:
+    """Best execution time in ms over ``repeat`` runs, and the last plan."""
+    best = float("inf")
+    plan: list[str] = []
+    for _ in range(repeat):
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+        )
+        plan = [row[0] for row in result]
+        match = re.search(r"Execution Time: ([\d.]+) ms", plan[-1])
+        if match:
+            best = min(best, float(match.group(1)))
+    return best, plan
+
+
+async def explain_all(
+    queries: dict[str, Capture], drop_indexes: bool, repeat: int
+) -> dict[str, list[tuple[float, list[str]]]]:
+    results: dict[str, list[tuple[float, list[str]]]] = {}
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        if drop_indexes:
+            for name in NEW_INDEXES:
+                await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        for label, statements in queries.items():
+            results[label] = [
+                await explain(conn, statement, parameters, repeat)
+                for statement, parameters in statements
+            ]
+        await transaction.rollback()
+    return results
+
+
+async def build_queries() -> dict[str, Capture]:
+    async with async_session_maker() as session:
+        author = (
+            await session.exec(
+                select(User)
+                .where(User.email.like("bench-%"), not_(User.is_deleted))  # type: ignore[attr-defined]
+                .limit(1)
+            )
+        ).one()
+        post = (
+            await session.exec(
+                select(Post).where(Post.author_id == author.id, not_(Post.is_deleted))
+            )
+        ).first()
+        tag = (
+            await session.exec(select(Tag).where(Tag.name.like("bench-%")))  # type: ignore[attr-defined]
+        ).first()
+        middle = (
+            await post_repository.get_page(
+                session, skip=1000, limit=1, include_total=False
+            )
+        ).items
+    if post is None or tag is None or not middle:
+        raise SystemExit("Not enough benchmark data, seed with larger sizes")
+    cursor = Cursor(created_at=middle[0].created_at, id=middle[0].id)
+
+    calls: dict[str, Callable[[AsyncSession], Awaitable[Any]]] = {
+        "posts page": lambda s: post_repository.get_page(s, limit=PAGE_SIZE),
+        "posts page at offset 1000": lambda s: post_repository.get_page(
+            s, skip=1000, limit=PAGE_SIZE
+        ),
+        "posts keyset page after 1000 rows": lambda s: post_repository.get_page(
+            s, limit=PAGE_SIZE, cursor=cursor
+        ),
+        "posts by author page": lambda s: post_repository.get_page_by_author(
+            s, author_id=author.id, limit=PAGE_SIZE, profile="list_with_author"
+        ),
+        "post detail": lambda s: post_repository.get(s, entity_id=post.id),
+        "comments by post page": lambda s: comment_repository.get_page_by_post(
+            s, post_id=post.id, limit=PAGE_SIZE
+        ),
+        "users page": lambda s: user_repository.get_page(s, limit=PAGE_SIZE),
+        "tags page": lambda s: tag_repository.get_page(s, limit=PAGE_SIZE),
+        "post count by tag": lambda s: tag_repository.count_posts_by_tag(
+            s, tag_id=tag.id
+        ),
+    }
+    return {label: await capture(call) for label, call in calls.items()}
+
+
+def report(
+    queries: dict[str, Capture],
+    before: dict[str, list[tuple[float, list[str]]]],
+    after: dict[str, list[tuple[float, list[str]]]],
+    show_plans: bool,
+) -> None:
+    rows = []
+    for label, statements in queries.items():
+        for i, (statement, _) in enumerate(statements):
+            name = label if len(statements) == 1 else f"{label} [{i + 1}]"
+            before_ms, before_plan = before[label][i]
+            after_ms, after_plan = after[label][i]
+            rows.append((name, before_ms, after_ms))
+            if show_plans:
+                print(f"\n=== {name}\n{statement}")
+                print("\n--- before\n" + "\n".join(before_plan))
+                print("\n--- after\n" + "\n".join(after_plan))
+
+    width = max(len(name) for name, _, _ in rows)
+    print(f"\n{'query':<{width}}  {'before ms':>10}  {'after ms':>10}  {'speedup':>8}")
+    for name, before_ms, after_ms in rows:
+        speedup = before_ms / after_ms if after_ms else float("inf")
+        print(
+            f"{name:<{width}}  {before_ms:>10.3f}  {after_ms:>10.3f}  {speedup:>7.1f}x"
+        )
+
+
+async def run(args: argparse.Namespace) -> None:
+    # The application engine echoes every statement; keep the report readable.
+    engine.echo = False
+    if args.clean:
+        await clean()
+        return
+    await seed(args)
+    queries = await build_queries()
+    before = await explain_all(queries, drop_indexes=True, repeat=args.repeat)
+    after = await explain_all(queries, drop_indexes=False, repeat=args.repeat)
+    report(queries, before, after, show_plans=not args.summary)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--posts-per-user", type=int, default=20)
+    parser.add_argument("--comments-per-post", type=int, default=10)
+    parser.add_argument("--tags", type=int, default=50)
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per statement, best time kept"
+    )
+    parser.add_argument(
+        "--summary", action="store_true", help="Only print the timing table"
+    )
+    parser.add_argument(
+        "--clean", action="store_true", help="Remove benchmark data and exit"
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Measure event-loop latency while the API serves concurrent logins.
+
+A probe task sleeps for a fixed interval in a loop and records how late it
+wakes up; anything that blocks the loop, such as Argon2 running inline, shows
+up as lag. Logins go through the ASGI app in the same process and loop.
+
+Each ``--workers`` value runs in its own process with PASSWORD_HASH_WORKERS
+set to it (0 hashes on the event loop). Run it from the repository root:
+
+    PYTHONPATH=. python scripts/benchmark_login.py --workers 0 4 --requests 64 --concurrency 16
+
+The benchmark user ``bench-login@example.com`` is created on first run.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+EMAIL = "bench-login@example.com"
+PASSWORD = "Bench-login-1"
+PROBE_INTERVAL = 0.005
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def ensure_user() -> None:
+    from app.core.db import async_session_maker
+    from app.repositories.user_repository import user_repository
+    from app.schemas.user_schema import UserCreate
+
+    async with async_session_maker() as session:
+        if await user_repository.get_by_email(session, email=EMAIL) is None:
+            await user_repository.create(
+                session, obj_in=UserCreate(email=EMAIL, password=PASSWORD)
+            )
+
+
+async def probe(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def measure(requests: int, concurrency: int) -> dict:
+    import httpx
+
+    from app.core.config import settings
+    from app.core.db import engine
+    from app.core.security import password_hasher
+    from app.main import app
+
+    # The application engine echoes every statement; keep the output readable.
+    engine.echo = False
+    await ensure_user()
+
+    slots = asyncio.Semaphore(concurrency)
+    timings: list[float] = []
+    statuses: dict[int, int] = {}
+
+    async def login(client: httpx.AsyncClient) -> None:
+        async with slots:
+            start = time.perf_counter()
+            response = await client.post(
+                f"{settings.API_V1_STR}/login",
+                data={"username": EMAIL, "password": PASSWORD},
+            )
+            timings.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            # Warm the connection pool so the first logins do not pay for it.
+            await login(client)
+            timings.clear()
+            statuses.clear()
+
+            lags: list[float] = []
+            stop = asyncio.Event()
+            probe_task = asyncio.create_task(probe(lags, stop))
+            start = time.perf_counter()
+            await asyncio.gather(*(login(client) for _ in range(requests)))
+            elapsed = time.perf_counter() - start
+            stop.set()
+            await probe_task
+    await engine.dispose()
+
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "logins_per_s": requests / elapsed,
+        "login_p50_ms": percentile(timings, 50) * 1000,
+        "login_p95_ms": percentile(timings, 95) * 1000,
+        "lag_p50_ms": percentile(lags, 50) * 1000,
+        "lag_p99_ms": percentile(lags, 99) * 1000,
+        "lag_max_ms": max(lags, default=0.0) * 1000,
+        "lag_mean_ms": statistics.fmean(lags) * 1000 if lags else 0.0,
+        "max_queued": password_hasher.stats.max_queued,
+        "statuses": statuses,
+    }
+
+
+def run_worker_setting(workers: int, args: argparse.Namespace) -> dict:
+    env = dict(os.environ, PASSWORD_HASH_WORKERS=str(workers), LOG_LEVEL="WARNING")
+    # The measuring process imports ``app`` wherever it is started from.
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (ROOT, os.environ.get("PYTHONPATH")) if path
+    )
+    output = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--measure",
+            "--requests",
+            str(args.requests),
+            "--concurrency",
+            str(args.concurrency),
+        ],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def report(results: list[dict]) -> None:
+    columns = (
+        ("workers", "workers", "{:>7}"),
+        ("logins_per_s", "logins/s", "{:>9.1f}"),
+        ("login_p50_ms", "login p50", "{:>10.1f}"),
+        ("login_p95_ms", "login p95", "{:>10.1f}"),
+        ("lag_p50_ms", "lag p50", "{:>8.1f}"),
+        ("lag_p99_ms", "lag p99", "{:>8.1f}"),
+        ("lag_max_ms", "lag max", "{:>8.1f}"),
+        ("max_queued", "max queued", "{:>10}"),
+    )
+    print("  ".join(f"{title:>{len(fmt.format(0))}}" for _, title, fmt in columns))
+    for result in results:
+        print("  ".join(fmt.format(result[key]) for key, _, fmt in columns))
+        print(f"  statuses: {result['statuses']}")
+    print("\nTimes in ms; lag is how late a 5 ms sleep on the event loop woke up.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[0, 4],
+        help="PASSWORD_HASH_WORKERS values to compare",
+    )
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(asyncio.run(measure(args.requests, args.concurrency))))
+        return
+    report([run_worker_setting(workers, args) for workers in args.workers])
+
+
+if __name__ == "__main__":
+    main()
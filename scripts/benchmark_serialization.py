@@ -0,0 +1,146 @@
+"""Compare the ways a page of posts can be turned into a response body.
+
+Builds pages of in-memory posts (no database needed) and times, per page:
+
+* ``fastapi``: the service builds the page, then FastAPI validates it again
+  against the route's ``response_model`` and renders it with ``json.dumps``,
+  as routes returning models do;
+* ``fast``: the service builds the page and ``PaginatedResponse.to_json``
+  serializes it in one pass, as ``page_response`` does.
+
+Both bodies are checked to be identical before timing. Run it from the
+repository root:
+
+    PYTHONPATH=. python scripts/benchmark_serialization.py --items 100 --repeat 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models import Comment, Post, Tag, User
+from app.schemas.common import PaginatedResponse, PaginationParams
+from app.schemas.post_schema import PostPublic, PostPublicWithRelations
+
+
+def make_posts(count: int, tags: int, comments: int) -> list[Post]:
+    now = datetime.now(UTC)
+    author = User(
+        email="bench-serialization@example.com",
+        full_name="Bench Author",
+        hashed_password="x",
+    )
+    tag_rows = [Tag(name=f"bench-tag-{i}", description="A tag") for i in range(tags)]
+    posts = []
+    for i in range(count):
+        post = Post(
+            title=f"Benchmark post {i}",
+            content="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+            author_id=author.id,
+            created_at=now - timedelta(seconds=i),
+            updated_at=now,
+        )
+        post.author = author
+        post.tags = tag_rows
+        post.comments = [
+            Comment(
+                content=f"Comment {j} on post {i}",
+                post_id=post.id,
+                author_id=author.id,
+            )
+            for j in range(comments)
+        ]
+        posts.append(post)
+    return posts
+
+
+def build_page(posts: list[Post], schema: Any) -> PaginatedResponse[Any]:
+    params = PaginationParams(
+        page=1, page_size=len(posts), cursor=None, use_cursor=False, include_total=True
+    )
+    return PaginatedResponse.create(
+        items=[schema.model_validate(post) for post in posts],
+        total_items=len(posts) * 10,
+        params=params,
+        has_more=True,
+    )
+
+
+async def fastapi_body(page: PaginatedResponse[Any], field) -> bytes:
+    content = await serialize_response(field=field, response_content=page)
+    return JSONResponse(content).body
+
+
+def timed(run, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: list[float], baseline: float | None = None) -> float:
+    median = statistics.median(samples)
+    line = (
+        f"  {label:<14} median {median:7.3f} ms  "
+        f"p95 {sorted(samples)[int(len(samples) * 0.95)]:7.3f} ms"
+    )
+    if baseline:
+        line += f"  {baseline / median:5.1f}x"
+    print(line)
+    return median
+
+
+def benchmark(schema: Any, posts: list[Post], repeat: int) -> None:
+    field = create_model_field(
+        name="Response", type_=PaginatedResponse[schema], mode="serialization"
+    )
+    loop = asyncio.new_event_loop()
+    try:
+        expected = loop.run_until_complete(
+            fastapi_body(build_page(posts, schema), field)
+        )
+        assert build_page(posts, schema).to_json() == expected, "bodies differ"
+
+        print(f"{schema.__name__}, {len(posts)} items, {len(expected)} bytes")
+        baseline = report(
+            "fastapi",
+            timed(
+                lambda: loop.run_until_complete(
+                    fastapi_body(build_page(posts, schema), field)
+                ),
+                repeat,
+            ),
+        )
+        report(
+            "fast",
+            timed(lambda: build_page(posts, schema).to_json(), repeat),
+            baseline,
+        )
+    finally:
+        loop.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--tags", type=int, default=3)
+    parser.add_argument("--comments", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    posts = make_posts(args.items, args.tags, args.comments)
+    for schema in (PostPublic, PostPublicWithRelations):
+        benchmark(schema, posts, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
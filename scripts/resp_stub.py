@@ -0,0 +1,136 @@
+"""A tiny in-memory server speaking the Redis protocol, for local testing.
+
+It implements the commands the response cache's ``redis`` backend sends
+(PING, AUTH, SELECT, GET, MGET, SET with PX/NX, DEL, SADD, SMEMBERS, PEXPIRE,
+FLUSHALL), so several workers can share a cache without a Redis server:
+
+    python scripts/resp_stub.py --port 6390
+    RESPONSE_CACHE_BACKEND=redis \\
+    RESPONSE_CACHE_REDIS_URL=redis://localhost:6390/0 fastapi run --workers 4
+
+Everything lives in one process and is lost when it stops; use Redis or
+Valkey anywhere else.
+"""
+
+import argparse
+import asyncio
+import time
+
+# key -> (value, expires at as monotonic seconds, or None)
+store: dict[bytes, tuple[bytes | set[bytes], float | None]] = {}
+
+
+class Error(Exception):
+    pass
+
+
+def _live(key: bytes):
+    entry = store.get(key)
+    if entry is None:
+        return None
+    if entry[1] is not None and entry[1] <= time.monotonic():
+        del store[key]
+        return None
+    return entry[0]
+
+
+def _encode(reply) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, Error):
+        return b"-ERR %s\r\n" % str(reply).encode()
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return b"*%d\r\n" % len(reply) + b"".join(_encode(item) for item in reply)
+
+
+def _string(key: bytes) -> bytes | None:
+    value = _live(key)
+    return value if isinstance(value, bytes) else None
+
+
+def execute(args: list[bytes]):
+    command, args = args[0].upper(), args[1:]
+    if command == b"PING":
+        return "PONG"
+    if command in (b"AUTH", b"SELECT"):
+        return "OK"
+    if command == b"FLUSHALL":
+        store.clear()
+        return "OK"
+    if command == b"GET":
+        return _string(args[0])
+    if command == b"MGET":
+        return [_string(key) for key in args]
+    if command == b"SET":
+        key, value, options = args[0], args[1], [a.upper() for a in args[2:]]
+        if b"NX" in options and _live(key) is not None:
+            return None
+        expires = None
+        if b"PX" in options:
+            expires = time.monotonic() + int(args[2 + options.index(b"PX") + 1]) / 1000
+        store[key] = (value, expires)
+        return "OK"
+    if command == b"DEL":
+        return sum(store.pop(key, None) is not None for key in args)
+    if command == b"SADD":
+        members = _live(args[0])
+        if not isinstance(members, set):
+            members = set()
+            store[args[0]] = (members, None)
+        added = len(set(args[1:]) - members)
+        members.update(args[1:])
+        return added
+    if command == b"SMEMBERS":
+        members = _live(args[0])
+        return sorted(members) if isinstance(members, set) else []
+    if command == b"PEXPIRE":
+        value = _live(args[0])
+        if value is None:
+            return 0
+        store[args[0]] = (value, time.monotonic() + int(args[1]) / 1000)
+        return 1
+    return Error(f"unknown command '{command.decode()}'")
+
+
+async def _read_command(reader: asyncio.StreamReader) -> list[bytes]:
+    line = await reader.readuntil(b"\r\n")
+    if not line.startswith(b"*"):
+        return line.split()
+    args = []
+    for _ in range(int(line[1:-2])):
+        size = int((await reader.readuntil(b"\r\n"))[1:-2])
+        args.append((await reader.readexactly(size + 2))[:-2])
+    return args
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            args = await _read_command(reader)
+            if args:
+                writer.write(_encode(execute(args)))
+                await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def main(host: str, port: int) -> None:
+    server = await asyncio.start_server(handle, host, port)
+    print(f"Listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    asyncio.run(main(args.host, args.port))